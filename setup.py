@@ -51,6 +51,7 @@ setup(
     entry_points={
         "console_scripts": [
             "ai-dev=ai_dev.cli:cli",
+            "ai-dev-client=ai_dev.client:main",
         ],
     },
     python_requires=">=3.12",
@@ -3,6 +3,13 @@
 __version__ = "0.1.0"
 __author__ = "AI Dev Team"
 
-from .cli import cli
+__all__ = ["cli"]
 
-__all__ = ["cli"]
\ No newline at end of file
+
+def __getattr__(name):
+    # Imported on first use so that light entry points (ai-dev-client) don't
+    # load the CLI and its dependencies
+    if name == "cli":
+        from .cli import cli
+        return cli
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
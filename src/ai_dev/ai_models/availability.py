@@ -0,0 +1,93 @@
+"""Persistent cache of CLI availability probes"""
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class AvailabilityCache:
+    """Remember whether a CLI answered ``--version``, keyed by its resolved executable
+
+    An entry stays valid while the executable on PATH resolves to the same file
+    with the same mtime and size, so upgrading or reinstalling the CLI triggers
+    a fresh probe. The node-based CLIs take about a second to answer
+    ``--version``; a cache hit is a ``which`` plus a ``stat``. A failed probe
+    (a slow cold start or a transient error) is only trusted for
+    ``negative_ttl`` seconds before the CLI is probed again.
+    """
+
+    def __init__(self, path: str = '~/.cache/ai-dev/availability.json', probe_timeout: int = 5,
+                 negative_ttl: float = 60):
+        self.path = Path(path).expanduser()
+        self.probe_timeout = probe_timeout
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            return json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, data: Dict[str, Dict[str, Any]]) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def resolve(command: str) -> Optional[str]:
+        """Resolve a command to the real path of its executable"""
+        found = shutil.which(command)
+        return os.path.realpath(found) if found else None
+
+    def is_available(self, command: str, probe_args: Optional[List[str]] = None) -> bool:
+        """Return whether the command runs, probing only when the executable changed"""
+        resolved = self.resolve(command)
+        if resolved is None:
+            return False
+
+        try:
+            stat = os.stat(resolved)
+        except OSError:
+            return False
+        fingerprint = {"mtime": stat.st_mtime_ns, "size": stat.st_size}
+
+        with self._lock:
+            entry = self._load().get(resolved)
+            if entry and entry.get("mtime") == fingerprint["mtime"] and entry.get("size") == fingerprint["size"]:
+                if entry["available"] or time.time() - entry.get("checked_at", 0) < self.negative_ttl:
+                    return entry["available"]
+
+            available = self._probe(command, probe_args or ['--version'])
+
+            data = self._load()
+            data[resolved] = {**fingerprint, "available": available, "checked_at": time.time()}
+            self._save(data)
+            return available
+
+    def _probe(self, command: str, probe_args: List[str]) -> bool:
+        try:
+            result = subprocess.run(
+                [command] + probe_args,
+                capture_output=True,
+                text=True,
+                timeout=self.probe_timeout
+            )
+            return result.returncode == 0
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return False
+
+    def clear(self) -> None:
+        """Forget every probe result"""
+        self.path.unlink(missing_ok=True)
@@ -3,65 +3,397 @@
 from abc import ABC, abstractmethod
 import subprocess
 import json
-from typing import Dict, Any, Optional
+import asyncio
+import weakref
+from typing import Dict, Any, Optional, List, Iterator
 import codecs
-import tempfile
-import os
+import logging
+import threading
+import time
 from pathlib import Path
 
+from .availability import AvailabilityCache
+from .cache import ResponseCache
+from .ratelimit import RateLimiter, RateLimitError, is_rate_limited
+from .retry import RetryPolicy
+from ..utils.tokens import estimate_tokens
+from ..utils.json_extract import extract_json
+from ..utils.json_stream import JSONItemStream
+from ..utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
 
 class AIModelBase(ABC):
     """Base class for AI model wrappers"""
     
+    cli_name = "the AI CLI"  # Used in error messages
+    
+    # event loop -> {model key: Semaphore} limiting concurrent async calls per model
+    _semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.command = config['command']
         self.options = config.get('options', [])
         self.timeout = config.get('timeout', 60)
+        self.model_name = config.get('model') or config.get('models', {}).get('default') or self.command
+        self.cache: Optional[ResponseCache] = None  # Attached by ModelManager
+        self.availability: Optional[AvailabilityCache] = None  # Attached by ModelManager
+        self.max_concurrency = config.get('max_concurrency', 4)
+        self.max_input_tokens = config.get('max_input_tokens')  # Applied by the generators
+        self.retry_policy = RetryPolicy.from_config(config.get('retry', {}), timeout=self.timeout or 300)
+        self.rate_limiter = RateLimiter.from_config(f"{self.command}-{self.model_name}", config.get('rate_limit', {}))
+        # 'stdin' pipes the prompt to the CLI; 'argv' passes it as an argument (limited by ARG_MAX)
+        self.prompt_transport = config.get('prompt_transport', 'stdin')
     
     @abstractmethod
     def format_prompt(self, prompt: str) -> str:
         """Format prompt for specific model"""
         pass
     
+    def build_command(self, prompt: str) -> List[str]:
+        """Build the CLI argv for a prompt"""
+        if self.prompt_transport == 'stdin':
+            return [self.command] + self.options
+        return [self.command] + self.options + [self.format_prompt(prompt)]
+    
+    def prompt_input(self, prompt: str) -> Optional[str]:
+        """Text to write to the CLI's stdin (None when the prompt is in argv)"""
+        if self.prompt_transport == 'stdin':
+            return self.format_prompt(prompt)
+        return None
+    
+    def build_env(self) -> Optional[Dict[str, str]]:
+        """Environment for the CLI subprocess (None inherits the current one)"""
+        return None
+    
+    def wrap_prompt(self, prompt: str, output_format: str = 'json', encoding: str = 'shift-jis') -> str:
+        """Add output format instructions to the prompt"""
+        return prompt
+    
+    def clean_output(self, output: str) -> str:
+        """Strip CLI noise from raw stdout"""
+        return output
+    
+    def raise_for_error(self, stderr: str) -> None:
+        """Raise a descriptive error for a failed CLI call"""
+        if is_rate_limited(stderr):
+            raise RateLimitError(f"Rate limited: {stderr}")
+        raise RuntimeError(f"Command failed: {stderr}")
+    
     def execute_command(self, 
                        prompt: str, 
                        encoding: str = 'shift-jis') -> str:
-        """Execute CLI command with encoding support"""
-        
-        # Save prompt to temporary file with specified encoding
-        with tempfile.NamedTemporaryFile(
-            mode='w', 
-            encoding=encoding, 
-            suffix='.txt',
-            delete=False
-        ) as tmp:
-            tmp.write(self.format_prompt(prompt))
-            tmp_path = tmp.name
+        """Execute the CLI under the model's retry policy"""
         
-        try:
-            # Build command
-            cmd = [self.command] + self.options + [tmp_path]
+        cmd = self.build_command(prompt)
+        tokens = estimate_tokens(prompt)
+        started = time.perf_counter()
+        attempts = 0
+        
+        def acquire_hedge():
+            """A hedge is a second provider call, so it needs a rate-limit slot of its own"""
+            if not self.rate_limiter.enabled:
+                return lambda: None
+            slot = self.rate_limiter.try_acquire(tokens)
+            return (lambda: self.rate_limiter.release(slot)) if slot else None
+        
+        for requeue in range(self.rate_limiter.max_requeues + 1):
+            try:
+                with self.rate_limiter.slot(tokens):
+                    # Retries share one deadline; hedging (if enabled) races a duplicate call
+                    result = self.retry_policy.run(
+                        cmd,
+                        key=f"{self.command}:{self.model_name}",
+                        label=self.cli_name,
+                        env=self.build_env(),
+                        input=self.prompt_input(prompt),
+                        acquire_hedge=acquire_hedge
+                    )
+            except subprocess.TimeoutExpired as e:
+                self._record_call(prompt, None, started, attempts + e.attempts, requeue, "timeout")
+                raise RuntimeError(f"Command timed out: no response within the {int(self.retry_policy.deadline)}s deadline")
+            except FileNotFoundError:
+                self._record_call(prompt, None, started, attempts, requeue, "not_found")
+                raise RuntimeError(f"Command '{self.command}' not found. Please install {self.cli_name}.")
+            attempts += result.attempts
             
-            # Execute command
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=False,  # Receive as binary
-                timeout=self.timeout
-            )
+            if result.returncode == 0:
+                output = self.clean_output(result.stdout)
+                self._record_call(prompt, output, started, attempts, requeue, "ok", result.returncode)
+                return output
             
-            # Decode output
-            output = result.stdout.decode(encoding, errors='ignore')
+            try:
+                self.raise_for_error(result.stderr)
+            except RateLimitError:
+                if requeue == self.rate_limiter.max_requeues:
+                    self._record_call(prompt, None, started, attempts, requeue, "rate_limited", result.returncode)
+                    raise
+                delay = self.rate_limiter.backoff(requeue)
+                logger.warning("🚦 %s is rate limited. Requeuing in %.0fs... (%d/%d)",
+                               self.cli_name, delay, requeue + 1, self.rate_limiter.max_requeues)
+                time.sleep(delay)
+            except RuntimeError:
+                self._record_call(prompt, None, started, attempts, requeue, "error", result.returncode)
+                raise
+    
+    def _record_call(self, prompt: str, output: Optional[str], started: float, attempts: int,
+                     requeues: int, status: str, exit_code: Optional[int] = None, **fields: Any) -> None:
+        """Append a metrics record for one logical CLI call"""
+        if fields.get('response_bytes') is None:
+            fields['response_bytes'] = len(output.encode('utf-8')) if output is not None else 0
+        metrics.record(
+            "call",
+            backend=self.command,
+            model=self.model_name,
+            seconds=round(time.perf_counter() - started, 3),
+            prompt_bytes=len(prompt.encode('utf-8')),
+            attempts=attempts,
+            requeues=requeues,
+            status=status,
+            exit_code=exit_code,
+            **fields
+        )
+    
+    def cached_execute(self, prompt: str, encoding: str = 'shift-jis') -> str:
+        """Execute CLI command, serving identical prompts from the response cache"""
+        if self.cache is None or not self.cache.enabled:
+            return self.execute_command(prompt, encoding)
+        
+        key = self.cache.make_key(self.model_name, self.command, self.options, prompt)
+        output = self.cache.get(key)
+        if output is None:
+            output = self.execute_command(prompt, encoding)
+            self.cache.put(key, output)
+        return output
+    
+    def discard_cached(self, prompt: str) -> None:
+        """Drop a cached response, e.g. because it could not be parsed"""
+        if self.cache is not None:
+            self.cache.discard(self.cache.make_key(self.model_name, self.command, self.options, prompt))
+    
+    def stream_lines(self, prompt: str, encoding: str = 'shift-jis') -> Iterator[str]:
+        """Run the CLI and yield stdout lines as they arrive
+
+        Raises RuntimeError once ``self.timeout`` elapses; lines already
+        yielded stay with the caller.
+        """
+        started = time.perf_counter()
+        response_bytes = 0
+        status = "error"
+        try:
+            with self.rate_limiter.slot(estimate_tokens(prompt)):
+                for line in self._stream_process(prompt):
+                    response_bytes += len(line.encode('utf-8'))
+                    yield line
+            status = "ok"
+        except GeneratorExit:
+            status = "stopped"
+            raise
+        finally:
+            self._record_call(prompt, None, started, 1, 0, status, response_bytes=response_bytes, stream=True)
+    
+    def _stream_process(self, prompt: str) -> Iterator[str]:
+        """Spawn the CLI once and yield its stdout lines"""
+        prompt_input = self.prompt_input(prompt)
+        process = subprocess.Popen(
+            self.build_command(prompt),
+            stdin=subprocess.PIPE if prompt_input is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1,
+            env=self.build_env()
+        )
+        
+        if prompt_input is not None:
+            # Feed stdin from a thread so a large prompt can't deadlock against stdout
+            threading.Thread(target=self._write_stdin, args=(process, prompt_input), daemon=True).start()
+        
+        # Readline blocks, so a watchdog kills the process when the timeout expires
+        timed_out = threading.Event()
+        
+        def kill():
+            timed_out.set()
+            process.kill()
+        
+        watchdog = threading.Timer(self.timeout or 300, kill)
+        watchdog.start()
+        try:
+            for line in iter(process.stdout.readline, ''):
+                yield line
+            stderr = process.stderr.read()
+            process.wait()
+        finally:
+            watchdog.cancel()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+        
+        if timed_out.is_set():
+            raise RuntimeError(f"Command timed out after {self.timeout or 300}s")
+        if process.returncode != 0:
+            self.raise_for_error(stderr)
+    
+    @staticmethod
+    def _write_stdin(process: subprocess.Popen, text: str) -> None:
+        """Write the prompt to a process's stdin and close it"""
+        try:
+            process.stdin.write(text)
+            process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass  # The process exited early; its stderr/return code tell why
+    
+    def stream_generate(self,
+                       prompt: str,
+                       output_format: str = 'json',
+                       encoding: str = 'shift-jis') -> Iterator[Any]:
+        """Generate JSON items, yielding each one as soon as it is complete"""
+        formatted_prompt = self.wrap_prompt(prompt, output_format, encoding)
+        parser = JSONItemStream()
+        
+        key = None
+        if self.cache is not None and self.cache.enabled:
+            key = self.cache.make_key(self.model_name, self.command, self.options, formatted_prompt)
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield from parser.feed(cached)
+                return
+        
+        lines = []
+        for line in self.stream_lines(formatted_prompt, encoding):
+            lines.append(line)
+            yield from parser.feed(line)
+        
+        # Only complete responses are cached
+        if key is not None and parser.done:
+            self.cache.put(key, self.clean_output(''.join(lines)))
+    
+    def parse_output(self, output: str, output_format: str, formatted_prompt: str) -> Any:
+        """Parse raw CLI output for the requested format"""
+        if output_format == 'json':
+            with metrics.stage("parse", model=self.model_name, response_bytes=len(output)) as stage:
+                data, complete = extract_json(output)
+                stage["complete"] = complete
+            if data is None:
+                if '[' not in output and '{' not in output:
+                    # Return empty list if no JSON found
+                    return []
+                # Don't keep serving an unparseable response from the cache
+                self.discard_cached(formatted_prompt)
+                return [{"error": "Failed to parse JSON", "raw_output": output}]
             
-            if result.returncode != 0:
-                error = result.stderr.decode(encoding, errors='ignore')
-                raise RuntimeError(f"Command failed: {error}")
+            if not complete:
+                # Keep the recovered items, but let the next run ask for the full response
+                self.discard_cached(formatted_prompt)
+                count = len(data) if isinstance(data, list) else 1
+                logger.warning("⚠️  %s response was incomplete; recovered %d complete item(s)", self.cli_name, count)
+            return data
+        
+        return output
+    
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Concurrency limit for this model on the running event loop"""
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.setdefault(loop, {})
+        key = f"{self.command}:{self.model_name}"
+        if key not in semaphores:
+            semaphores[key] = asyncio.Semaphore(self.max_concurrency)
+        return semaphores[key]
+    
+    async def aexecute_command(self, prompt: str, encoding: str = 'shift-jis') -> str:
+        """Execute the CLI without blocking the event loop
+
+        Timed-out or cancelled calls kill the subprocess before returning.
+        """
+        tokens = estimate_tokens(prompt)
+        started = time.perf_counter()
+        status = "error"
+        output = None
+        requeue = 0
+        
+        try:
+            async with self._semaphore():
+                for requeue in range(self.rate_limiter.max_requeues + 1):
+                    slot = await self.rate_limiter.aacquire(tokens)
+                    try:
+                        output = await self._aexecute_once(prompt)
+                        status = "ok"
+                        return output
+                    except RateLimitError:
+                        if requeue == self.rate_limiter.max_requeues:
+                            status = "rate_limited"
+                            raise
+                        delay = self.rate_limiter.backoff(requeue)
+                        logger.warning("🚦 %s is rate limited. Requeuing in %.0fs... (%d/%d)",
+                                       self.cli_name, delay, requeue + 1, self.rate_limiter.max_requeues)
+                    finally:
+                        self.rate_limiter.release(slot)
+                    await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            # Attempt counts aren't tracked on the async path
+            self._record_call(prompt, output, started, 0, requeue, status)
+    
+    async def _aexecute_once(self, prompt: str) -> str:
+        """Run the CLI asynchronously under the retry policy's attempt schedule"""
+        cmd = self.build_command(prompt)
+        prompt_input = self.prompt_input(prompt)
+        stdin_data = prompt_input.encode('utf-8') if prompt_input is not None else None
+        
+        for attempt, attempt_timeout in self.retry_policy.attempts():
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdin=asyncio.subprocess.PIPE if stdin_data is not None else asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    env=self.build_env()
+                )
+            except FileNotFoundError:
+                raise RuntimeError(f"Command '{self.command}' not found. Please install {self.cli_name}.")
             
-            return output
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(stdin_data), attempt_timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+                process.kill()
+                await process.wait()
+                if isinstance(e, asyncio.CancelledError):
+                    raise
+                continue
             
-        finally:
-            os.unlink(tmp_path)
+            if process.returncode != 0:
+                self.raise_for_error(stderr.decode('utf-8', errors='replace'))
+            
+            return self.clean_output(stdout.decode('utf-8', errors='replace'))
+        
+        raise RuntimeError(f"Command timed out: no response within the {int(self.retry_policy.deadline)}s deadline")
+    
+    async def acached_execute(self, prompt: str, encoding: str = 'shift-jis') -> str:
+        """Async counterpart of cached_execute"""
+        if self.cache is None or not self.cache.enabled:
+            return await self.aexecute_command(prompt, encoding)
+        
+        key = self.cache.make_key(self.model_name, self.command, self.options, prompt)
+        output = self.cache.get(key)
+        if output is None:
+            output = await self.aexecute_command(prompt, encoding)
+            self.cache.put(key, output)
+        return output
+    
+    async def agenerate(self,
+                       prompt: str,
+                       output_format: str = 'json',
+                       encoding: str = 'shift-jis') -> Any:
+        """Generate asynchronously with the same parsing semantics as generate()"""
+        formatted_prompt = self.wrap_prompt(prompt, output_format, encoding)
+        output = await self.acached_execute(formatted_prompt, encoding)
+        return self.parse_output(output, output_format, formatted_prompt)
     
     @abstractmethod
     def generate(self, 
@@ -73,6 +405,9 @@ class AIModelBase(ABC):
     
     def validate_command(self) -> bool:
         """Check if CLI command is available"""
+        if self.availability is not None:
+            return self.availability.is_available(self.command)
+        
         try:
             result = subprocess.run(
                 [self.command, '--version'],
@@ -0,0 +1,152 @@
+"""Persistent, content-addressed cache for raw CLI responses"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class ResponseCache:
+    """On-disk cache of model output keyed by model, command, options and prompt hash
+
+    Entries are plain files written atomically (temp file + rename), so several
+    ai-dev processes can share one cache directory. The file mtime is the
+    creation time (used for TTL) and the atime is bumped on every hit (used for
+    LRU eviction once the directory grows past ``max_size_mb``).
+    """
+    
+    SUFFIX = '.out'
+    
+    def __init__(self,
+                 directory: str = '~/.cache/ai-dev/responses',
+                 max_size_mb: float = 512,
+                 ttl: Optional[int] = None,
+                 enabled: bool = True,
+                 refresh: bool = False):
+        self.directory = Path(directory).expanduser()
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.ttl = ttl
+        self.enabled = enabled
+        self.refresh = refresh  # Skip lookups but still store fresh responses
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'ResponseCache':
+        """Create cache from the ``cache`` configuration section"""
+        return cls(
+            directory=config.get('directory', '~/.cache/ai-dev/responses'),
+            max_size_mb=config.get('max_size_mb', 512),
+            ttl=config.get('ttl'),
+            enabled=config.get('enabled', True)
+        )
+    
+    @staticmethod
+    def make_key(model_name: str, command: str, options: List[str], prompt: str) -> str:
+        """Build a content-addressed key for a CLI call"""
+        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        material = json.dumps([model_name, command, list(options), prompt_hash])
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+    
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{self.SUFFIX}"
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return cached output or None on miss / expiry"""
+        if not self.enabled or self.refresh:
+            return None
+        
+        path = self._path(key)
+        try:
+            stat = path.stat()
+            if self.ttl and time.time() - stat.st_mtime > self.ttl:
+                path.unlink(missing_ok=True)
+                return None
+            output = path.read_text(encoding='utf-8')
+            # Record the access for LRU while keeping mtime as creation time
+            os.utime(path, (time.time(), stat.st_mtime))
+            return output
+        except UnicodeDecodeError:
+            # Corrupted entry; drop it so the next call stores a fresh response
+            path.unlink(missing_ok=True)
+            return None
+        except (FileNotFoundError, OSError):
+            return None
+    
+    def put(self, key: str, output: str) -> None:
+        """Store output atomically and evict old entries if over budget"""
+        if not self.enabled:
+            return
+        
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(output)
+            os.replace(tmp_path, path)
+        except OSError:
+            # The cache is an optimization; never fail a generation because of it
+            return
+        
+        self._evict()
+    
+    def discard(self, key: str) -> None:
+        """Remove a single entry (e.g. a response that failed to parse)"""
+        self._path(key).unlink(missing_ok=True)
+    
+    def _entries(self) -> List[Tuple[Path, os.stat_result]]:
+        entries = []
+        if self.directory.exists():
+            for path in self.directory.glob(f"*/*{self.SUFFIX}"):
+                try:
+                    entries.append((path, path.stat()))
+                except FileNotFoundError:
+                    continue
+        return entries
+    
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits max_size"""
+        lock_path = self.directory / '.lock'
+        with open(lock_path, 'a') as lock:
+            if fcntl:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return  # Another process is already evicting
+            
+            entries = self._entries()
+            total = sum(stat.st_size for _, stat in entries)
+            if total <= self.max_size:
+                return
+            
+            for path, stat in sorted(entries, key=lambda e: e[1].st_atime):
+                path.unlink(missing_ok=True)
+                total -= stat.st_size
+                if total <= self.max_size:
+                    break
+    
+    def clear(self) -> int:
+        """Remove every cached response and return the number removed"""
+        entries = self._entries()
+        for path, _ in entries:
+            path.unlink(missing_ok=True)
+        return len(entries)
+    
+    def info(self) -> Dict[str, Any]:
+        """Return cache statistics"""
+        entries = self._entries()
+        return {
+            "directory": str(self.directory),
+            "entries": len(entries),
+            "size_mb": round(sum(stat.st_size for _, stat in entries) / (1024 * 1024), 2),
+            "max_size_mb": round(self.max_size / (1024 * 1024), 2),
+            "ttl": self.ttl,
+            "enabled": self.enabled
+        }
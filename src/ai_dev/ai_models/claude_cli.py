@@ -1,31 +1,31 @@
 """Claude Code CLI Wrapper"""
 
 from .base import AIModelBase
-import json
-import re
 import subprocess
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 import os
 
 
 class ClaudeCLI(AIModelBase):
     """Claude Code CLI wrapper for text generation"""
     
+    cli_name = "Claude CLI"
+    
     def format_prompt(self, prompt: str) -> str:
         """Format prompt for Claude CLI"""
         return prompt
     
-    def execute_command(self, prompt: str, encoding: str = 'utf-8') -> str:
-        """Execute Claude CLI command with automatic timeout extension"""
-        
-        # Claude CLI expects the prompt as an argument with --print option for non-interactive mode
+    def build_command(self, prompt: str) -> List[str]:
+        """Build the Claude CLI argv for a prompt"""
+        # --print reads the prompt from stdin when no prompt argument is given
         # Use --output-format json for JSON responses
         cmd = [
             self.command,
             "--print",  # Non-interactive mode
             "--output-format", "text",  # We'll request JSON in the prompt itself
-            prompt
         ]
+        if self.prompt_transport != 'stdin':
+            cmd.append(prompt)
         
         # Add any additional options from config
         if self.options:
@@ -34,43 +34,27 @@ class ClaudeCLI(AIModelBase):
                 if opt and not opt.startswith('--temperature') and not opt.startswith('--max-tokens'):
                     cmd.insert(1, opt)  # Insert after command but before prompt
         
-        current_timeout = self.timeout if self.timeout else 300  # デフォルト5分
-        max_retries = 3
-        timeout_multiplier = 2.0  # 2倍ずつ延長（5分→10分→20分）
-        
-        for attempt in range(max_retries):
-            try:
-                # Execute command with current timeout
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=current_timeout,
-                    env={**os.environ, "CLAUDE_NONINTERACTIVE": "1"}  # Ensure non-interactive mode
-                )
-                
-                if result.returncode != 0:
-                    # Check for specific error messages
-                    if "API key" in result.stderr or "authentication" in result.stderr.lower():
-                        raise RuntimeError("Claude CLI authentication error. Please ensure you're logged in with 'claude login'")
-                    raise RuntimeError(f"Command failed: {result.stderr}")
-                
-                return result.stdout
-                
-            except subprocess.TimeoutExpired:
-                if attempt < max_retries - 1:
-                    old_timeout = current_timeout
-                    current_timeout = int(current_timeout * timeout_multiplier)
-                    print(f"\n⏱️  Claude CLI timed out after {old_timeout}s.")
-                    print(f"    Extending timeout to {current_timeout}s and retrying... (Attempt {attempt + 2}/{max_retries})")
-                    print(f"    💡 Tip: Use --timeout option to set a custom timeout (e.g., --timeout 600 for 10 minutes)\n")
-                    continue
-                else:
-                    print(f"\n❌ Claude CLI failed after {max_retries} attempts (max timeout: {current_timeout}s)")
-                    print(f"    💡 Try using a longer timeout: ai-dev --timeout 1200 generate ...\n")
-                    raise RuntimeError(f"Command timed out after {max_retries} attempts with timeout {current_timeout}s")
-            except FileNotFoundError:
-                raise RuntimeError(f"Command '{self.command}' not found. Please install Claude CLI.")
+        return cmd
+    
+    def build_env(self) -> Optional[Dict[str, str]]:
+        """Environment for the Claude CLI subprocess"""
+        return {**os.environ, "CLAUDE_NONINTERACTIVE": "1"}  # Ensure non-interactive mode
+    
+    def wrap_prompt(self, prompt: str, output_format: str = 'json', encoding: str = 'utf-8') -> str:
+        """Add output format instructions to the prompt"""
+        return f"""
+{prompt}
+
+Output format: {output_format}
+Please provide the output in valid {output_format} format only, without any explanatory text.
+"""
+    
+    def raise_for_error(self, stderr: str) -> None:
+        """Raise a descriptive error for a failed Claude CLI call"""
+        # Check for specific error messages
+        if "API key" in stderr or "authentication" in stderr.lower():
+            raise RuntimeError("Claude CLI authentication error. Please ensure you're logged in with 'claude login'")
+        super().raise_for_error(stderr)
     
     def generate(self, 
                 prompt: str, 
@@ -79,38 +63,13 @@ class ClaudeCLI(AIModelBase):
         """Generate text using Claude CLI"""
         
         # Add format specification to prompt
-        formatted_prompt = f"""
-{prompt}
-
-Output format: {output_format}
-Please provide the output in valid {output_format} format only, without any explanatory text.
-"""
+        formatted_prompt = self.wrap_prompt(prompt, output_format, encoding)
         
-        # Execute CLI command
-        output = self.execute_command(formatted_prompt, encoding)
+        # Execute CLI command (or reuse the cached response for this exact prompt)
+        output = self.cached_execute(formatted_prompt, encoding)
         
         # Parse result based on format
-        if output_format == 'json':
-            # Try to extract JSON from markdown code block first
-            code_block_match = re.search(r'```(?:json)?\s*\n([\s\S]*?)\n```', output)
-            if code_block_match:
-                json_str = code_block_match.group(1)
-            else:
-                # Otherwise try to find raw JSON
-                json_match = re.search(r'(\{[\s\S]*\}|\[[\s\S]*\])', output)
-                if json_match:
-                    json_str = json_match.group(1)
-                else:
-                    # Return empty list if no JSON found
-                    return []
-            
-            try:
-                return json.loads(json_str)
-            except json.JSONDecodeError as e:
-                # If JSON parsing fails, return the output as a single item
-                return [{"error": "Failed to parse JSON", "raw_output": output}]
-        
-        return output
+        return self.parse_output(output, output_format, formatted_prompt)
     
     def generate_with_context(self,
                             prompt: str,
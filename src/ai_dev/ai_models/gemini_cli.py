@@ -1,66 +1,48 @@
 """Gemini CLI Wrapper"""
 
 from .base import AIModelBase
-import json
-import re
-import subprocess
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 
 class GeminiCLI(AIModelBase):
     """Gemini CLI wrapper for text generation"""
     
+    cli_name = "Gemini CLI"
+    
     def format_prompt(self, prompt: str) -> str:
         """Format prompt for Gemini CLI"""
         return prompt
     
-    def execute_command(self, prompt: str, encoding: str = 'shift-jis') -> str:
-        """Execute Gemini CLI command with automatic timeout extension"""
-        
-        # Gemini CLI expects --prompt parameter directly
-        cmd = [self.command, "--prompt", self.format_prompt(prompt)]
+    def build_command(self, prompt: str) -> List[str]:
+        """Build the Gemini CLI argv for a prompt"""
+        cmd = [self.command]
+        if self.config.get('model'):
+            cmd += ["--model", self.config['model']]  # Pinned variant (e.g. a pool backend)
         
-        current_timeout = self.timeout if self.timeout else 300  # デフォルト5分
-        max_retries = 3
-        timeout_multiplier = 2.0  # 2倍ずつ延長（5分→10分→20分）
+        # Gemini CLI answers a piped stdin prompt non-interactively; --prompt is the argv form
+        if self.prompt_transport == 'stdin':
+            return cmd
+        return cmd + ["--prompt", self.format_prompt(prompt)]
+    
+    def wrap_prompt(self, prompt: str, output_format: str = 'json', encoding: str = 'shift-jis') -> str:
+        """Add output format and encoding hints to the prompt"""
+        return f"""
+{prompt}
+
+Output format: {output_format}
+Character encoding: {encoding}
+"""
+    
+    def clean_output(self, output: str) -> str:
+        """Remove "Loaded cached credentials." and other non-content lines"""
+        output_lines = output.split('\n')
+        cleaned_lines = []
+        for line in output_lines:
+            if not line.startswith('Loaded cached credentials') and \
+               not line.startswith('Loading'):
+                cleaned_lines.append(line)
         
-        for attempt in range(max_retries):
-            try:
-                # Execute command with current timeout
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,  # Text mode for Gemini
-                    timeout=current_timeout
-                )
-                
-                if result.returncode != 0:
-                    raise RuntimeError(f"Command failed: {result.stderr}")
-                
-                # Clean output - remove "Loaded cached credentials." and other non-content lines
-                output_lines = result.stdout.split('\n')
-                cleaned_lines = []
-                for line in output_lines:
-                    if not line.startswith('Loaded cached credentials') and \
-                       not line.startswith('Loading'):
-                        cleaned_lines.append(line)
-                
-                return '\n'.join(cleaned_lines)
-                
-            except subprocess.TimeoutExpired:
-                if attempt < max_retries - 1:
-                    old_timeout = current_timeout
-                    current_timeout = int(current_timeout * timeout_multiplier)
-                    print(f"\n⏱️  Gemini CLI timed out after {old_timeout}s.")
-                    print(f"    Extending timeout to {current_timeout}s and retrying... (Attempt {attempt + 2}/{max_retries})")
-                    print(f"    💡 Tip: Use --timeout option to set a custom timeout (e.g., --timeout 600 for 10 minutes)\n")
-                    continue
-                else:
-                    print(f"\n❌ Gemini CLI failed after {max_retries} attempts (max timeout: {current_timeout}s)")
-                    print(f"    💡 Try using a longer timeout: ai-dev --timeout 1200 generate ...\n")
-                    raise RuntimeError(f"Command timed out after {max_retries} attempts with timeout {current_timeout}s")
-            except FileNotFoundError:
-                raise RuntimeError(f"Command '{self.command}' not found. Please install Gemini CLI.")
+        return '\n'.join(cleaned_lines)
     
     def generate(self, 
                 prompt: str, 
@@ -69,38 +51,13 @@ class GeminiCLI(AIModelBase):
         """Generate text using Gemini CLI"""
         
         # Add format specification to prompt
-        formatted_prompt = f"""
-{prompt}
-
-Output format: {output_format}
-Character encoding: {encoding}
-"""
+        formatted_prompt = self.wrap_prompt(prompt, output_format, encoding)
         
-        # Execute CLI command
-        output = self.execute_command(formatted_prompt, encoding)
+        # Execute CLI command (or reuse the cached response for this exact prompt)
+        output = self.cached_execute(formatted_prompt, encoding)
         
         # Parse result based on format
-        if output_format == 'json':
-            # Try to extract JSON from markdown code block first
-            code_block_match = re.search(r'```(?:json)?\s*\n([\s\S]*?)\n```', output)
-            if code_block_match:
-                json_str = code_block_match.group(1)
-            else:
-                # Otherwise try to find raw JSON
-                json_match = re.search(r'(\{[\s\S]*\}|\[[\s\S]*\])', output)
-                if json_match:
-                    json_str = json_match.group(1)
-                else:
-                    # Return empty list if no JSON found
-                    return []
-            
-            try:
-                return json.loads(json_str)
-            except json.JSONDecodeError as e:
-                # If JSON parsing fails, return the output as a single item
-                return [{"error": "Failed to parse JSON", "raw_output": output}]
-        
-        return output
+        return self.parse_output(output, output_format, formatted_prompt)
     
     def generate_with_context(self,
                             prompt: str,
@@ -1,31 +1,38 @@
 """AI Model Manager for switching between different AI models"""
 
-from typing import Dict, Any, Optional
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Union
 from .gemini_cli import GeminiCLI
 from .claude_cli import ClaudeCLI
 from .base import AIModelBase
+from .availability import AvailabilityCache
+from .cache import ResponseCache
+from .pool import ModelPool
 
 
 class ModelManager:
     """Manages AI models and handles switching between them"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], model_name: Optional[str] = None, pool: bool = False):
         self.config = config
         self.models = {
             'gemini': GeminiCLI,
             'claude': ClaudeCLI
         }
-        self.current_model: Optional[AIModelBase] = None
-        self.current_model_name: Optional[str] = None
-        self._initialize_default_model()
-    
-    def _initialize_default_model(self):
-        """Initialize the default model from config"""
-        default_model = self.config.get('ai_models', {}).get('default', 'gemini')
-        self.use_model(default_model)
+        self.current_model: Optional[Union[AIModelBase, ModelPool]] = None
+        self.response_cache = ResponseCache.from_config(self.config.get('cache', {}))
+        self.availability = AvailabilityCache()
+        self._lock = threading.Lock()
+        
+        # The model is created (and its CLI probed) on first use, so commands
+        # that never call a model don't pay for it
+        self.current_model_name: Optional[str] = model_name or self.config.get('ai_models', {}).get('default', 'gemini')
+        self.pool_mode = pool or self.config.get('ai_models', {}).get('pool', {}).get('enabled', False)
+        if self.pool_mode:
+            self.current_model_name = 'pool'
     
-    def use_model(self, model_name: str) -> None:
-        """Switch to a specified AI model"""
+    def create_model(self, model_name: str, variant: Optional[str] = None) -> AIModelBase:
+        """Create a model wrapper, optionally pinned to a specific model variant"""
         if model_name not in self.models:
             raise ValueError(f"Unknown model: {model_name}. Available models: {', '.join(self.models.keys())}")
         
@@ -37,10 +44,19 @@ class ModelManager:
                 'options': [],
                 'timeout': 60
             }
+        if variant:
+            model_config = {**model_config, 'model': variant}
         
-        model_class = self.models[model_name]
-        self.current_model = model_class(model_config)
+        model = self.models[model_name](model_config)
+        model.cache = self.response_cache
+        model.availability = self.availability
+        return model
+    
+    def use_model(self, model_name: str) -> None:
+        """Switch to a specified AI model"""
+        self.current_model = self.create_model(model_name)
         self.current_model_name = model_name
+        self.pool_mode = False
         
         # Validate if the command is available
         if not self.current_model.validate_command():
@@ -48,20 +64,86 @@ class ModelManager:
         
         print(f"✅ Switched to {model_name} model")
     
-    def get_current_model(self) -> Optional[AIModelBase]:
-        """Get the current active model"""
+    def pool_members(self) -> List[str]:
+        """Pool backends: ``ai_models.pool.members`` or every configured model
+
+        Members are CLI names, optionally pinned to a variant ("gemini:gemini-2.5-flash").
+        By default each model in ``gemini.models.available`` is its own backend.
+        """
+        ai_models = self.config.get('ai_models', {})
+        members = ai_models.get('pool', {}).get('members')
+        if members:
+            return list(members)
+        
+        members = []
+        for model_name in self.models:
+            available = (ai_models.get(model_name, {}).get('models') or {}).get('available') or []
+            members.extend(f"{model_name}:{variant}" for variant in available)
+            if not available:
+                members.append(model_name)
+        return members
+    
+    def use_pool(self, members: Optional[List[str]] = None) -> None:
+        """Route requests across several backends instead of a single model"""
+        backends: Dict[str, AIModelBase] = {}
+        for member in members or self.pool_members():
+            model_name, _, variant = member.partition(':')
+            model = self.create_model(model_name, variant or None)
+            if model.validate_command():
+                backends[member] = model
+            else:
+                print(f"⚠️  Warning: {model_name} CLI command not found; leaving {member} out of the pool.")
+        
+        pool_config = self.config.get('ai_models', {}).get('pool', {})
+        self.current_model = ModelPool(backends, failure_cooldown=pool_config.get('failure_cooldown', 30))
+        self.current_model_name = self.current_model.name
+        self.pool_mode = True
+        
+        print(f"✅ Using model pool: {', '.join(backends)}")
+    
+    def get_current_model(self) -> Optional[Union[AIModelBase, ModelPool]]:
+        """Get the current active model, creating it on first use"""
+        with self._lock:
+            if self.current_model is None and self.pool_mode:
+                self.use_pool()
+            elif self.current_model is None and self.current_model_name:
+                self.use_model(self.current_model_name)
         return self.current_model
     
     def get_current_model_name(self) -> Optional[str]:
         """Get the name of the current active model"""
         return self.current_model_name
     
+    def model_settings(self) -> Tuple[str, Dict[str, Any]]:
+        """Name and backend settings of the selected model or pool, from configuration only
+        
+        Unlike get_current_model_name() this does not change once the model is
+        created, so it can key outputs (fingerprints) computed before and after a call.
+        """
+        ai_models = self.config.get('ai_models', {})
+        
+        def settings(member: str) -> Dict[str, Any]:
+            model_name, _, variant = member.partition(':')
+            section = ai_models.get(model_name, {}) or {}
+            values = {key: section.get(key) for key in ('model', 'models', 'options')}
+            if variant:
+                values['model'] = variant
+            return values
+        
+        if self.pool_mode:
+            members = sorted(self.pool_members())
+            return f"pool({', '.join(members)})", {member: settings(member) for member in members}
+        return self.current_model_name, settings(self.current_model_name or '')
+    
     def list_available_models(self) -> list:
         """List all available models"""
         return list(self.models.keys())
     
     def validate_current_model(self) -> bool:
         """Validate if the current model CLI is available"""
-        if self.current_model:
-            return self.current_model.validate_command()
+        model = self.get_current_model()
+        if isinstance(model, ModelPool):
+            return bool(model.backends)
+        if model:
+            return model.validate_command()
         return False
\ No newline at end of file
@@ -0,0 +1,180 @@
+"""Pool of AI model backends with latency-aware routing and failover"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from .base import AIModelBase
+
+logger = logging.getLogger(__name__)
+
+
+class BackendStats:
+    """Rolling latency and error-rate statistics for one backend"""
+
+    def __init__(self, window: int = 20, alpha: float = 0.3):
+        self.alpha = alpha
+        self.latency: Optional[float] = None  # Exponentially weighted, successes only
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.inflight = 0
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def record_success(self, seconds: float) -> None:
+        self.outcomes.append(True)
+        self.consecutive_failures = 0
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency = self.alpha * seconds + (1 - self.alpha) * self.latency
+
+    def record_failure(self, cooldown: float) -> None:
+        self.outcomes.append(False)
+        self.consecutive_failures += 1
+        # Back off exponentially from a backend that keeps failing
+        self.cooldown_until = time.monotonic() + cooldown * 2 ** min(self.consecutive_failures - 1, 5)
+
+    def score(self) -> float:
+        """Expected cost of sending one more request here (lower is better)"""
+        latency = self.latency if self.latency is not None else 0.0  # Untried backends go first
+        return latency * (1 + self.inflight) / max(0.1, 1 - self.error_rate)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "latency": round(self.latency, 2) if self.latency is not None else None,
+            "error_rate": round(self.error_rate, 2),
+            "requests": len(self.outcomes),
+            "inflight": self.inflight,
+            "cooling_down": self.cooldown_until > time.monotonic()
+        }
+
+
+class ModelPool:
+    """Route each request to the healthiest backend and fail over on errors
+
+    Exposes the same generate/agenerate/stream_generate interface as a single
+    model, so generators don't need to know whether they are talking to one
+    CLI or several. Concurrent requests spread across backends because the
+    score of a backend grows with its in-flight requests.
+    """
+
+    def __init__(self, backends: Dict[str, AIModelBase], failure_cooldown: float = 30.0):
+        if not backends:
+            raise RuntimeError("Model pool has no available backends")
+        self.backends = backends
+        self.failure_cooldown = failure_cooldown
+        self.stats = {name: BackendStats() for name in backends}
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return f"pool({', '.join(self.backends)})"
+
+    @property
+    def max_input_tokens(self) -> Optional[int]:
+        """Smallest member budget, since a request may be routed to any member"""
+        budgets = [b.max_input_tokens for b in self.backends.values() if b.max_input_tokens]
+        return min(budgets) if budgets else None
+
+    def ranked(self) -> List[str]:
+        """Backends ordered by score, cooling-down ones last
+
+        Ties (e.g. backends not tried yet, which all score 0) go to the one
+        with fewer requests in flight.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return sorted(
+                self.backends,
+                key=lambda n: (self.stats[n].cooldown_until > now, self.stats[n].score(), self.stats[n].inflight)
+            )
+
+    @contextmanager
+    def _track(self, name: str) -> Iterator[None]:
+        """Count an in-flight request and record its outcome"""
+        stats = self.stats[name]
+        with self._lock:
+            stats.inflight += 1
+        started = time.monotonic()
+        outcome = None
+        try:
+            yield
+            outcome = True
+        except Exception:
+            outcome = False
+            raise
+        finally:
+            # outcome stays None when a stream consumer stops early
+            with self._lock:
+                stats.inflight -= 1
+                if outcome:
+                    stats.record_success(time.monotonic() - started)
+                elif outcome is False:
+                    stats.record_failure(self.failure_cooldown)
+
+    def _failover_error(self, errors: List[Tuple[str, Exception]]) -> RuntimeError:
+        details = "; ".join(f"{name}: {error}" for name, error in errors)
+        return RuntimeError(f"All backends in the model pool failed ({details})")
+
+    def generate(self,
+                 prompt: str,
+                 output_format: str = 'json',
+                 encoding: str = 'shift-jis') -> Any:
+        """Generate with the best backend, falling back to the next on failure"""
+        errors: List[Tuple[str, Exception]] = []
+        for name in self.ranked():
+            try:
+                with self._track(name):
+                    return self.backends[name].generate(prompt, output_format, encoding)
+            except RuntimeError as e:
+                logger.warning("⚠️  %s failed, trying the next backend: %s", name, e)
+                errors.append((name, e))
+        raise self._failover_error(errors)
+
+    async def agenerate(self,
+                        prompt: str,
+                        output_format: str = 'json',
+                        encoding: str = 'shift-jis') -> Any:
+        """Async counterpart of generate()"""
+        errors: List[Tuple[str, Exception]] = []
+        for name in self.ranked():
+            try:
+                with self._track(name):
+                    return await self.backends[name].agenerate(prompt, output_format, encoding)
+            except RuntimeError as e:
+                errors.append((name, e))
+        raise self._failover_error(errors)
+
+    def stream_generate(self,
+                        prompt: str,
+                        output_format: str = 'json',
+                        encoding: str = 'shift-jis') -> Iterator[Any]:
+        """Stream from the best backend; fails over only before the first item"""
+        errors: List[Tuple[str, Exception]] = []
+        for name in self.ranked():
+            produced = False
+            try:
+                with self._track(name):
+                    for item in self.backends[name].stream_generate(prompt, output_format, encoding):
+                        produced = True
+                        yield item
+                return
+            except RuntimeError as e:
+                if produced:
+                    raise
+                errors.append((name, e))
+        raise self._failover_error(errors)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Current statistics per backend"""
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self.stats.items()}
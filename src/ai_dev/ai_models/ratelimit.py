@@ -0,0 +1,213 @@
+"""Cross-process token-bucket rate limiting for CLI invocations"""
+
+import asyncio
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# stderr fragments the Gemini and Claude CLIs print when a provider quota is hit
+_RATE_LIMIT_PATTERN = re.compile(
+    r'\b429\b|rate[ _-]?limit|too many requests|quota|resource[ _]exhausted|overloaded',
+    re.IGNORECASE
+)
+
+
+class RateLimitError(RuntimeError):
+    """The provider rejected a call because of a rate limit or quota"""
+
+
+def is_rate_limited(stderr: str) -> bool:
+    """Whether CLI stderr reports a rate limit rather than a real failure"""
+    return bool(_RATE_LIMIT_PATTERN.search(stderr or ''))
+
+
+class RateLimiter:
+    """Requests/minute and tokens/minute buckets plus an in-flight cap for one backend
+
+    The bucket state lives in a small JSON file guarded by an exclusive
+    ``flock``, so every ai-dev process on the machine draws from the same
+    quota. A rate-limit response pauses all of them via ``blocked_until``.
+    """
+
+    def __init__(self,
+                 name: str,
+                 requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None,
+                 max_inflight: Optional[int] = None,
+                 max_requeues: int = 5,
+                 backoff: float = 10.0,
+                 directory: str = '~/.cache/ai-dev/ratelimit'):
+        self.name = re.sub(r'[^\w.-]', '_', name)
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_inflight = max_inflight
+        self.max_requeues = max_requeues
+        self.backoff_base = backoff
+        self.directory = Path(directory).expanduser()
+
+    @classmethod
+    def from_config(cls, name: str, config: Dict[str, Any]) -> 'RateLimiter':
+        """Create limiter from a model's ``rate_limit`` configuration section"""
+        return cls(
+            name,
+            requests_per_minute=config.get('requests_per_minute'),
+            tokens_per_minute=config.get('tokens_per_minute'),
+            max_inflight=config.get('max_inflight'),
+            max_requeues=config.get('max_requeues', 5),
+            backoff=config.get('backoff', 10.0),
+            directory=config.get('directory', '~/.cache/ai-dev/ratelimit')
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.requests_per_minute or self.tokens_per_minute or self.max_inflight)
+
+    @contextmanager
+    def _state(self) -> Iterator[Dict[str, Any]]:
+        """Load, lock and save the shared bucket state"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{self.name}.json"
+        with open(self.directory / f"{self.name}.lock", 'a') as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                state = json.loads(path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                state = {}
+            yield state
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps(state), encoding='utf-8')
+            os.replace(tmp_path, path)
+
+    def _refill(self, state: Dict[str, Any], now: float) -> None:
+        elapsed = max(0.0, now - state.get('updated', now))
+        state['updated'] = now
+        if self.requests_per_minute:
+            state['requests'] = min(self.requests_per_minute,
+                                    state.get('requests', self.requests_per_minute) + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            state['tokens'] = min(self.tokens_per_minute,
+                                  state.get('tokens', self.tokens_per_minute) + elapsed * self.tokens_per_minute / 60)
+
+        # Drop slots held by processes that died without releasing them
+        inflight = state.get('inflight', {})
+        for slot in list(inflight):
+            pid = int(slot.split(':', 1)[0])
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                del inflight[slot]
+            except PermissionError:
+                pass
+        state['inflight'] = inflight
+
+    def _take(self, tokens: int) -> Tuple[float, Optional[str]]:
+        """Take a slot if one is free now: (0, slot id), else (seconds to wait, None)"""
+        now = time.time()
+        with self._state() as state:
+            self._refill(state, now)
+            waits = [state.get('blocked_until', 0) - now]
+            if self.requests_per_minute and state['requests'] < 1:
+                waits.append((1 - state['requests']) * 60 / self.requests_per_minute)
+            if self.tokens_per_minute and state['tokens'] < tokens:
+                waits.append((tokens - state['tokens']) * 60 / self.tokens_per_minute)
+            if self.max_inflight and len(state['inflight']) >= self.max_inflight:
+                waits.append(0.5)  # Poll until another call finishes
+
+            wait = max(waits)
+            if wait > 0:
+                return wait, None
+            if self.requests_per_minute:
+                state['requests'] -= 1
+            if self.tokens_per_minute:
+                state['tokens'] -= tokens
+            slot = f"{os.getpid()}:{uuid.uuid4().hex}"
+            state['inflight'][slot] = now
+            return 0, slot
+
+    def acquire(self, tokens: int = 0) -> Optional[str]:
+        """Block until a request may start; returns a slot id for release()"""
+        if not self.enabled:
+            return None
+
+        # A request larger than the whole bucket waits for a full bucket instead of forever
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+
+        while True:
+            wait, slot = self._take(tokens)
+            if slot is not None:
+                return slot
+            time.sleep(min(wait, 5.0))
+
+    async def aacquire(self, tokens: int = 0) -> Optional[str]:
+        """acquire() for coroutines
+
+        Polls on the event loop instead of blocking a worker thread, so a task
+        cancelled while waiting never takes a slot that nobody releases.
+        """
+        if not self.enabled:
+            return None
+
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+
+        while True:
+            wait, slot = self._take(tokens)
+            if slot is not None:
+                return slot
+            await asyncio.sleep(min(wait, 5.0))
+
+    def try_acquire(self, tokens: int = 0) -> Optional[str]:
+        """Take a slot only if one is free right now (for optional extra calls such as hedges)
+
+        Returns the slot id, or None when the quota or in-flight limit is reached.
+        """
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+        return self._take(tokens)[1]
+
+    def release(self, slot: Optional[str]) -> None:
+        """Give back an in-flight slot"""
+        if slot is None:
+            return
+        with self._state() as state:
+            state.get('inflight', {}).pop(slot, None)
+
+    @contextmanager
+    def slot(self, tokens: int = 0) -> Iterator[None]:
+        """Hold an in-flight slot for the duration of a call"""
+        slot = self.acquire(tokens)
+        try:
+            yield
+        finally:
+            self.release(slot)
+
+    def backoff(self, attempt: int) -> float:
+        """Pause every process using this backend after a rate-limit response
+
+        Returns the delay (exponential with jitter) before the call is requeued.
+        """
+        delay = self.backoff_base * 2 ** attempt * random.uniform(0.8, 1.2)
+        if not self.enabled:
+            return delay
+
+        with self._state() as state:
+            self._refill(state, time.time())
+            state['blocked_until'] = max(state.get('blocked_until', 0), time.time() + delay)
+            # The provider says we're over quota, so the local buckets were too optimistic
+            if self.requests_per_minute:
+                state['requests'] = 0
+        return delay
@@ -0,0 +1,210 @@
+"""Deadline-aware retry policy with hedged requests for CLI calls"""
+
+import json
+import logging
+import os
+import queue
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Retry and deadline notices; without logging configured they go to stderr
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Recent successful call latencies per model, persisted between runs"""
+    
+    def __init__(self, path: str = '~/.cache/ai-dev/latency.json', max_samples: int = 50):
+        self.path = Path(path).expanduser()
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+    
+    def _load(self) -> Dict[str, List[float]]:
+        try:
+            return json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+    
+    def record(self, key: str, seconds: float) -> None:
+        """Add a latency sample (write is atomic; concurrent writers may drop a sample)"""
+        with self._lock:
+            data = self._load()
+            samples = data.get(key, []) + [round(seconds, 3)]
+            data[key] = samples[-self.max_samples:]
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                pass
+    
+    def percentile(self, key: str, p: float, min_samples: int = 5) -> Optional[float]:
+        """Latency at percentile p (0-1), or None without enough history"""
+        samples = sorted(self._load().get(key, []))
+        if len(samples) < min_samples:
+            return None
+        index = min(len(samples) - 1, int(round(p * (len(samples) - 1))))
+        return samples[index]
+
+
+class RetryPolicy:
+    """Retry timed-out CLI calls within an overall deadline, optionally hedging
+
+    Each attempt's timeout grows by ``multiplier`` but never past the time left
+    before ``deadline``. With hedging enabled, a second identical process is
+    started once the first has run longer than the ``hedge_percentile`` latency
+    of recent calls; the first valid result wins and the other is killed.
+    A caller enforcing quotas passes ``acquire_hedge``, and a hedge only starts
+    if it returns a release callback (i.e. a rate-limit slot was free).
+    """
+    
+    def __init__(self,
+                 timeout: float = 300,
+                 deadline: Optional[float] = None,
+                 max_attempts: int = 3,
+                 multiplier: float = 2.0,
+                 hedge: bool = False,
+                 hedge_percentile: float = 0.9,
+                 hedge_min_samples: int = 5,
+                 tracker: Optional[LatencyTracker] = None):
+        self.timeout = timeout
+        self.deadline = max(deadline or timeout * max_attempts, timeout)
+        self.max_attempts = max_attempts
+        self.multiplier = multiplier
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.tracker = tracker or LatencyTracker()
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], timeout: float) -> 'RetryPolicy':
+        """Create policy from a model's ``retry`` configuration section"""
+        return cls(
+            timeout=timeout,
+            deadline=config.get('deadline'),
+            max_attempts=config.get('max_attempts', 3),
+            multiplier=config.get('multiplier', 2.0),
+            hedge=config.get('hedge', False),
+            hedge_percentile=config.get('hedge_percentile', 0.9),
+            hedge_min_samples=config.get('hedge_min_samples', 5),
+            tracker=LatencyTracker(config.get('latency_file', '~/.cache/ai-dev/latency.json'))
+        )
+    
+    def attempts(self) -> Iterator[Tuple[int, float]]:
+        """Yield (attempt number, timeout) pairs until attempts or the deadline run out"""
+        end = time.monotonic() + self.deadline
+        attempt_timeout = self.timeout
+        for attempt in range(1, self.max_attempts + 1):
+            remaining = end - time.monotonic()
+            if remaining <= 1:
+                return
+            yield attempt, min(attempt_timeout, remaining)
+            attempt_timeout *= self.multiplier
+    
+    def run(self,
+            cmd: List[str],
+            key: str,
+            label: str = "CLI",
+            env: Optional[Dict[str, str]] = None,
+            input: Optional[str] = None,
+            validate: Optional[Callable[[str], bool]] = None,
+            acquire_hedge: Optional[Callable[[], Optional[Callable[[], None]]]] = None
+            ) -> subprocess.CompletedProcess:
+        """Run a command under this policy and return the winning result
+
+        Raises subprocess.TimeoutExpired when every attempt timed out.
+        """
+        validate = validate or (lambda output: bool(output.strip()))
+        timeout = self.timeout
+        
+        for attempt, timeout in self.attempts():
+            hedge_delay = None
+            if self.hedge:
+                hedge_delay = self.tracker.percentile(key, self.hedge_percentile, self.hedge_min_samples)
+            
+            started = time.monotonic()
+            try:
+                result = self._run_hedged(cmd, timeout, hedge_delay, env, input, validate, acquire_hedge)
+            except subprocess.TimeoutExpired:
+                if attempt < self.max_attempts:
+                    logger.warning("⏱️  %s timed out after %ds. Retrying... (Attempt %d/%d, deadline %ds)",
+                                   label, timeout, attempt + 1, self.max_attempts, self.deadline)
+                continue
+            
+            if result.returncode == 0:
+                self.tracker.record(key, time.monotonic() - started)
+            result.attempts = attempt
+            return result
+        
+        logger.error("❌ %s did not finish within the %ds deadline "
+                     "(try a longer timeout: ai-dev --timeout 1200 generate ...)", label, self.deadline)
+        error = subprocess.TimeoutExpired(cmd[0], timeout)
+        error.attempts = self.max_attempts
+        raise error
+    
+    @staticmethod
+    def _spawn(cmd: List[str], env: Optional[Dict[str, str]], input: Optional[str],
+               results: "queue.Queue") -> subprocess.Popen:
+        """Start a process whose (process, stdout, stderr) lands on the results queue"""
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            env=env
+        )
+        
+        def wait():
+            stdout, stderr = process.communicate(input)
+            results.put((process, stdout, stderr))
+        
+        threading.Thread(target=wait, daemon=True).start()
+        return process
+    
+    def _run_hedged(self, cmd, timeout, hedge_delay, env, input, validate,
+                    acquire_hedge=None) -> subprocess.CompletedProcess:
+        """Run one attempt, starting a hedge process after hedge_delay seconds"""
+        results: "queue.Queue" = queue.Queue()
+        start = time.monotonic()
+        end = start + timeout
+        hedge_at = start + hedge_delay if hedge_delay and hedge_delay < timeout else None
+        running = [self._spawn(cmd, env, input, results)]
+        releases: List[Callable[[], None]] = []
+        
+        try:
+            while True:
+                next_event = min(t for t in (end, hedge_at) if t is not None)
+                try:
+                    process, stdout, stderr = results.get(timeout=max(0, next_event - time.monotonic()))
+                except queue.Empty:
+                    if hedge_at is not None and time.monotonic() >= hedge_at:
+                        hedge_at = None
+                        release = acquire_hedge() if acquire_hedge else (lambda: None)
+                        if release is not None:  # No free slot: keep waiting on the first call
+                            releases.append(release)
+                            running.append(self._spawn(cmd, env, input, results))
+                        continue
+                    raise subprocess.TimeoutExpired(cmd[0], timeout)
+                
+                running.remove(process)
+                completed = subprocess.CompletedProcess(process.args, process.returncode, stdout, stderr)
+                if process.returncode == 0 and validate(stdout):
+                    return completed
+                
+                if not running:
+                    # Nothing left to wait for (a failure before the hedge point is returned as is)
+                    return completed
+        finally:
+            for process in running:
+                process.kill()
+            for release in releases:
+                release()
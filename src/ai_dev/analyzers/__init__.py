@@ -1,15 +1,31 @@
 """File analyzer modules"""
 
 from .base import AnalyzerBase
-from .text import TextAnalyzer
-from .ppt import PPTAnalyzer
-from .spreadsheet import SpreadsheetAnalyzer
-from .pdf import PDFAnalyzer
+from .registry import get_analyzer, read_input, register_analyzer, supported_extensions
+
+# Analyzer classes are imported on first access (heavy dependencies)
+_LAZY_CLASSES = {
+    "TextAnalyzer": ".text",
+    "PPTAnalyzer": ".ppt",
+    "SpreadsheetAnalyzer": ".spreadsheet",
+    "PDFAnalyzer": ".pdf"
+}
 
 __all__ = [
     "AnalyzerBase",
     "TextAnalyzer",
     "PPTAnalyzer",
     "SpreadsheetAnalyzer",
-    "PDFAnalyzer"
-]
\ No newline at end of file
+    "PDFAnalyzer",
+    "get_analyzer",
+    "read_input",
+    "register_analyzer",
+    "supported_extensions"
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_CLASSES:
+        from .registry import analyzer_class
+        return analyzer_class(_LAZY_CLASSES[name], name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,13 +1,17 @@
 """Base analyzer class for all file analyzers"""
 
+import json
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional
 from pathlib import Path
 
 
 class AnalyzerBase(ABC):
     """Base class for all file analyzers"""
     
+    # Bump when analyze/extract_text output changes so cached results are not reused
+    VERSION = 1
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
         
@@ -21,6 +25,21 @@ class AnalyzerBase(ABC):
         """Extract plain text content from file"""
         pass
     
+    def analyze_cached(self, file_path: str, **options: Any) -> Dict[str, Any]:
+        """``analyze`` through the on-disk analysis cache; options are part of the key"""
+        return self._cached(file_path, 'analyze', self.analyze, options)
+    
+    def extract_text_cached(self, file_path: str, **options: Any) -> str:
+        """``extract_text`` through the on-disk analysis cache; options are part of the key"""
+        return self._cached(file_path, 'extract_text', self.extract_text, options)
+    
+    def _cached(self, file_path: str, kind: str, method: Callable[..., Any], options: Dict[str, Any]) -> Any:
+        from .cache import analysis_cache
+        options = {key: value for key, value in options.items() if value}  # Unset options keep the plain key
+        if options:
+            kind = f"{kind}:{json.dumps(options, sort_keys=True)}"
+        return analysis_cache().cached(file_path, self, kind, lambda: method(file_path, **options))
+    
     def validate_file(self, file_path: str) -> bool:
         """Check if file exists and is valid"""
         path = Path(file_path)
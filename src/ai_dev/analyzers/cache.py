@@ -0,0 +1,212 @@
+"""Persistent cache of analyzer results keyed by file identity"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class AnalysisCache:
+    """On-disk cache of ``analyze``/``extract_text`` results
+
+    An entry is keyed on the file's absolute path, size, mtime_ns and content
+    hash plus the analyzer class, version and configuration, and holds the
+    result pickled and zlib-compressed. The content hash of a file is itself
+    remembered per (path, size, mtime_ns, inode), so a hit on an unchanged file
+    costs a stat and two small reads instead of a parse. Entries are written
+    atomically and evicted least recently used first past ``max_size_mb``.
+    """
+
+    SUFFIX = '.bin'
+    HASH_SUFFIX = '.sha'
+
+    def __init__(self,
+                 directory: str = '~/.cache/ai-dev/analysis',
+                 max_size_mb: float = 256,
+                 enabled: bool = True,
+                 refresh: bool = False):
+        self.directory = Path(directory).expanduser()
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.refresh = refresh  # Re-analyze but still store the fresh result
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'AnalysisCache':
+        """Create cache from the ``analysis.cache`` configuration section"""
+        return cls(
+            directory=config.get('directory', '~/.cache/ai-dev/analysis'),
+            max_size_mb=config.get('max_size_mb', 256),
+            enabled=config.get('enabled', True)
+        )
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.directory / key[:2] / f"{key}{suffix}"
+
+    def _write(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def content_hash(self, file_path: str, stat: os.stat_result) -> str:
+        """sha256 of the file, reused while its path, size, mtime and inode are unchanged"""
+        identity = json.dumps([os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, stat.st_ino])
+        path = self._path(hashlib.sha256(identity.encode('utf-8')).hexdigest(), self.HASH_SUFFIX)
+        try:
+            return path.read_text(encoding='ascii')
+        except OSError:
+            pass
+
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        content_hash = digest.hexdigest()
+        try:
+            self._write(path, content_hash.encode('ascii'))
+        except OSError:
+            pass
+        return content_hash
+
+    def make_key(self, file_path: str, analyzer: Any, kind: str) -> str:
+        """Key for one analyzer method applied to the file as it is now"""
+        stat = os.stat(file_path)
+        material = json.dumps([
+            os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns,
+            self.content_hash(file_path, stat),
+            f"{type(analyzer).__module__}.{type(analyzer).__qualname__}",
+            getattr(analyzer, 'VERSION', 1), kind,
+            getattr(analyzer, 'config', None)
+        ], sort_keys=True, default=str)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """(True, result) on a hit, (False, None) on a miss or unreadable entry"""
+        if not self.enabled or self.refresh:
+            return False, None
+
+        path = self._path(key, self.SUFFIX)
+        try:
+            stat = path.stat()
+            result = pickle.loads(zlib.decompress(path.read_bytes()))
+            os.utime(path, (time.time(), stat.st_mtime))
+            return True, result
+        except FileNotFoundError:
+            return False, None
+        except Exception:
+            # Truncated or written by an incompatible version; analyze again
+            path.unlink(missing_ok=True)
+            return False, None
+
+    def put(self, key: str, result: Any) -> None:
+        """Store a result atomically and evict old entries if over budget"""
+        if not self.enabled:
+            return
+
+        try:
+            data = zlib.compress(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL), 6)
+            self._write(self._path(key, self.SUFFIX), data)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            # The cache is an optimization; never fail an analysis because of it
+            return
+
+        self._evict()
+
+    def cached(self, file_path: str, analyzer: Any, kind: str, compute: Callable[[], Any]) -> Any:
+        """Result of ``compute()`` for the file, from the cache when it is unchanged"""
+        if not self.enabled:
+            return compute()
+
+        try:
+            key = self.make_key(file_path, analyzer, kind)
+        except OSError:
+            return compute()  # Let the analyzer report the missing/unreadable file
+        hit, result = self.get(key)
+        if hit:
+            return result
+        result = compute()
+        self.put(key, result)
+        return result
+
+    def _entries(self) -> List[Tuple[Path, os.stat_result]]:
+        entries = []
+        if self.directory.exists():
+            for suffix in (self.SUFFIX, self.HASH_SUFFIX):
+                for path in self.directory.glob(f"*/*{suffix}"):
+                    try:
+                        entries.append((path, path.stat()))
+                    except FileNotFoundError:
+                        continue
+        return entries
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits max_size"""
+        lock_path = self.directory / '.lock'
+        with open(lock_path, 'a') as lock:
+            if fcntl:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return  # Another process is already evicting
+
+            entries = self._entries()
+            total = sum(stat.st_size for _, stat in entries)
+            if total <= self.max_size:
+                return
+
+            for path, stat in sorted(entries, key=lambda e: e[1].st_atime):
+                path.unlink(missing_ok=True)
+                total -= stat.st_size
+                if total <= self.max_size:
+                    break
+
+    def clear(self) -> int:
+        """Remove every cached result and return the number removed"""
+        entries = self._entries()
+        for path, _ in entries:
+            path.unlink(missing_ok=True)
+        return sum(1 for path, _ in entries if path.suffix == self.SUFFIX)
+
+    def info(self) -> Dict[str, Any]:
+        """Return cache statistics"""
+        entries = self._entries()
+        return {
+            "directory": str(self.directory),
+            "entries": sum(1 for path, _ in entries if path.suffix == self.SUFFIX),
+            "size_mb": round(sum(stat.st_size for _, stat in entries) / (1024 * 1024), 2),
+            "max_size_mb": round(self.max_size / (1024 * 1024), 2),
+            "enabled": self.enabled
+        }
+
+
+# Process-wide cache shared by "analyze" and generator inputs; set up by the CLI
+_cache = AnalysisCache()
+
+
+def configure(config: Dict[str, Any], enabled: Optional[bool] = None, refresh: bool = False) -> AnalysisCache:
+    """Replace the shared cache with one built from ``analysis.cache`` settings"""
+    global _cache
+    _cache = AnalysisCache.from_config(config or {})
+    if enabled is not None:
+        _cache.enabled = enabled
+    _cache.refresh = refresh
+    return _cache
+
+
+def analysis_cache() -> AnalysisCache:
+    return _cache
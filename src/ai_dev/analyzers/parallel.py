@@ -0,0 +1,63 @@
+"""Process-pool extraction of pages/slides, yielded back in document order"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from multiprocessing import get_context
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+
+def available_cpus() -> int:
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))  # CPUs this process may run on
+    return os.cpu_count() or 1
+
+
+def worker_count(requested: Optional[int], items: int, minimum_items: int) -> int:
+    """Processes to use: ``requested`` (None/0 = one per CPU), 1 below ``minimum_items``"""
+    if items < minimum_items:
+        return 1
+    return max(1, min(requested or available_cpus(), items))
+
+
+def ordered_map(task: Callable[[List[Any]], List[Any]],
+                items: Sequence[Any],
+                fallback: Callable[[Any], Any],
+                workers: int,
+                run_size: int,
+                initializer: Callable[..., None],
+                initargs: Tuple[Any, ...] = ()) -> Iterator[Tuple[Any, Any]]:
+    """Yield (item, result) in order, computing runs of ``run_size`` items on worker processes
+
+    ``task`` is a module-level function mapping a run of items to their results
+    in a worker set up by ``initializer(*initargs)`` (typically opening its own
+    copy of the document). At most two runs per worker are in flight, so memory
+    stays bounded however long the document is. If no process pool can be used,
+    the remaining items are computed in this process with ``fallback(item)``.
+    Closing the iterator early cancels the runs not yet started.
+    """
+    runs = iter([list(items[i:i + run_size]) for i in range(0, len(items), run_size)])
+    done = 0
+    try:
+        # spawn: forking a process that may be running other threads is unsafe
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'),
+                                   initializer=initializer, initargs=initargs)
+        try:
+            in_flight = deque((run, pool.submit(task, run)) for run in islice(runs, workers * 2))
+            while in_flight:
+                run, future = in_flight.popleft()
+                results = future.result()
+                following = next(runs, None)
+                if following:
+                    in_flight.append((following, pool.submit(task, following)))
+                for item, result in zip(run, results):
+                    done += 1
+                    yield item, result
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+    except (BrokenProcessPool, OSError):
+        # No usable process pool (e.g. restricted environment); finish serially
+        for item in items[done:]:
+            yield item, fallback(item)
@@ -1,72 +1,196 @@
 """PDF file analyzer"""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional, TextIO, Tuple
 from .base import AnalyzerBase
+from .parallel import ordered_map, worker_count
 import PyPDF2
 from pathlib import Path
 
+# Reader opened once per worker process by _open_worker_reader
+_worker_reader: Optional[PyPDF2.PdfReader] = None
+
+
+def _open_worker_reader(file_path: str) -> None:
+    global _worker_reader
+    _worker_reader = PyPDF2.PdfReader(file_path)
+
+
+def _extract_pages(indices: List[int]) -> List[str]:
+    """Text of the given pages (0-based) from this worker's own reader"""
+    return [_worker_reader.pages[index].extract_text() for index in indices]
+
+
+def parse_page_ranges(spec: Optional[str], page_count: int) -> List[int]:
+    """0-based page indices selected by a spec like "1-50", "3,7-9" or "100-"
+
+    None or an empty spec selects every page; ranges past the last page are
+    cut off. Raises ValueError for a malformed spec or one selecting no page.
+    """
+    if not spec:
+        return list(range(page_count))
+    
+    selected = set()
+    for part in spec.split(','):
+        first, dash, last = part.strip().partition('-')
+        try:
+            if not part.strip():
+                raise ValueError  # "1,,2" or a trailing comma
+            start = int(first) if first.strip() else 1
+            stop = (int(last) if last.strip() else page_count) if dash else start
+        except ValueError:
+            raise ValueError(f"Invalid page range '{part.strip()}' (use e.g. 1-50, 3,7-9 or 100-)")
+        if start < 1 or (dash and last.strip() and stop < start):
+            raise ValueError(f"Invalid page range '{part.strip()}'")
+        selected.update(range(start - 1, min(stop, page_count)))
+    
+    if not selected:
+        raise ValueError(f"Page range '{spec}' is outside the document ({page_count} pages)")
+    return sorted(selected)
+
 
 class PDFAnalyzer(AnalyzerBase):
     """Analyzer for PDF files"""
     
-    def analyze(self, file_path: str) -> Dict[str, Any]:
-        """Analyze PDF file and extract information"""
+    # Reports carry content_preview, and full_text only on request
+    VERSION = 2
+    
+    # Documents shorter than this are extracted serially; a process pool costs more to start
+    PARALLEL_MIN_PAGES = 64
+    
+    # Pages extracted per task handed to a worker process
+    RANGE_PAGES = 16
+    
+    # Characters kept for the summary and the content preview
+    SUMMARY_CHARS = 500
+    PREVIEW_CHARS = 1000
+    
+    def __init__(self, config: Optional[Dict[str, Any]] = None, workers: Optional[int] = None):
+        super().__init__(config)
+        self.workers = workers  # None or 0 = one per CPU, 1 = serial
+    
+    def analyze(self, file_path: str, pages: Optional[str] = None, summary_only: bool = False,
+                text_output: Optional[TextIO] = None, full_text: bool = False) -> Dict[str, Any]:
+        """Analyze PDF file and extract information in a single pass over its pages
+        
+        Statistics, the summary and a content preview are accumulated page by
+        page, so memory does not grow with the document. ``pages`` limits the
+        analysis to a range such as "1-50"; ``summary_only`` stops reading once
+        the summary is complete; ``text_output`` receives the extracted text
+        (as ``extract_text`` returns it) during the same pass. ``full_text``
+        adds the whole text to the report, which keeps it all in memory.
+        
+        Statistics and the summary are computed over the text ``full_text``
+        holds: every page under its "=== Page N ===" header.
+        """
         self.validate_file(file_path)
         
         with open(file_path, 'rb') as file:
             reader = PyPDF2.PdfReader(file)
+            indices = parse_page_ranges(pages, len(reader.pages))
             
-            # Extract metadata
-            metadata = self._extract_metadata(reader)
-            
-            # Extract text from all pages
             pages_data = []
-            all_text = []
+            blocks = []  # Every page's block, only kept for full_text
+            total_characters = total_words = pages_read = 0
+            # Whitespace-collapsed start of the text, for the summary. Two characters past
+            # SUMMARY_CHARS, so a cut just after a word cannot end on a space
+            head = ''
+            preview = ''
+            separator = ''
             
-            for page_num, page in enumerate(reader.pages, 1):
-                text = page.extract_text()
-                pages_data.append({
-                    "page_number": page_num,
-                    "text_length": len(text),
-                    "text": text[:500] + "..." if len(text) > 500 else text  # Sample
-                })
-                all_text.append(f"=== Page {page_num} ===\n{text}")
+            # A summary needs only the first pages; not worth starting a process pool
+            for page_num, text in self._page_texts(file_path, reader, indices, parallel=not summary_only):
+                page_block = f"=== Page {page_num} ===\n{text}"
+                pages_read += 1
+                total_characters += len(page_block) + (2 if pages_read > 1 else 0)  # '\n\n' between pages
+                total_words += len(page_block.split())
+                if full_text:
+                    blocks.append(page_block)
+                if not summary_only:
+                    pages_data.append({
+                        "page_number": page_num,
+                        "text_length": len(text),
+                        "text": text[:500] + "..." if len(text) > 500 else text  # Sample
+                    })
+                if len(head) <= self.SUMMARY_CHARS:
+                    head = ' '.join(f"{head} {page_block}".split())[:self.SUMMARY_CHARS + 2]
+                if text.strip():
+                    block = f"{separator}=== Page {page_num} ===\n{text}"
+                    separator = '\n\n'
+                    if len(preview) <= self.PREVIEW_CHARS:
+                        preview = (preview + block)[:self.PREVIEW_CHARS + 1]
+                    if text_output is not None:
+                        text_output.write(block)
+                if summary_only and len(head) > self.SUMMARY_CHARS:
+                    break  # Enough text for the summary; leave the remaining pages unread
             
-            full_text = '\n\n'.join(all_text)
+            pdf_info = {
+                "page_count": len(reader.pages),
+                "is_encrypted": reader.is_encrypted,
+                "metadata": self._extract_metadata(reader)
+            }
+            if pages:
+                pdf_info["page_range"] = pages
+            summary = self._generate_summary(head, self.SUMMARY_CHARS)
+            if summary_only:
+                return {
+                    "file_info": self.get_file_info(file_path),
+                    "pdf_info": pdf_info,
+                    "summary": summary,
+                    "toc": self._extract_toc(reader)
+                }
             
-            return {
+            report = {
                 "file_info": self.get_file_info(file_path),
-                "pdf_info": {
-                    "page_count": len(reader.pages),
-                    "is_encrypted": reader.is_encrypted,
-                    "metadata": metadata
-                },
+                "pdf_info": pdf_info,
                 "pages": pages_data,
                 "statistics": {
-                    "total_pages": len(reader.pages),
-                    "total_characters": len(full_text),
-                    "total_words": len(full_text.split()),
-                    "average_chars_per_page": len(full_text) // len(reader.pages) if reader.pages else 0
+                    "total_pages": pages_read,
+                    "total_characters": total_characters,
+                    "total_words": total_words,
+                    "average_chars_per_page": total_characters // pages_read if pages_read else 0
+                },
+                "content_preview": {
+                    "text": preview[:self.PREVIEW_CHARS],
+                    "truncated": len(preview) > self.PREVIEW_CHARS
                 },
-                "full_text": full_text,
-                "summary": self._generate_summary(full_text),
+                "summary": summary,
                 "toc": self._extract_toc(reader)
             }
+            if full_text:
+                report["full_text"] = '\n\n'.join(blocks)
+            return report
     
-    def extract_text(self, file_path: str) -> str:
-        """Extract all text from PDF"""
+    def extract_text(self, file_path: str, pages: Optional[str] = None) -> str:
+        """Extract all text (or the text of a page range) from PDF"""
+        return '\n\n'.join(f"=== Page {page_num} ===\n{text}"
+                            for page_num, text in self.iter_pages(file_path, pages)
+                            if text.strip())
+    
+    def iter_pages(self, file_path: str, pages: Optional[str] = None) -> Iterator[Tuple[int, str]]:
+        """Lazily yield (page number, text) in page order, optionally for a page range"""
         self.validate_file(file_path)
         
         with open(file_path, 'rb') as file:
             reader = PyPDF2.PdfReader(file)
-            all_text = []
-            
-            for page_num, page in enumerate(reader.pages, 1):
-                text = page.extract_text()
-                if text.strip():
-                    all_text.append(f"=== Page {page_num} ===\n{text}")
-            
-            return '\n\n'.join(all_text)
+            indices = parse_page_ranges(pages, len(reader.pages))
+            yield from self._page_texts(file_path, reader, indices)
+    
+    def _page_texts(self, file_path: str, reader: PyPDF2.PdfReader, indices: List[int],
+                    parallel: bool = True) -> Iterator[Tuple[int, str]]:
+        """(page number, text) for the given page indices in order, in parallel for large files
+        
+        Each worker process opens its own reader on the file and extracts runs
+        of RANGE_PAGES pages (see ``ordered_map``).
+        """
+        workers = worker_count(self.workers, len(indices), self.PARALLEL_MIN_PAGES) if parallel else 1
+        if workers == 1 or reader.is_encrypted:
+            for index in indices:
+                yield index + 1, reader.pages[index].extract_text()
+            return
+        
+        for index, text in ordered_map(_extract_pages, indices, lambda i: reader.pages[i].extract_text(),
+                                       workers, self.RANGE_PAGES, _open_worker_reader, (file_path,)):
+            yield index + 1, text
     
     def _extract_metadata(self, reader: PyPDF2.PdfReader) -> Dict[str, Any]:
         """Extract PDF metadata"""
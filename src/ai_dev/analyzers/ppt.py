@@ -1,14 +1,43 @@
 """PowerPoint file analyzer"""
 
-from typing import Dict, Any, List
+from functools import partial
+from typing import Dict, Any, Iterator, List, Optional
 from .base import AnalyzerBase
+from .parallel import ordered_map, worker_count
 from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
 import re
 
+# Presentation and analyzer set up once per worker process by _open_worker_presentation
+_worker_presentation = None
+_worker_analyzer = None
+
+
+def _open_worker_presentation(file_path: str) -> None:
+    global _worker_presentation, _worker_analyzer
+    _worker_presentation = Presentation(file_path)
+    _worker_analyzer = PPTAnalyzer()
+
+
+def _visit_slides(indices: List[int], text_only: bool = False) -> List[Dict[str, Any]]:
+    """Visit the given slides (0-based) of this worker's own copy of the deck"""
+    slides = _worker_presentation.slides
+    return [_worker_analyzer._visit_slide(slides[index], index + 1, text_only) for index in indices]
+
 
 class PPTAnalyzer(AnalyzerBase):
     """Analyzer for PowerPoint files (.pptx)"""
     
+    # Decks shorter than this are visited serially; a process pool costs more to start
+    PARALLEL_MIN_SLIDES = 200
+    
+    # Slides visited per task handed to a worker process
+    RANGE_SLIDES = 16
+    
+    def __init__(self, config: Optional[Dict[str, Any]] = None, workers: Optional[int] = None):
+        super().__init__(config)
+        self.workers = workers  # None or 0 = one per CPU, 1 = serial
+    
     def analyze(self, file_path: str) -> Dict[str, Any]:
         """Analyze PowerPoint file and extract information"""
         self.validate_file(file_path)
@@ -17,22 +46,24 @@ class PPTAnalyzer(AnalyzerBase):
         
         slides_data = []
         all_text = []
+        tables = []
+        images_count = 0
+        presentation_title = "Untitled Presentation"
         
-        # Process each slide
-        for slide_num, slide in enumerate(prs.slides, 1):
-            slide_info = self._analyze_slide(slide, slide_num)
-            slides_data.append(slide_info)
-            all_text.extend(slide_info['text_content'])
-        
-        # Extract tables and charts
-        tables = self._extract_tables(prs)
-        images_count = self._count_images(prs)
+        # One visit per slide collects its text, title, tables, images and layout
+        for visit in self._visits(file_path, prs):
+            slides_data.append(visit['slide'])
+            all_text.extend(visit['slide']['text_content'])
+            tables.extend(visit['tables'])
+            images_count += visit['images']
+            if visit['slide']['slide_number'] == 1:
+                presentation_title = visit['presentation_title']
         
         return {
             "file_info": self.get_file_info(file_path),
             "presentation_info": {
                 "slide_count": len(prs.slides),
-                "title": self._get_presentation_title(prs),
+                "title": presentation_title,
                 "slide_width": prs.slide_width,
                 "slide_height": prs.slide_height
             },
@@ -56,26 +87,42 @@ class PPTAnalyzer(AnalyzerBase):
         prs = Presentation(file_path)
         all_text = []
         
-        for slide_num, slide in enumerate(prs.slides, 1):
-            slide_text = [f"=== Slide {slide_num} ==="]
-            
-            for shape in slide.shapes:
-                if hasattr(shape, "text"):
-                    text = shape.text.strip()
-                    if text:
-                        slide_text.append(text)
-            
-            if len(slide_text) > 1:  # Has content beyond slide marker
-                all_text.append('\n'.join(slide_text))
+        for visit in self._visits(file_path, prs, text_only=True):
+            slide = visit['slide']
+            if slide['text_content']:  # Has content beyond slide marker
+                all_text.append('\n'.join([f"=== Slide {slide['slide_number']} ==="] + slide['text_content']))
         
         return '\n\n'.join(all_text)
     
-    def _analyze_slide(self, slide, slide_num: int) -> Dict[str, Any]:
-        """Analyze individual slide"""
+    def _visits(self, file_path: str, presentation: Presentation, text_only: bool = False) -> Iterator[Dict[str, Any]]:
+        """Visit every slide in order; large decks are split across worker processes
+        
+        Each worker opens its own copy of the deck and visits runs of
+        RANGE_SLIDES slides (see ``ordered_map``).
+        """
+        slides = presentation.slides
+        workers = worker_count(self.workers, len(slides), self.PARALLEL_MIN_SLIDES)
+        if workers == 1:
+            for slide_num, slide in enumerate(slides, 1):
+                yield self._visit_slide(slide, slide_num, text_only)
+            return
+        
+        for _, visit in ordered_map(partial(_visit_slides, text_only=text_only), range(len(slides)),
+                                    lambda i: self._visit_slide(slides[i], i + 1, text_only),
+                                    workers, self.RANGE_SLIDES, _open_worker_presentation, (file_path,)):
+            yield visit
+    
+    def _visit_slide(self, slide, slide_num: int, text_only: bool = False) -> Dict[str, Any]:
+        """Collect a slide's text, title, tables, images and layout in one pass over its shapes"""
         text_content = []
         text_boxes = 0
         has_title = False
         title = ""
+        tables = []
+        images = 0
+        
+        # slide.shapes.title scans the shapes itself, so resolve it once per slide
+        title_shape = None if text_only else slide.shapes.title
         
         for shape in slide.shapes:
             if hasattr(shape, "text"):
@@ -85,70 +132,55 @@ class PPTAnalyzer(AnalyzerBase):
                     text_boxes += 1
                     
                     # Check if it's a title
-                    if shape == slide.shapes.title:
+                    if title_shape is not None and shape == title_shape:
                         has_title = True
                         title = text
+            if text_only:
+                continue
+            
+            if shape.has_table:
+                tables.append(self._table_data(shape.table, slide_num))
+            elif shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+                images += 1
         
-        # Try to detect title from layout if not found
-        if not title and text_content:
-            title = text_content[0][:50]  # First 50 chars as title
-        
-        return {
+        slide_info = {
             "slide_number": slide_num,
             "title": title,
             "has_title": has_title,
             "text_boxes": text_boxes,
-            "text_content": text_content,
-            "layout": slide.slide_layout.name if slide.slide_layout else "Custom"
+            "text_content": text_content
         }
-    
-    def _extract_tables(self, presentation: Presentation) -> List[Dict[str, Any]]:
-        """Extract all tables from presentation"""
-        tables = []
+        if text_only:
+            return {"slide": slide_info}
         
-        for slide_num, slide in enumerate(presentation.slides, 1):
-            for shape in slide.shapes:
-                if shape.has_table:
-                    table_data = []
-                    table = shape.table
-                    
-                    for row in table.rows:
-                        row_data = []
-                        for cell in row.cells:
-                            row_data.append(cell.text.strip())
-                        table_data.append(row_data)
-                    
-                    tables.append({
-                        "slide": slide_num,
-                        "rows": len(table.rows),
-                        "columns": len(table.columns),
-                        "data": table_data
-                    })
-        
-        return tables
-    
-    def _count_images(self, presentation: Presentation) -> int:
-        """Count images in presentation"""
-        count = 0
-        for slide in presentation.slides:
-            for shape in slide.shapes:
-                if shape.shape_type == 13:  # Picture type
-                    count += 1
-        return count
+        # Try to detect title from layout if not found
+        if not title and text_content:
+            slide_info["title"] = text_content[0][:50]  # First 50 chars as title
+        slide_info["layout"] = slide.slide_layout.name if slide.slide_layout else "Custom"
+        
+        # Presentation title, used from the first slide: its title placeholder, else its first text
+        if title_shape is not None:
+            presentation_title = title_shape.text.strip()
+        elif text_content:
+            presentation_title = text_content[0][:100]
+        else:
+            presentation_title = "Untitled Presentation"
+        
+        return {"slide": slide_info, "tables": tables, "images": images,
+                "presentation_title": presentation_title}
     
-    def _get_presentation_title(self, presentation: Presentation) -> str:
-        """Try to get presentation title from first slide"""
-        if presentation.slides:
-            first_slide = presentation.slides[0]
-            if first_slide.shapes.title:
-                return first_slide.shapes.title.text.strip()
-            
-            # Try to find largest text on first slide
-            for shape in first_slide.shapes:
-                if hasattr(shape, "text") and shape.text.strip():
-                    return shape.text.strip()[:100]
+    def _table_data(self, table, slide_num: int) -> Dict[str, Any]:
+        """Cell text of a table shape"""
+        table_data = []
+        for row in table.rows:
+            table_data.append([cell.text.strip() for cell in row.cells])
         
-        return "Untitled Presentation"
+        return {
+            "slide": slide_num,
+            "rows": len(table.rows),
+            "columns": len(table.columns),
+            "data": table_data
+        }
     
     def _generate_outline(self, slides_data: List[Dict[str, Any]]) -> List[str]:
         """Generate presentation outline from slide titles"""
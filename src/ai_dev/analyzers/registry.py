@@ -0,0 +1,63 @@
+"""Extension-keyed analyzer registry with lazily imported backends"""
+
+import importlib
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from ..utils.encoder import EncodingHandler
+from .base import AnalyzerBase
+
+# Extension -> (module, class name, display name). Modules are imported the
+# first time a matching file is processed, so pandas, PyPDF2 and python-pptx
+# load only when needed.
+_REGISTRY: Dict[str, Tuple[str, str, str]] = {}
+# Binary documents whose generator input is the analyzer's (cached) extracted text
+DOCUMENT_EXTENSIONS = ['.pptx', '.xlsx', '.xls', '.pdf']
+
+
+def register_analyzer(extensions: List[str], module: str, class_name: str, display_name: str) -> None:
+    """Register an analyzer class (given by import path) for file extensions"""
+    for extension in extensions:
+        _REGISTRY[extension.lower()] = (module, class_name, display_name)
+
+
+def supported_extensions() -> List[str]:
+    return sorted(_REGISTRY)
+
+
+def analyzer_class(module: str, class_name: str) -> type:
+    return getattr(importlib.import_module(module, __package__), class_name)
+
+
+def get_analyzer(file_path: str) -> Tuple[AnalyzerBase, str]:
+    """New analyzer instance and display name for a file
+
+    Each call gets its own instance, so per-call settings such as
+    ``workers`` don't leak into later calls. Raises ValueError for an
+    extension no analyzer is registered for.
+    """
+    extension = Path(file_path).suffix.lower()
+    if extension not in _REGISTRY:
+        raise ValueError(f"Unsupported file type: {extension or file_path} "
+                         f"(supported: {', '.join(supported_extensions())})")
+
+    module, class_name, display_name = _REGISTRY[extension]
+    return analyzer_class(module, class_name)(), display_name
+
+
+def read_input(file_path: str) -> Tuple[str, str]:
+    """Text of a generator input file and how it was read
+
+    Documents (PDF, PowerPoint, Excel) are extracted through the analysis
+    cache; anything else is decoded with encoding detection.
+    """
+    if Path(file_path).suffix.lower() in DOCUMENT_EXTENSIONS:
+        analyzer, display_name = get_analyzer(file_path)
+        return analyzer.extract_text_cached(file_path), f"{display_name} (extracted text)"
+    return EncodingHandler.read_file_auto(file_path)
+
+
+register_analyzer(['.txt', '.md'], '.text', 'TextAnalyzer', "Text")
+register_analyzer(['.pptx'], '.ppt', 'PPTAnalyzer', "PowerPoint")
+register_analyzer(['.xlsx', '.xls', '.csv'], '.spreadsheet', 'SpreadsheetAnalyzer', "Spreadsheet")
+register_analyzer(['.pdf'], '.pdf', 'PDFAnalyzer', "PDF")
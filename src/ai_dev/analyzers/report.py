@@ -0,0 +1,67 @@
+"""Markdown and plain-text reports of analyzer results"""
+
+from typing import Any, Dict
+
+
+def format_analysis_markdown(analysis: Dict[str, Any], analyzer_type: str) -> str:
+    """Format analysis results as Markdown"""
+    lines = [f"# {analyzer_type} Analysis Report\n"]
+
+    # File info
+    if 'file_info' in analysis:
+        lines.append("## File Information")
+        for key, value in analysis['file_info'].items():
+            lines.append(f"- **{key}**: {value}")
+        lines.append("")
+
+    # Statistics
+    if 'statistics' in analysis:
+        lines.append("## Statistics")
+        for key, value in analysis['statistics'].items():
+            lines.append(f"- **{key}**: {value}")
+        lines.append("")
+
+    # Summary
+    if 'summary' in analysis:
+        lines.append("## Summary")
+        lines.append(analysis['summary'])
+        lines.append("")
+
+    # Content preview (PDF reports keep only the start of the text)
+    if 'full_text' in analysis:
+        preview = analysis['full_text'][:1000]
+        truncated = len(analysis['full_text']) > 1000
+    elif 'content_preview' in analysis:
+        preview = analysis['content_preview']['text']
+        truncated = analysis['content_preview']['truncated']
+    else:
+        preview = None
+    if preview is not None:
+        lines.append("## Content Preview")
+        lines.append("```")
+        lines.append(preview)
+        if truncated:
+            lines.append("... (truncated)")
+        lines.append("```")
+
+    return '\n'.join(lines)
+
+
+def format_analysis_text(analysis: Dict[str, Any], analyzer_type: str) -> str:
+    """Format analysis results as plain text"""
+    lines = [f"{analyzer_type} Analysis Report", "=" * 50, ""]
+
+    def format_dict(d, indent=0):
+        result = []
+        for key, value in d.items():
+            if isinstance(value, dict):
+                result.append(" " * indent + f"{key}:")
+                result.extend(format_dict(value, indent + 2))
+            elif isinstance(value, list):
+                result.append(" " * indent + f"{key}: [{len(value)} items]")
+            else:
+                result.append(" " * indent + f"{key}: {value}")
+        return result
+
+    lines.extend(format_dict(analysis))
+    return '\n'.join(lines)
@@ -0,0 +1,9 @@
+"""Resumable batch generation over many inputs"""
+
+from ..generators.fingerprint import file_hash
+from .manifest import BatchManifest
+from .pipeline import InputFile, expand_inputs, mirrored_outputs, run_pipelined
+from .runner import BatchRunner
+
+__all__ = ["BatchManifest", "BatchRunner", "file_hash",
+           "InputFile", "expand_inputs", "mirrored_outputs", "run_pipelined"]
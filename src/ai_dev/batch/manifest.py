@@ -0,0 +1,124 @@
+"""SQLite manifest recording the state of every unit in a batch"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# Unit states
+PENDING = 'pending'
+RUNNING = 'running'  # Left behind when a batch is killed; resumed like pending
+DONE = 'done'
+FAILED = 'failed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY,
+    input_path TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    generator TEXT NOT NULL,
+    model TEXT NOT NULL,
+    format TEXT NOT NULL,
+    encoding TEXT NOT NULL,
+    output_path TEXT NOT NULL,
+    chunk_tokens INTEGER,
+    status TEXT NOT NULL DEFAULT 'pending',
+    items INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    seconds REAL,
+    updated_at REAL NOT NULL,
+    UNIQUE (input_path, input_hash, generator, model, format, encoding)
+)
+"""
+
+_COLUMNS = ('input_path', 'input_hash', 'generator', 'model', 'format', 'encoding', 'output_path', 'chunk_tokens')
+
+
+class BatchManifest:
+    """One row per (input, generator, model, format, encoding) unit
+
+    Every state change is its own transaction, so a batch killed at any point
+    leaves a manifest that says exactly which outputs are complete.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+        columns = {row['name'] for row in self._db.execute("PRAGMA table_info(units)")}
+        if 'chunk_tokens' not in columns:  # Manifest created before units recorded it
+            self._db.execute("ALTER TABLE units ADD COLUMN chunk_tokens INTEGER")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> 'BatchManifest':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _execute(self, sql: str, params: Iterable[Any] = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._db.execute(sql, tuple(params))
+
+    def register(self, units: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Add units not seen before and return the rows for all of them"""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                for unit in units:
+                    self._db.execute(
+                        f"INSERT OR IGNORE INTO units ({', '.join(_COLUMNS)}, updated_at) "
+                        f"VALUES ({', '.join('?' * len(_COLUMNS))}, ?)",
+                        [unit.get(column) for column in _COLUMNS] + [now]
+                    )
+                    # A unit planned again may target a new output location or chunk size
+                    self._db.execute(
+                        "UPDATE units SET output_path = ?, chunk_tokens = ? WHERE input_path = ? AND input_hash = ? "
+                        "AND generator = ? AND model = ? AND format = ? AND encoding = ? AND status != ?",
+                        [unit['output_path'], unit.get('chunk_tokens')] + [unit[column] for column in _COLUMNS[:6]] + [DONE]
+                    )
+                rows = [dict(self._db.execute(
+                    "SELECT * FROM units WHERE input_path = ? AND input_hash = ? AND generator = ? "
+                    "AND model = ? AND format = ? AND encoding = ?",
+                    [unit[column] for column in _COLUMNS[:6]]
+                ).fetchone()) for unit in units]
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return rows
+
+    def start(self, unit_id: int) -> None:
+        self._execute("UPDATE units SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                      (RUNNING, time.time(), unit_id))
+
+    def complete(self, unit_id: int, output_path: str, items: int, seconds: float) -> None:
+        self._execute("UPDATE units SET status = ?, output_path = ?, items = ?, seconds = ?, error = NULL, "
+                      "updated_at = ? WHERE id = ?",
+                      (DONE, output_path, items, seconds, time.time(), unit_id))
+
+    def fail(self, unit_id: int, error: str, seconds: float) -> None:
+        self._execute("UPDATE units SET status = ?, error = ?, seconds = ?, updated_at = ? WHERE id = ?",
+                      (FAILED, error, seconds, time.time(), unit_id))
+
+    def units(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        if status:
+            rows = self._execute("SELECT * FROM units WHERE status = ? ORDER BY id", (status,))
+        else:
+            rows = self._execute("SELECT * FROM units ORDER BY id")
+        return [dict(row) for row in rows.fetchall()]
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._execute("SELECT status, COUNT(*) FROM units GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
@@ -0,0 +1,137 @@
+"""Expand directory/glob inputs and generate for them with overlapped reading"""
+
+import glob
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence
+
+# Files picked up when a directory is given
+INPUT_EXTENSIONS = ['.txt', '.md', '.markdown']
+
+# Threads reading, decoding and compacting inputs ahead of the model calls
+READERS = 2
+
+
+class InputFile(NamedTuple):
+    path: str
+    relative: str  # Path below the directory or glob root it was found in; mirrored in the output
+
+
+def _glob_root(pattern: str) -> str:
+    """Leading directories of a glob pattern that contain no wildcard"""
+    parts = []
+    for part in Path(pattern).parts[:-1]:
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return str(Path(*parts)) if parts else '.'
+
+
+def _visible(relative: str) -> bool:
+    return not any(part.startswith('.') for part in Path(relative).parts)
+
+
+def expand_inputs(arguments: Sequence[str], extensions: Optional[List[str]] = None) -> List[InputFile]:
+    """Files named by paths, directories (searched recursively) and glob patterns
+
+    Raises FileNotFoundError for an argument that matches nothing.
+    """
+    extensions = [e.lower() for e in (extensions or INPUT_EXTENSIONS)]
+    found: List[InputFile] = []
+
+    for argument in arguments:
+        if os.path.isdir(argument):
+            matches = []
+            for root, directories, files in os.walk(argument):
+                directories[:] = sorted(d for d in directories if not d.startswith('.'))
+                for name in sorted(files):
+                    if not name.startswith('.') and Path(name).suffix.lower() in extensions:
+                        path = os.path.join(root, name)
+                        matches.append(InputFile(path, os.path.relpath(path, argument)))
+        elif glob.has_magic(argument):
+            root = _glob_root(argument)
+            matches = [InputFile(path, os.path.relpath(path, root))
+                       for path in sorted(glob.glob(argument, recursive=True))
+                       if os.path.isfile(path) and _visible(os.path.relpath(path, root))]
+        elif os.path.isfile(argument):
+            matches = [InputFile(argument, os.path.basename(argument))]
+        else:
+            raise FileNotFoundError(f"Path '{argument}' does not exist")
+
+        if not matches:
+            raise FileNotFoundError(f"No input files found for '{argument}'")
+        found.extend(matches)
+
+    # The same file reached through two arguments is generated once
+    unique = {}
+    for item in found:
+        unique.setdefault(os.path.realpath(item.path), item)
+    return list(unique.values())
+
+
+def mirrored_outputs(inputs: List[InputFile], output_dir: str, suffix: str, extension: str) -> List[str]:
+    """Output path per input: the input's relative directory under output_dir"""
+    outputs = []
+    used = set()
+    for item in inputs:
+        relative = Path(item.relative)
+        base = name = str(Path(output_dir) / relative.parent / f"{relative.stem}_{suffix}")
+        n = 2
+        while name in used:  # e.g. spec.txt and spec.md in one directory
+            name, n = f"{base}-{n}", n + 1
+        used.add(name)
+        outputs.append(f"{name}.{extension}")
+    return outputs
+
+
+def run_pipelined(inputs: List[Any],
+                  prepare: Callable[[Any], Any],
+                  process: Callable[[Any, Any], Any],
+                  jobs: int,
+                  on_result: Callable[[Any, Any, Optional[Exception]], None]) -> None:
+    """Run ``process`` on ``jobs`` threads while ``prepare`` works ahead on the next inputs
+
+    At most ``jobs`` prepared inputs wait for a free worker, bounding the
+    memory held by read-ahead. ``on_result(input, result, error)`` is called
+    on the calling thread as each input finishes.
+    """
+    ahead = threading.BoundedSemaphore(jobs * 2)
+    stopping = threading.Event()
+    finished: 'queue.Queue' = queue.Queue()
+    workers = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix='generate')
+    readers = ThreadPoolExecutor(max_workers=min(READERS, jobs), thread_name_prefix='prepare')
+
+    def process_one(item: Any, prepared: Any) -> None:
+        try:
+            finished.put((item, process(item, prepared), None))
+        except Exception as e:
+            finished.put((item, None, e))
+        finally:
+            ahead.release()
+
+    def prepare_one(item: Any) -> None:
+        while not ahead.acquire(timeout=0.2):
+            if stopping.is_set():
+                return
+        try:
+            if stopping.is_set():
+                raise RuntimeError("Stopped")
+            prepared = prepare(item)
+            workers.submit(process_one, item, prepared)
+        except Exception as e:
+            ahead.release()
+            finished.put((item, None, e))
+
+    try:
+        for item in inputs:
+            readers.submit(prepare_one, item)
+        for _ in inputs:
+            on_result(*finished.get())
+    finally:
+        stopping.set()
+        # On Ctrl-C, drop inputs not yet started and let running calls finish
+        readers.shutdown(wait=True, cancel_futures=True)
+        workers.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,147 @@
+"""Run generators over many inputs, resuming from a SQLite manifest"""
+
+import copy
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ..ai_models.model_manager import ModelManager
+from ..analyzers import read_input
+from ..config.manager import ConfigManager
+from ..generators import GENERATOR_TYPES, get_generator
+from ..generators.fingerprint import file_hash
+from ..utils.encoder import EncodingHandler
+from ..utils.metrics import metrics
+from .manifest import BatchManifest, DONE, FAILED
+
+FORMAT_EXTENSIONS = {'markdown': 'md', 'md': 'md', 'csv': 'csv', 'json': 'json', 'html': 'html'}
+
+OnResult = Callable[[Dict[str, Any], Optional[Exception]], None]
+
+
+class BatchRunner:
+    """Plan (input x generator) units, skip the ones already done and run the rest
+
+    Each output is written to a temporary file and renamed into place before
+    its manifest row is marked done, so an output listed as done is complete.
+    """
+
+    def __init__(self,
+                 config: ConfigManager,
+                 model_manager: ModelManager,
+                 manifest: BatchManifest,
+                 jobs: int = 4,
+                 chunk_tokens: Optional[int] = None):
+        # Timestamped names would change on every attempt and defeat resuming
+        self.config = copy.copy(config)
+        self.config.config_data = copy.deepcopy(config.config_data)
+        self.config.set('output.timestamp', False)
+        self.model_manager = model_manager
+        self.manifest = manifest
+        self.jobs = jobs
+        self.chunk_tokens = chunk_tokens
+        self._configs: Dict[str, ConfigManager] = {self.encoding: self.config}
+
+    @property
+    def format(self) -> str:
+        return self.config.get('output.default_format', 'markdown')
+
+    @property
+    def encoding(self) -> str:
+        return EncodingHandler.normalize_encoding_name(self.config.get('output.encoding', 'shift-jis'))
+
+    def plan(self, input_files: List[str], doc_types: List[str], output_dir: str) -> List[Dict[str, Any]]:
+        """Register one unit per input and generator; returns the manifest rows"""
+        model = self.model_manager.get_current_model_name() or 'default'
+        extension = FORMAT_EXTENSIONS.get(self.format, self.format)
+
+        units = []
+        used_names = set()
+        for path in sorted(dict.fromkeys(os.path.abspath(p) for p in input_files)):
+            input_hash = file_hash(path)
+            for doc_type in doc_types:
+                file_stem = GENERATOR_TYPES[doc_type][0]
+                base_name = name = f"{Path(path).stem}_{file_stem}"
+                n = 2
+                while name in used_names:  # Same file name in different directories
+                    name, n = f"{base_name}-{n}", n + 1
+                used_names.add(name)
+                units.append({
+                    'input_path': path, 'input_hash': input_hash, 'generator': doc_type,
+                    'model': model, 'format': self.format, 'encoding': self.encoding,
+                    'output_path': os.path.abspath(os.path.join(output_dir, f"{name}.{extension}")),
+                    'chunk_tokens': self.chunk_tokens
+                })
+        return self.manifest.register(units)
+
+    def _unit_config(self, unit: Dict[str, Any]) -> ConfigManager:
+        """Configuration writing in the unit's recorded encoding (retries may differ)"""
+        if unit['encoding'] not in self._configs:
+            config = copy.copy(self.config)
+            config.config_data = copy.deepcopy(self.config.config_data)
+            config.set('output.encoding', unit['encoding'])
+            self._configs[unit['encoding']] = config
+        return self._configs[unit['encoding']]
+
+    @staticmethod
+    def is_done(unit: Dict[str, Any]) -> bool:
+        """Done in the manifest and the output is still there"""
+        return unit['status'] == DONE and Path(unit['output_path']).exists()
+
+    def _run_unit(self, unit: Dict[str, Any]) -> Dict[str, Any]:
+        self.manifest.start(unit['id'])
+        started = time.perf_counter()
+        output = Path(unit['output_path'])
+        partial = output.with_name(f".{output.name}.part")
+        try:
+            if file_hash(unit['input_path']) != unit['input_hash']:
+                raise RuntimeError("Input changed since the batch was planned; run the batch again")
+            input_text, _ = read_input(unit['input_path'])
+
+            generator = get_generator(unit['generator'])(self._unit_config(unit), self.model_manager)
+            title = f"{GENERATOR_TYPES[unit['generator']][1]}: {Path(unit['input_path']).name}"
+            with metrics.stage("generate", generator=type(generator).__name__,
+                               model=unit['model'], mode="batch") as stage:
+                # The chunk size the unit was planned with, so a retry runs it the same way
+                if unit.get('chunk_tokens'):
+                    items = generator.generate_chunked(input_text, max_tokens=unit['chunk_tokens'])
+                else:
+                    items = generator.generate(input_text)
+                generator.save_to_file(items, str(partial), unit['format'], title)
+                stage["items"] = len(items)
+
+            os.replace(partial, output)
+        except BaseException as e:
+            partial.unlink(missing_ok=True)
+            self.manifest.fail(unit['id'], str(e) or type(e).__name__, time.perf_counter() - started)
+            raise
+
+        seconds = time.perf_counter() - started
+        self.manifest.complete(unit['id'], str(output), len(items), seconds)
+        return {**unit, 'status': DONE, 'items': len(items), 'seconds': seconds}
+
+    def run(self, units: List[Dict[str, Any]], on_result: Optional[OnResult] = None) -> Dict[str, int]:
+        """Run every unit that is not done; returns {'done', 'failed', 'skipped'} counts"""
+        todo = [unit for unit in units if not self.is_done(unit)]
+        counts = {'done': 0, 'failed': 0, 'skipped': len(units) - len(todo)}
+        for unit in todo:
+            self._unit_config(unit)  # Create before the worker threads share them
+
+        executor = ThreadPoolExecutor(max_workers=max(1, self.jobs))
+        try:
+            futures = {executor.submit(self._run_unit, unit): unit for unit in todo}
+            for future in as_completed(futures):
+                try:
+                    result, error = future.result(), None
+                    counts['done'] += 1
+                except Exception as e:
+                    result, error = {**futures[future], 'status': FAILED, 'error': str(e)}, e
+                    counts['failed'] += 1
+                if on_result:
+                    on_result(result, error)
+        finally:
+            # On Ctrl-C, drop what has not started; the manifest resumes it next time
+            executor.shutdown(wait=True, cancel_futures=True)
+        return counts
@@ -0,0 +1,6 @@
+"""Offline benchmarking against stub model CLIs"""
+
+from .runner import run_pipeline_benchmark, StubEnvironment
+from .startup import run_startup_benchmark
+
+__all__ = ["run_pipeline_benchmark", "StubEnvironment", "run_startup_benchmark"]
@@ -0,0 +1,214 @@
+"""Drive the generation pipeline against the stub CLIs and summarise the metrics"""
+
+import copy
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..ai_models.model_manager import ModelManager
+from ..batch.runner import FORMAT_EXTENSIONS
+from ..config.manager import ConfigManager
+from ..utils.metrics import metrics, percentile
+
+# Run by path rather than ``-m ai_dev.bench.stub`` so each stub call doesn't
+# pay for importing the ai_dev package
+STUB_SCRIPT = Path(__file__).with_name('stub.py')
+
+# Synthetic input with the section markers the analyzers emit
+DEFAULT_INPUT = "\n\n".join(
+    f"=== Page {n} ===\n"
+    f"第{n}章 システム概要\n"
+    f"本システムは受注、在庫、出荷を一元管理する。画面{n}ではユーザーが注文を登録し、"
+    f"管理者が承認する。応答時間は2秒以内、同時接続100ユーザーを想定する。"
+    for n in range(1, 11)
+)
+
+
+class StubEnvironment:
+    """Temporary directory holding ``gemini`` and ``claude`` shims for the stub CLI"""
+
+    def __init__(self, settings: Dict[str, Any]):
+        self.settings = settings
+        self.directory: Optional[Path] = None
+        self._saved_env: Dict[str, Optional[str]] = {}
+
+    def __enter__(self) -> 'StubEnvironment':
+        self.directory = Path(tempfile.mkdtemp(prefix='ai-dev-bench-'))
+        for backend in ('gemini', 'claude'):
+            shim = self.directory / backend
+            shim.write_text(
+                f"#!/bin/sh\nexec \"{sys.executable}\" \"{STUB_SCRIPT}\" --backend {backend} \"$@\"\n",
+                encoding='utf-8'
+            )
+            shim.chmod(shim.stat().st_mode | stat.S_IEXEC)
+
+        # The stub reads its behaviour from the environment it inherits
+        for key, value in self.settings.items():
+            name = f"AI_DEV_STUB_{key.upper()}"
+            self._saved_env[name] = os.environ.get(name)
+            os.environ[name] = str(value)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for name, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def command(self, backend: str) -> str:
+        return str(self.directory / backend)
+
+
+def _bench_config(base: Dict[str, Any], stub: StubEnvironment, workdir: Path,
+                  use_cache: bool, timeout: int) -> Dict[str, Any]:
+    """Copy of the configuration pointing every model at the stub CLI"""
+    config = copy.deepcopy(base)
+    ai_models = config.setdefault('ai_models', {})
+    for backend in ('gemini', 'claude'):
+        model_config = ai_models.setdefault(backend, {})
+        model_config['command'] = stub.command(backend)
+        model_config['timeout'] = timeout
+        model_config['retry'] = {'max_attempts': 2, 'latency_file': str(workdir / 'latency.json')}
+        model_config['rate_limit'] = {'backoff': 0.5, 'max_requeues': 2,
+                                      'directory': str(workdir / 'ratelimit')}
+    config['cache'] = {**config.get('cache', {}), 'enabled': use_cache,
+                       'directory': str(workdir / 'responses')}
+    config.setdefault('output', {})['timestamp'] = False
+    return config
+
+
+def run_pipeline_benchmark(base_config: ConfigManager,
+                           generators: Dict[str, type],
+                           formats: List[str],
+                           encodings: List[str],
+                           backend: str = 'gemini',
+                           runs: int = 1,
+                           jobs: int = 4,
+                           input_text: Optional[str] = None,
+                           stub_settings: Optional[Dict[str, Any]] = None,
+                           use_cache: bool = False,
+                           timeout: int = 30) -> Dict[str, Any]:
+    """Run every generator x format x encoding combination through the stub CLI
+
+    Returns a report with per-combination wall times and per-stage metrics
+    collected from an isolated metrics log.
+    """
+    input_text = input_text or DEFAULT_INPUT
+    workdir = Path(tempfile.mkdtemp(prefix='ai-dev-bench-out-'))
+    saved_metrics = (metrics.path, metrics.enabled)
+    metrics.path, metrics.enabled = workdir / 'metrics.jsonl', True
+
+    results: List[Dict[str, Any]] = []
+    try:
+        with StubEnvironment(stub_settings or {}) as stub:
+            config_data = _bench_config(base_config.get_all(), stub, workdir, use_cache, timeout)
+            model_manager = ModelManager(config_data, model_name=backend)
+
+            # One ConfigManager per encoding: generators read the output encoding from it
+            configs = {}
+            for encoding in encodings:
+                manager = ConfigManager(base_config.config_path)
+                manager.config_data = copy.deepcopy(config_data)
+                manager.set('output.encoding', encoding)
+                configs[encoding] = manager
+
+            cases: List[Tuple[str, str, str, int]] = [
+                (name, fmt, encoding, run)
+                for run in range(runs)
+                for name in generators
+                for fmt in formats
+                for encoding in encodings
+            ]
+
+            def run_case(case: Tuple[str, str, str, int]) -> Dict[str, Any]:
+                name, fmt, encoding, run = case
+                generator = generators[name](configs[encoding], model_manager)
+                extension = FORMAT_EXTENSIONS.get(fmt, fmt)
+                output = workdir / f"{name}_{encoding}_{run}.{extension}"
+                started = time.perf_counter()
+                try:
+                    with metrics.stage("generate", generator=type(generator).__name__,
+                                       model=backend, mode="bench") as stage:
+                        items = generator.generate(input_text)
+                        generator.save_to_file(items, str(output), fmt, name)
+                        stage["items"] = len(items)
+                    status, count = "ok", len(items)
+                except Exception as e:
+                    status, count = f"error: {e}", 0
+                return {"generator": name, "format": fmt, "encoding": encoding, "run": run,
+                        "seconds": time.perf_counter() - started, "items": count, "status": status}
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+                futures = [executor.submit(run_case, case) for case in cases]
+                for future in as_completed(futures):
+                    results.append(future.result())
+            wall = time.perf_counter() - started
+
+        records = metrics.read()
+    finally:
+        metrics.path, metrics.enabled = saved_metrics
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return summarize(results, records, wall)
+
+
+def summarize(results: List[Dict[str, Any]], records: List[Dict[str, Any]], wall: float) -> Dict[str, Any]:
+    """Aggregate benchmark results and metrics records into a report"""
+    combos: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+    for result in results:
+        combos.setdefault((result['generator'], result['format'], result['encoding']), []).append(result)
+
+    cases = []
+    for (name, fmt, encoding), group in sorted(combos.items()):
+        ok = [r for r in group if r['status'] == 'ok']
+        seconds = [r['seconds'] for r in ok]
+        cases.append({
+            "generator": name,
+            "format": fmt,
+            "encoding": encoding,
+            "runs": len(group),
+            "failures": len(group) - len(ok),
+            "p50": percentile(seconds, 50),
+            "p95": percentile(seconds, 95),
+            "items_per_second": sum(r['items'] for r in ok) / sum(seconds) if sum(seconds) else 0.0
+        })
+
+    stages: Dict[str, List[float]] = {}
+    for record in records:
+        if record.get('kind') == 'call':
+            stages.setdefault('cli_call', []).append(record['seconds'])
+        elif record.get('kind') == 'stage':
+            stages.setdefault(record['stage'], []).append(record['seconds'])
+
+    stage_rows = []
+    for name, values in sorted(stages.items()):
+        stage_rows.append({
+            "stage": name,
+            "count": len(values),
+            "total": sum(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95)
+        })
+
+    # Time spent in ai-dev itself rather than waiting for the CLI
+    generate_total = sum(stages.get('generate', []))
+    call_total = sum(stages.get('cli_call', []))
+    return {
+        "cases": cases,
+        "stages": stage_rows,
+        "total_runs": len(results),
+        "failures": sum(1 for r in results if r['status'] != 'ok'),
+        "wall_seconds": wall,
+        "runs_per_second": len(results) / wall if wall else 0.0,
+        "overhead_seconds": max(0.0, generate_total - call_total),
+        "overhead_share": (generate_total - call_total) / generate_total if generate_total else 0.0
+    }
@@ -0,0 +1,87 @@
+"""Measure how long light CLI commands take to start in a fresh interpreter"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..utils.metrics import percentile
+
+# Commands that never touch a document; none of them should load these
+HEAVY_MODULES = ['pandas', 'numpy', 'openpyxl', 'pptx', 'PyPDF2', 'pydantic']
+
+DEFAULT_COMMANDS = [['--help'], ['generate', '--help'], ['config', 'show'], ['cache', 'info']]
+
+# Runs one command in-process and reports the heavy modules it imported
+_PROBE = """
+import json, sys
+from ai_dev.cli import cli
+try:
+    cli.main(args=json.loads(sys.argv[1]), prog_name='ai-dev', standalone_mode=False)
+except BaseException:
+    pass
+loaded = [name for name in json.loads(sys.argv[2]) if name in sys.modules]
+sys.stderr.write('\\n@@heavy@@' + json.dumps(loaded) + '\\n')
+"""
+
+_MARKER = '@@heavy@@'
+
+
+def _run_once(args: List[str], heavy: List[str], env: Dict[str, str]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', _PROBE, json.dumps(args), json.dumps(heavy)],
+                            capture_output=True, text=True, env=env)
+    seconds = time.perf_counter() - started
+
+    loaded: Optional[List[str]] = None
+    for line in result.stderr.splitlines():
+        if line.startswith(_MARKER):
+            loaded = json.loads(line[len(_MARKER):])
+    return {"seconds": seconds, "heavy": loaded, "ok": loaded is not None}
+
+
+def run_startup_benchmark(commands: Optional[List[List[str]]] = None,
+                          runs: int = 5,
+                          config_path: Optional[str] = None) -> Dict[str, Any]:
+    """Time each command ``runs`` times in a fresh interpreter
+
+    Returns per-command medians and the heavy modules each one imported.
+    """
+    commands = commands or DEFAULT_COMMANDS
+    env = dict(os.environ)
+    # Make sure the subprocess imports this copy of ai_dev
+    package_root = str(Path(__file__).resolve().parents[2])
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [package_root, env.get('PYTHONPATH')]))
+
+    results = []
+    for args in commands:
+        full_args = (['--config', config_path] if config_path else []) + list(args)
+        samples = [_run_once(full_args, HEAVY_MODULES, env) for _ in range(runs)]
+        seconds = [s['seconds'] for s in samples]
+        heavy = sorted({name for s in samples for name in (s['heavy'] or [])})
+        results.append({
+            "command": " ".join(args),
+            "runs": runs,
+            "p50": percentile(seconds, 50),
+            "min": min(seconds),
+            "max": max(seconds),
+            "heavy_modules": heavy,
+            "failures": sum(1 for s in samples if not s['ok'])
+        })
+
+    # Bare interpreter start, to tell ai-dev's share apart from Python's
+    baseline = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], env=env)
+        baseline.append(time.perf_counter() - started)
+
+    return {
+        "commands": results,
+        "interpreter_p50": percentile(baseline, 50),
+        "slowest_p50": max(r['p50'] for r in results),
+        "heavy_modules": sorted({name for r in results for name in r['heavy_modules']})
+    }
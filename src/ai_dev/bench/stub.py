@@ -0,0 +1,171 @@
+"""Offline stand-in for the gemini and claude CLIs
+
+Accepts the arguments GeminiCLI and ClaudeCLI pass (``--version``,
+``--model``, ``--prompt``, ``--print``, ``--output-format``, prompt on stdin
+or as the last argument) and answers with synthetic JSON shaped like the
+example in the prompt. Behaviour is controlled through environment variables:
+
+    AI_DEV_STUB_LATENCY       seconds per response (default 0.5)
+    AI_DEV_STUB_JITTER        +/- fraction of the latency (default 0.2)
+    AI_DEV_STUB_FAILURE_RATE  probability of failing a call (default 0)
+    AI_DEV_STUB_FAILURE_KIND  error, rate_limit or hang (default error)
+    AI_DEV_STUB_ITEMS         items per response, or per packed section (default 5)
+    AI_DEV_STUB_ITEM_BYTES    approximate size of each item (default 200)
+    AI_DEV_STUB_SEED          seed; the same prompt and seed give the same output
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import time
+from typing import List, Optional, Tuple
+
+_FENCED_EXAMPLE = re.compile(r'```json\s*\n(.*?)```', re.DOTALL)
+_EXAMPLE_KEY = re.compile(r'"(\w+)"\s*:')
+_EXAMPLE_ID = re.compile(r'"(?:id|test_id)"\s*:\s*"([A-Za-z]+-)\d+"')
+_COLUMN_LINE = re.compile(r'^- (\w+):', re.MULTILINE)
+# Packed inputs (generators/packing.py): one section per input file
+_PACKED_SECTION = re.compile(r'^<<<(S\d+): ', re.MULTILINE)
+
+
+def _setting(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(f"AI_DEV_STUB_{name}", default))
+    except ValueError:
+        return default
+
+
+def parse_args(argv: List[str]) -> Tuple[str, Optional[str], Optional[str]]:
+    """Return (backend, model, prompt argument) from a gemini/claude style argv"""
+    backend = os.path.basename(sys.argv[0]) if sys.argv else 'stub'
+    model = None
+    prompt = None
+    args = list(argv)
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == '--backend' and i + 1 < len(args):
+            backend = args[i + 1]
+            i += 2
+        elif arg in ('--model', '-m') and i + 1 < len(args):
+            model = args[i + 1]
+            i += 2
+        elif arg == '--output-format' and i + 1 < len(args):
+            i += 2
+        elif arg.startswith('--model='):
+            model = arg.split('=', 1)[1]
+            i += 1
+        elif arg in ('--prompt', '-p') and i + 1 < len(args):
+            prompt = args[i + 1]
+            i += 2
+        elif arg.startswith('-'):
+            i += 1  # --print and other flags without a value
+        else:
+            prompt = arg  # Positional prompt (claude argv transport)
+            i += 1
+    return backend, model, prompt
+
+
+def infer_fields(prompt: str) -> Tuple[List[str], str]:
+    """Field names and ID prefix from the prompt's JSON example or column list"""
+    fields: List[str] = []
+    prefix = "ITEM-"
+    example = _FENCED_EXAMPLE.search(prompt)
+    if example:
+        fields = list(dict.fromkeys(_EXAMPLE_KEY.findall(example.group(1))))
+        id_match = _EXAMPLE_ID.search(example.group(1))
+        if id_match:
+            prefix = id_match.group(1)
+    if not fields:
+        fields = list(dict.fromkeys(_COLUMN_LINE.findall(prompt)))
+    if not fields:
+        fields = ["id", "description"]
+    return fields, prefix
+
+
+def build_items(prompt: str, rng: random.Random, count: int, item_bytes: int) -> List[dict]:
+    """Synthetic items with the fields the prompt asks for"""
+    fields, prefix = infer_fields(prompt)
+    id_field = next((f for f in fields if f in ('id', 'test_id')), None)
+    filler = "テスト用の合成データです。"
+    items = []
+    for n in range(1, count + 1):
+        item = {}
+        for field in fields:
+            if field == id_field:
+                item[field] = f"{prefix}{n:03d}"
+            else:
+                item[field] = f"{field}-{n}-{rng.randint(1000, 9999)}"
+        # Pad one text field up to roughly the requested item size
+        text_field = next((f for f in fields if f != id_field), None)
+        if text_field:
+            size = len(json.dumps(item, ensure_ascii=False).encode('utf-8'))
+            missing = max(0, item_bytes - size) // len(filler.encode('utf-8'))
+            item[text_field] += filler * missing
+        items.append(item)
+    return items
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    # The wrappers decode CLI output as UTF-8 regardless of the locale
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stdin.reconfigure(encoding='utf-8', errors='replace')
+    if '--version' in argv:
+        print("0.0.0-stub")
+        return 0
+
+    backend, model, prompt = parse_args(argv)
+    if not sys.stdin.isatty():
+        piped = sys.stdin.read()
+        prompt = piped + (prompt or '') if piped else prompt
+    prompt = prompt or ''
+
+    seed = os.environ.get('AI_DEV_STUB_SEED', '0')
+    rng = random.Random(f"{seed}:{backend}:{model}:{hashlib.sha256(prompt.encode('utf-8')).hexdigest()}")
+
+    latency = _setting('LATENCY', 0.5)
+    jitter = _setting('JITTER', 0.2)
+    latency = max(0.0, latency * (1 + rng.uniform(-jitter, jitter)))
+
+    if rng.random() < _setting('FAILURE_RATE', 0):
+        kind = os.environ.get('AI_DEV_STUB_FAILURE_KIND', 'error')
+        if kind == 'hang':
+            time.sleep(3600)
+        time.sleep(latency / 2)
+        if kind == 'rate_limit':
+            print("Error: 429 Too Many Requests (stub rate limit)", file=sys.stderr)
+        else:
+            print("Error: stub backend failure", file=sys.stderr)
+        return 1
+
+    count, item_bytes = int(_setting('ITEMS', 5)), int(_setting('ITEM_BYTES', 200))
+    sections = _PACKED_SECTION.findall(prompt)
+    if sections:
+        # Answer every packed section, tagging its items as the prompt asks
+        items = [{**item, "section_id": section}
+                 for section in sections
+                 for item in build_items(prompt, rng, count, item_bytes)]
+    else:
+        items = build_items(prompt, rng, count, item_bytes)
+
+    # Emit like the real CLIs: banner noise, then a fenced array one item at a time
+    if backend.startswith('gemini'):
+        print("Loaded cached credentials.", flush=True)
+    print("```json\n[", flush=True)
+    delay = latency / max(1, len(items))
+    for n, item in enumerate(items):
+        time.sleep(delay)
+        separator = "," if n < len(items) - 1 else ""
+        print(f"  {json.dumps(item, ensure_ascii=False)}{separator}", flush=True)
+    if not items:
+        time.sleep(latency)
+    print("]\n```", flush=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,25 +1,29 @@
 """CLI interface for AI Dev Tool"""
 
 import click
+import os
+import time
 from pathlib import Path
 from typing import Dict, Any
 from rich.console import Console
-from rich.table import Table
 from rich import print as rprint
 import codecs
 
 from .config.manager import ConfigManager
 from .ai_models.model_manager import ModelManager
-from .generators.requirements import RequirementsGenerator
-from .generators.qa import QAGenerator
-from .generators.tasks import TasksGenerator
-from .generators.test_concept import TestConceptGenerator
-from .generators.test_cases import TestCasesGenerator
-from .utils.encoder import EncodingHandler
-from .analyzers import TextAnalyzer, PPTAnalyzer, SpreadsheetAnalyzer, PDFAnalyzer
+from .analyzers import read_input
+from .analyzers.cache import configure as configure_analysis_cache
+from .generators import GENERATOR_TYPES
+from .utils.metrics import metrics, percentile
+
+# Generator classes, analyzers (pandas, PyPDF2, python-pptx) and rich.table are
+# imported inside the commands that use them to keep start-up fast
 
 console = Console()
 
+# Median start-up time "ai-dev bench startup" allows for a light command
+STARTUP_BUDGET_MS = 600
+
 
 @click.group()
 @click.option('--config', '-c', type=click.Path(), 
@@ -32,14 +36,21 @@ console = Console()
 @click.option('--timeout', '-t',
               type=int,
               help='Timeout in seconds (default: 300)')
+@click.option('--pool', is_flag=True,
+              help='Route requests across all available AI models with failover')
+@click.option('--no-cache', is_flag=True,
+              help='Do not read or write the AI response and file analysis caches')
+@click.option('--refresh', is_flag=True,
+              help='Ignore cached AI responses and analyses and store fresh ones')
 @click.pass_context
-def cli(ctx, config, ai, verbose, timeout):
+def cli(ctx, config, ai, verbose, timeout, pool, no_cache, refresh):
     """AI Dev Tool - System Development Support Tool"""
     ctx.ensure_object(dict)
     ctx.obj['config'] = ConfigManager(config)
     
     # Apply timeout if specified
     config_data = ctx.obj['config'].get_all()
+    metrics.configure(config_data.get('metrics', {}))
     if timeout:
         # Update timeout for all models
         if 'ai_models' in config_data:
@@ -49,12 +60,18 @@ def cli(ctx, config, ai, verbose, timeout):
         if verbose:
             console.print(f"[yellow]⏱️  Timeout set to {timeout} seconds[/yellow]")
     
-    ctx.obj['model_manager'] = ModelManager(config_data)
+    # The model is created lazily; --ai only selects which one
+    ctx.obj['model_manager'] = ModelManager(config_data, model_name=ai, pool=pool)
     ctx.obj['verbose'] = verbose
     
-    # Switch AI model if specified
-    if ai:
-        ctx.obj['model_manager'].use_model(ai)
+    # Response cache overrides (not persisted to the configuration file)
+    response_cache = ctx.obj['model_manager'].response_cache
+    if no_cache:
+        response_cache.enabled = False
+    if refresh:
+        response_cache.refresh = True
+    configure_analysis_cache(config_data.get('analysis', {}).get('cache', {}),
+                             enabled=False if no_cache else None, refresh=refresh)
 
 
 @cli.command('use')
@@ -75,6 +92,8 @@ def use_model(ctx, model):
 @click.pass_context
 def status(ctx):
     """Display current configuration status"""
+    from rich.table import Table
+    
     config = ctx.obj['config']
     model_manager = ctx.obj['model_manager']
     
@@ -130,74 +149,326 @@ def generate(ctx):
     pass
 
 
-@generate.command('requirements')
-@click.argument('input_file', type=click.Path(exists=True))
-@click.option('--output', '-o', type=click.Path(), 
-              help='Output file path')
-@click.option('--format', '-f', 
-              type=click.Choice(['json', 'csv', 'md', 'markdown', 'html']),
-              help='Output format')
-@click.option('--encoding', '-e',
-              type=click.Choice(['shift-jis', 'utf-8', 'cp932']),
-              help='Output encoding')
-@click.pass_context
-def generate_requirements(ctx, input_file, output, format, encoding):
-    """Generate requirements document"""
+def _generator(doc_type: str, config: ConfigManager, model_manager: ModelManager):
+    """Create a generator; its module is imported on first use"""
+    from .generators import get_generator
+    return get_generator(doc_type)(config, model_manager)
+
+
+def _run_generate(generator, input_text: str, chunked: bool = False, chunk_tokens=None):
+    """Run a generator, using chunked map-reduce generation when requested"""
+    if chunked or chunk_tokens:
+        return generator.generate_chunked(input_text, max_tokens=chunk_tokens)
+    return generator.generate(input_text)
+
+
+def _fingerprint(generator, input_file: str, format, chunked: bool = False, chunk_tokens=None):
+    """Fingerprint of generating from input_file with the current settings"""
+    from .generators.fingerprint import generation_fingerprint
+    return generation_fingerprint(generator, input_file, format, chunked, chunk_tokens)
+
+
+def _up_to_date(output: str, fingerprint, force: bool = False) -> bool:
+    """Report and skip an output whose fingerprint sidecar matches, unless --force"""
+    from .generators.fingerprint import up_to_date
+    record = None if force else up_to_date(output, fingerprint)
+    if record:
+        console.print(f"[green]✓[/green] Up to date: {record['output']} "
+                      f"({record.get('items', 0)} items; use --force to regenerate)")
+    return bool(record)
+
+
+def _generate_to_file(generator, input_text: str, output: str, format, title: str,
+                      chunked: bool = False, chunk_tokens=None, stream: bool = False, fingerprint=None):
+    """Generate items and save them; returns (saved path, item count)"""
+    mode = "stream" if stream else "chunked" if chunked or chunk_tokens else "single"
+    with metrics.stage("generate", generator=type(generator).__name__,
+                       model=generator.model_manager.get_current_model_name(), mode=mode) as stage:
+        if stream:
+            saved_path, count = generator.save_stream(generator.generate_stream(input_text), output, format, title)
+        else:
+            items = _run_generate(generator, input_text, chunked, chunk_tokens)
+            saved_path, count = generator.save_to_file(items, output, format, title), len(items)
+        stage["items"] = count
+    
+    if fingerprint:
+        from .generators.fingerprint import write_sidecar
+        write_sidecar(output, fingerprint, saved_path, count)
+    return saved_path, count
+
+
+def _print_compaction(generator, verbose: bool = False):
+    """Show how much the input shrank and anything cut to fit the model budget"""
+    report = generator.compaction_report
+    if not report:
+        return
+    
+    if verbose:
+        console.print(f"[dim]   Input: {report.summary()}[/dim]")
+    elif report.saved_tokens:
+        console.print(f"[dim]   Input: {report.original_tokens:,} → {report.compacted_tokens:,} tokens "
+                      f"(-{report.reduction:.0%})[/dim]")
+    
+    if report.trimmed:
+        sections = report.trimmed_sections
+        shown = ', '.join(sections[:5]) + (f" (+{len(sections) - 5} more)" if len(sections) > 5 else "")
+        console.print(f"[yellow]⚠[/yellow] Input exceeded max_input_tokens ({report.budget:,}): "
+                      f"~{report.trimmed_tokens:,} tokens trimmed from {shown}")
+        console.print("   Use --chunked to process the whole input")
+
+
+def _generate_many(ctx, doc_type: str, input_paths, output, output_dir, format, jobs,
+                   chunked: bool = False, chunk_tokens=None, stream: bool = False, force: bool = False) -> bool:
+    """Generate one document per input for several files, directories or globs
+    
+    Outputs mirror the input tree under the output directory. Inputs are read,
+    decoded and compacted ahead of the model calls in flight. Returns False
+    for a single input file, which the command handles as before.
+    """
+    if len(input_paths) == 1 and os.path.isfile(input_paths[0]):
+        return False
+    if output:
+        raise click.UsageError("--output names a single file; use --output-dir with several inputs")
+    if stream and (chunked or chunk_tokens):
+        raise click.UsageError("--stream cannot be combined with --chunked")
+    
+    from rich.progress import (BarColumn, MofNCompleteColumn, Progress, TextColumn,
+                               TimeElapsedColumn, TimeRemainingColumn)
+    from .batch import expand_inputs, mirrored_outputs, run_pipelined
+    from .batch.runner import FORMAT_EXTENSIONS
+    from .generators.fingerprint import up_to_date
+    
     config = ctx.obj['config']
     model_manager = ctx.obj['model_manager']
+    verbose = ctx.obj['verbose']
+    try:
+        inputs = expand_inputs(input_paths, config.get('generation.batch.extensions'))
+    except FileNotFoundError as e:
+        raise click.BadParameter(str(e), param_hint='INPUT_PATHS')
+    
+    file_stem, title = GENERATOR_TYPES[doc_type]
+    output_format = format or config.get('output.default_format', 'md')
+    output_dir = output_dir or config.get('output.directory', './output')
+    outputs = dict(zip(inputs, mirrored_outputs(inputs, output_dir, file_stem,
+                                                FORMAT_EXTENSIONS.get(output_format, output_format))))
+    jobs = min(jobs or config.get('generation.batch.max_workers', 4), len(inputs))
+    
+    def prepare(item):
+        generator = _generator(doc_type, config, model_manager)
+        fingerprint = _fingerprint(generator, item.path, format, chunked, chunk_tokens)
+        record = None if force else up_to_date(outputs[item], fingerprint)
+        if record:
+            return generator, None, fingerprint, record  # Nothing changed; skip reading too
+        input_text, _ = read_input(item.path)
+        if not (chunked or chunk_tokens):
+            input_text = generator.precompact(input_text)
+        return generator, input_text, fingerprint, None
+    
+    def process(item, prepared):
+        generator, input_text, fingerprint, record = prepared
+        if record:
+            return record['output'], record.get('items', 0), None
+        saved_path, count = _generate_to_file(generator, input_text, outputs[item], format,
+                                              f"{title}: {Path(item.path).name}", chunked, chunk_tokens, stream,
+                                              fingerprint)
+        return saved_path, count, generator
+    
+    failed = []
+    skipped = []
+    started = time.time()
+    
+    def on_result(item, result, error):
+        if error:
+            failed.append(item)
+            console.print(f"[red]✗[/red] {item.path}: {error}")
+        elif result[2] is None:
+            skipped.append(item)
+            if verbose:
+                console.print(f"[dim]= {item.path}: up to date ({result[0]})[/dim]")
+        else:
+            saved_path, count, generator = result
+            console.print(f"[green]✓[/green] {item.path} → {saved_path} ({count} items)")
+            report = generator.compaction_report
+            if verbose or (report and report.trimmed):
+                _print_compaction(generator, verbose)
+        progress.advance(task)
+    
+    progress = Progress(TextColumn("{task.description}"), BarColumn(), MofNCompleteColumn(),
+                        TimeElapsedColumn(), TextColumn("ETA"), TimeRemainingColumn(), console=console)
+    with progress:
+        task = progress.add_task(f"{title} ({model_manager.get_current_model_name()}, {jobs} parallel)",
+                                 total=len(inputs))
+        run_pipelined(inputs, prepare, process, jobs, on_result)
+    
+    console.print(f"Generated {len(inputs) - len(failed) - len(skipped)}/{len(inputs)} {doc_type} documents "
+                  f"in {time.time() - started:.1f}s → {output_dir}")
+    if skipped:
+        console.print(f"   Up to date: {len(skipped)} (use --force to regenerate)")
+    console.print(f"   Encoding: {config.get('output.encoding', 'utf-8')}")
+    if failed:
+        console.print(f"[red]✗[/red] Failed: {len(failed)}")
+        ctx.exit(1)
+    return True
+
+
+class _InputPath(click.Path):
+    """An existing file or directory, or a glob pattern expanded by ai-dev"""
+    
+    def convert(self, value, param, ctx):
+        import glob
+        if glob.has_magic(value):
+            return value  # Checked when expanded; quoted patterns must reach expand_inputs
+        return super().convert(value, param, ctx)
+
+
+# Options shared by the single-document 'generate <type>' commands
+_GENERATE_OPTIONS = [
+    click.argument('input_paths', nargs=-1, required=True, type=_InputPath(exists=True)),
+    click.option('--output', '-o', type=click.Path(),
+                 help='Output file path'),
+    click.option('--format', '-f',
+                 type=click.Choice(['json', 'csv', 'md', 'markdown', 'html']),
+                 help='Output format'),
+    click.option('--encoding', '-e',
+                 type=click.Choice(['shift-jis', 'utf-8', 'cp932']),
+                 help='Output encoding'),
+    click.option('--chunked', is_flag=True,
+                 help='Split large input into chunks and generate them in parallel'),
+    click.option('--chunk-tokens', type=click.IntRange(min=100),
+                 help='Estimated tokens per chunk (implies --chunked, default: generation.chunking.max_tokens)'),
+    click.option('--stream', is_flag=True,
+                 help='Write items to the output file as soon as the model produces them'),
+    click.option('--output-dir', '-d', type=click.Path(file_okay=False),
+                 help='Output directory for directory/glob inputs; mirrors the input tree (default: output.directory)'),
+    click.option('--jobs', '-j', type=click.IntRange(min=1),
+                 help='Inputs generated at the same time (default: generation.batch.max_workers)'),
+    click.option('--force', is_flag=True,
+                 help='Regenerate even if the output fingerprint shows nothing changed'),
+    click.pass_context,
+]
+
+
+def _generate_options(command):
+    """Apply the shared 'generate <type>' arguments and options"""
+    for decorator in reversed(_GENERATE_OPTIONS):
+        command = decorator(command)
+    return command
+
+
+def _generate_document(ctx, doc_type: str, input_paths, output, format, encoding, chunked, chunk_tokens, stream,
+                       output_dir, jobs, force):
+    """Body of the 'generate <type>' commands; exits 1 if generation fails"""
+    config = ctx.obj['config']
+    model_manager = ctx.obj['model_manager']
+    verbose = ctx.obj['verbose']
     
     # Override encoding if specified
     if encoding:
         config.set('output.encoding', encoding)
     
-    # Set output format if specified
     if format:
         config.set('output.default_format', format)
     
-    generator = RequirementsGenerator(config, model_manager)
+    if _generate_many(ctx, doc_type, input_paths, output, output_dir, format, jobs,
+                      chunked, chunk_tokens, stream, force):
+        return
+    if stream and (chunked or chunk_tokens):
+        raise click.UsageError("--stream cannot be combined with --chunked")
+    
+    input_file = input_paths[0]
+    file_stem, title = GENERATOR_TYPES[doc_type]
+    if not output:
+        output = f"{config.get('output.directory', './output')}/{file_stem}.{format or 'md'}"
+    
+    generator = _generator(doc_type, config, model_manager)
+    fingerprint = _fingerprint(generator, input_file, format, chunked, chunk_tokens)
+    if _up_to_date(output, fingerprint, force):
+        return
     
     # Read input file
-    encoder = EncodingHandler()
-    input_text, input_encoding = encoder.read_file_auto(input_file)
+    input_text, input_encoding = read_input(input_file)
     
-    if ctx.obj['verbose']:
+    if verbose:
         console.print(f"[dim]Input encoding detected: {input_encoding}[/dim]")
     
-    with console.status(f"Generating requirements with {model_manager.get_current_model_name()}..."):
+    with console.status(f"Generating {title} with {model_manager.get_current_model_name()}..."):
         try:
-            # Generate requirements
-            requirements = generator.generate(input_text)
-            
-            # Save to file
-            if not output:
-                output = f"{config.get('output.directory', './output')}/requirements.{format or 'md'}"
-            
-            saved_path = generator.save_to_file(requirements, output, format, "Requirements")
-            
-            console.print(f"[green]✓[/green] Requirements generated: {saved_path}")
-            console.print(f"   Encoding: {config.get('output.encoding', 'utf-8')}")
-            console.print(f"   Items: {len(requirements)}")
-            
+            saved_path, count = _generate_to_file(generator, input_text, output, format, title,
+                                                  chunked, chunk_tokens, stream, fingerprint)
         except Exception as e:
             console.print(f"[red]✗[/red] Error: {str(e)}")
-            if ctx.obj['verbose']:
+            if verbose:
                 import traceback
                 console.print(traceback.format_exc())
+            ctx.exit(1)
+    
+    console.print(f"[green]✓[/green] {title} generated: {saved_path}")
+    console.print(f"   Encoding: {config.get('output.encoding', 'utf-8')}")
+    console.print(f"   Items: {count}")
+    _print_compaction(generator, verbose)
+
+
+@generate.command('requirements')
+@_generate_options
+def generate_requirements(ctx, **options):
+    """Generate requirements document"""
+    _generate_document(ctx, 'requirements', **options)
 
 
 @generate.command('qa')
+@_generate_options
+def generate_qa(ctx, **options):
+    """Generate QA document"""
+    _generate_document(ctx, 'qa', **options)
+
+
+@generate.command('tasks')
+@_generate_options
+def generate_tasks(ctx, **options):
+    """Generate task list"""
+    _generate_document(ctx, 'tasks', **options)
+
+
+@generate.command('test-concept')
+@_generate_options
+def generate_test_concept(ctx, **options):
+    """Generate test concept document"""
+    _generate_document(ctx, 'test-concept', **options)
+
+
+@generate.command('test-cases')
+@_generate_options
+def generate_test_cases(ctx, **options):
+    """Generate test cases"""
+    _generate_document(ctx, 'test-cases', **options)
+
+
+@generate.command('all')
 @click.argument('input_file', type=click.Path(exists=True))
-@click.option('--output', '-o', type=click.Path(), 
-              help='Output file path')
-@click.option('--format', '-f', 
+@click.option('--output-dir', '-d', type=click.Path(file_okay=False),
+              help='Output directory (default: output.directory)')
+@click.option('--format', '-f',
               type=click.Choice(['json', 'csv', 'md', 'markdown', 'html']),
               help='Output format')
 @click.option('--encoding', '-e',
               type=click.Choice(['shift-jis', 'utf-8', 'cp932']),
               help='Output encoding')
+@click.option('--jobs', '-j', type=click.IntRange(1, len(GENERATOR_TYPES)),
+              default=len(GENERATOR_TYPES), show_default=True,
+              help='Number of generators to run at the same time')
+@click.option('--chunked', is_flag=True,
+              help='Split large input into chunks and generate them in parallel')
+@click.option('--chunk-tokens', type=click.IntRange(min=100),
+              help='Estimated tokens per chunk (implies --chunked, default: generation.chunking.max_tokens)')
+@click.option('--stream', is_flag=True,
+              help='Write items to the output file as soon as the model produces them')
+@click.option('--force', is_flag=True,
+              help='Regenerate even if the output fingerprint shows nothing changed')
 @click.pass_context
-def generate_qa(ctx, input_file, output, format, encoding):
-    """Generate QA document"""
+def generate_all(ctx, input_file, output_dir, format, encoding, jobs, chunked, chunk_tokens, stream, force):
+    """Generate all documents from one input file in parallel"""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    
     config = ctx.obj['config']
     model_manager = ctx.obj['model_manager']
     
@@ -208,157 +479,388 @@ def generate_qa(ctx, input_file, output, format, encoding):
     if format:
         config.set('output.default_format', format)
     
-    generator = QAGenerator(config, model_manager)
-    encoder = EncodingHandler()
-    input_text, _ = encoder.read_file_auto(input_file)
+    if stream and (chunked or chunk_tokens):
+        raise click.UsageError("--stream cannot be combined with --chunked")
     
-    with console.status(f"Generating QA with {model_manager.get_current_model_name()}..."):
-        try:
-            qa_items = generator.generate(input_text)
-            
-            if not output:
-                output = f"{config.get('output.directory', './output')}/qa.{format or 'md'}"
-            
-            saved_path = generator.save_to_file(qa_items, output, format, "QA Document")
-            
-            console.print(f"[green]✓[/green] QA document generated: {saved_path}")
-            console.print(f"   Encoding: {config.get('output.encoding', 'utf-8')}")
-            console.print(f"   Items: {len(qa_items)}")
+    # Read and decode the input only once for every generator
+    input_text, input_encoding = read_input(input_file)
+    
+    if ctx.obj['verbose']:
+        console.print(f"[dim]Input encoding detected: {input_encoding}[/dim]")
+    
+    output_dir = output_dir or config.get('output.directory', './output')
+    
+    from .generators.fingerprint import up_to_date
+    
+    def run(doc_type: str):
+        file_stem, title = GENERATOR_TYPES[doc_type]
+        generator = _generator(doc_type, config, model_manager)
+        output = f"{output_dir}/{file_stem}.{format or 'md'}"
+        fingerprint = _fingerprint(generator, input_file, format, chunked, chunk_tokens)
+        record = None if force else up_to_date(output, fingerprint)
+        if record:
+            return record['output'], record.get('items', 0), None
+        saved_path, count = _generate_to_file(generator, input_text, output, format, title,
+                                              chunked, chunk_tokens, stream, fingerprint)
+        return saved_path, count, generator
+    
+    failed = []
+    with console.status(f"Generating {len(GENERATOR_TYPES)} documents with "
+                        f"{model_manager.get_current_model_name()} ({jobs} parallel)..."):
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = {executor.submit(run, doc_type): doc_type for doc_type in GENERATOR_TYPES}
             
-        except Exception as e:
-            console.print(f"[red]✗[/red] Error: {str(e)}")
+            for future in as_completed(futures):
+                doc_type = futures[future]
+                title = GENERATOR_TYPES[doc_type][1]
+                try:
+                    saved_path, count, generator = future.result()
+                    if generator is None:
+                        console.print(f"[green]✓[/green] {title} up to date: {saved_path} ({count} items)")
+                        continue
+                    console.print(f"[green]✓[/green] {title} generated: {saved_path}")
+                    console.print(f"   Items: {count}")
+                    _print_compaction(generator, ctx.obj['verbose'])
+                except Exception as e:
+                    failed.append(doc_type)
+                    console.print(f"[red]✗[/red] {title} error: {str(e)}")
+                    if ctx.obj['verbose']:
+                        import traceback
+                        console.print(traceback.format_exc())
+    
+    console.print(f"   Encoding: {config.get('output.encoding', 'utf-8')}")
+    
+    if failed:
+        console.print(f"[red]✗[/red] Failed: {', '.join(failed)}")
+        ctx.exit(1)
 
 
-@generate.command('tasks')
-@click.argument('input_file', type=click.Path(exists=True))
-@click.option('--output', '-o', type=click.Path(), 
-              help='Output file path')
-@click.option('--format', '-f', 
+@generate.command('pipeline')
+@click.argument('input_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--stage', '-s', 'stages', multiple=True,
+              type=click.Choice(list(GENERATOR_TYPES)),
+              help='Stage to produce, with the stages it depends on (repeatable, default: all)')
+@click.option('--output-dir', '-d', type=click.Path(file_okay=False),
+              help='Output directory (default: output.directory)')
+@click.option('--format', '-f',
               type=click.Choice(['json', 'csv', 'md', 'markdown', 'html']),
               help='Output format')
 @click.option('--encoding', '-e',
               type=click.Choice(['shift-jis', 'utf-8', 'cp932']),
               help='Output encoding')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=3, show_default=True,
+              help='Independent stages run at the same time')
+@click.option('--chunked', is_flag=True,
+              help='Generate the stages that read the input document in chunks')
+@click.option('--chunk-tokens', type=click.IntRange(min=100),
+              help='Estimated tokens per chunk (implies --chunked, default: generation.chunking.max_tokens)')
+@click.option('--force', is_flag=True,
+              help='Regenerate even if the output fingerprint shows nothing changed')
 @click.pass_context
-def generate_tasks(ctx, input_file, output, format, encoding):
-    """Generate task list"""
+def generate_pipeline(ctx, input_file, stages, output_dir, format, encoding, jobs, chunked, chunk_tokens, force):
+    """Generate documents as a DAG, feeding upstream items to downstream stages
+    
+    requirements → tasks and requirements → test-concept → test-cases; qa
+    reads the input document. Downstream stages get the upstream items as
+    compact JSON instead of the whole document.
+    """
+    from .generators.fingerprint import file_hash, text_hash, up_to_date, write_sidecar
+    from .generators.pipeline import PIPELINE, run_dag, upstream_context, upstream_input, with_dependencies
+    
     config = ctx.obj['config']
     model_manager = ctx.obj['model_manager']
     
-    # Override encoding if specified
     if encoding:
         config.set('output.encoding', encoding)
     
     if format:
         config.set('output.default_format', format)
     
-    generator = TasksGenerator(config, model_manager)
-    encoder = EncodingHandler()
-    input_text, _ = encoder.read_file_auto(input_file)
+    input_text, input_encoding = read_input(input_file)
+    if ctx.obj['verbose']:
+        console.print(f"[dim]Input encoding detected: {input_encoding}[/dim]")
     
-    with console.status(f"Generating tasks with {model_manager.get_current_model_name()}..."):
-        try:
-            tasks = generator.generate(input_text)
-            
-            if not output:
-                output = f"{config.get('output.directory', './output')}/tasks.{format or 'md'}"
-            
-            saved_path = generator.save_to_file(tasks, output, format, "Task List")
-            
-            console.print(f"[green]✓[/green] Task list generated: {saved_path}")
-            console.print(f"   Encoding: {config.get('output.encoding', 'utf-8')}")
-            console.print(f"   Tasks: {len(tasks)}")
-            
-        except Exception as e:
-            console.print(f"[red]✗[/red] Error: {str(e)}")
+    input_hash = file_hash(input_file)
+    output_dir = output_dir or config.get('output.directory', './output')
+    dag = with_dependencies(list(stages)) if stages else PIPELINE
+    saved = {}  # stage -> (path, generated now, input tokens)
+    
+    def run_stage(stage, upstream):
+        file_stem, title = GENERATOR_TYPES[stage]
+        generator = _generator(stage, config, model_manager)
+        output = f"{output_dir}/{file_stem}.{format or 'md'}"
+        if upstream:
+            stage_input, context = upstream_input(upstream), upstream_context(upstream)
+            fingerprint = generator.fingerprint(text_hash(stage_input), format, "pipeline")
+        else:
+            stage_input, context = input_text, None
+            fingerprint = _fingerprint(generator, input_file, format, chunked, chunk_tokens)
+        
+        record = None if force else up_to_date(output, fingerprint)
+        if record and 'data' in record:
+            saved[stage] = (record['output'], False, None)
+            return record['data']
+        
+        with metrics.stage("generate", generator=type(generator).__name__,
+                           model=model_manager.get_current_model_name(), mode="pipeline") as stage_metrics:
+            if not upstream and (chunked or chunk_tokens):
+                items = generator.generate_chunked(stage_input, context, max_tokens=chunk_tokens)
+            else:
+                items = generator.generate(stage_input, context)
+            saved_path = generator.save_to_file(items, output, format, title)
+            stage_metrics["items"] = len(items)
+        write_sidecar(output, fingerprint, saved_path, len(items), data=items)
+        report = generator.compaction_report
+        saved[stage] = (saved_path, True, report.compacted_tokens if report else None)
+        return items
+    
+    def on_stage(stage, items, error):
+        title = GENERATOR_TYPES[stage][1]
+        if error:
+            console.print(f"[red]✗[/red] {title}: {error}")
+            return
+        path, fresh, tokens = saved[stage]
+        state = "generated" if fresh else "up to date"
+        source = f" from {', '.join(dag[stage])}" if dag[stage] else ""
+        size = f", input ~{tokens:,} tokens" if tokens else ""
+        console.print(f"[green]✓[/green] {title} {state}{source}: {path} ({len(items)} items{size})")
+    
+    started = time.time()
+    with console.status(f"Running {len(dag)} pipeline stages with {model_manager.get_current_model_name()}..."):
+        results, errors = run_dag(dag, run_stage, jobs, on_stage)
+    
+    console.print(f"Pipeline: {len(results)}/{len(dag)} stages in {time.time() - started:.1f}s")
+    console.print(f"   Encoding: {config.get('output.encoding', 'utf-8')}")
+    if errors:
+        ctx.exit(1)
 
 
-@generate.command('test-concept')
-@click.argument('input_file', type=click.Path(exists=True))
-@click.option('--output', '-o', type=click.Path(), 
-              help='Output file path')
-@click.option('--format', '-f', 
+@generate.command('pack')
+@click.argument('doc_type', type=click.Choice(list(GENERATOR_TYPES)))
+@click.argument('input_files', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--output-dir', '-d', type=click.Path(file_okay=False),
+              help='Output directory (default: output.directory)')
+@click.option('--format', '-f',
               type=click.Choice(['json', 'csv', 'md', 'markdown', 'html']),
               help='Output format')
 @click.option('--encoding', '-e',
               type=click.Choice(['shift-jis', 'utf-8', 'cp932']),
               help='Output encoding')
+@click.option('--pack-tokens', type=click.IntRange(min=100),
+              help='Estimated input tokens per model call (default: generation.packing.max_tokens)')
+@click.option('--max-files', type=click.IntRange(min=1),
+              help='Inputs per model call (default: generation.packing.max_files)')
+@click.option('--jobs', '-j', type=click.IntRange(min=1),
+              help='Packs generated at the same time (default: generation.packing.max_workers)')
 @click.pass_context
-def generate_test_concept(ctx, input_file, output, format, encoding):
-    """Generate test concept document"""
+def generate_pack(ctx, doc_type, input_files, output_dir, format, encoding, pack_tokens, max_files, jobs):
+    """Generate one document per input, packing many small inputs into each model call"""
     config = ctx.obj['config']
     model_manager = ctx.obj['model_manager']
     
-    # Override encoding if specified
     if encoding:
         config.set('output.encoding', encoding)
     
     if format:
         config.set('output.default_format', format)
     
-    generator = TestConceptGenerator(config, model_manager)
-    encoder = EncodingHandler()
-    input_text, _ = encoder.read_file_auto(input_file)
+    from .generators import PackedGenerationError
     
-    with console.status(f"Generating test concept with {model_manager.get_current_model_name()}..."):
+    file_stem, title = GENERATOR_TYPES[doc_type]
+    generator = _generator(doc_type, config, model_manager)
+    
+    inputs = {path: read_input(path)[0] for path in dict.fromkeys(input_files)}
+    output_dir = output_dir or config.get('output.directory', './output')
+    
+    with console.status(f"Generating {len(inputs)} {doc_type} documents with "
+                        f"{model_manager.get_current_model_name()} (packed)..."):
         try:
-            test_concepts = generator.generate(input_text)
-            
-            if not output:
-                output = f"{config.get('output.directory', './output')}/test_concept.{format or 'md'}"
-            
-            saved_path = generator.save_to_file(test_concepts, output, format, "Test Concept")
-            
-            console.print(f"[green]✓[/green] Test concept generated: {saved_path}")
-            console.print(f"   Encoding: {config.get('output.encoding', 'utf-8')}")
-            console.print(f"   Items: {len(test_concepts)}")
-            
-        except Exception as e:
-            console.print(f"[red]✗[/red] Error: {str(e)}")
+            results, errors = generator.generate_packed(inputs, pack_tokens, max_files, jobs), {}
+        except PackedGenerationError as e:
+            results, errors = e.results, e.errors
+    
+    used_names = set()
+    for path, items in results.items():
+        base_name = name = f"{Path(path).stem}_{file_stem}"
+        n = 2
+        while name in used_names:  # Same file name in different directories
+            name, n = f"{base_name}-{n}", n + 1
+        used_names.add(name)
+        
+        saved_path = generator.save_to_file(items, f"{output_dir}/{name}.{format or 'md'}", format,
+                                            f"{title}: {Path(path).name}")
+        console.print(f"[green]✓[/green] {path} → {saved_path} ({len(items)} items)")
+    
+    for path, error in errors.items():
+        console.print(f"[red]✗[/red] {path}: {error}")
+    
+    console.print(f"   Encoding: {config.get('output.encoding', 'utf-8')}")
+    if errors:
+        ctx.exit(1)
 
 
-@generate.command('test-cases')
-@click.argument('input_file', type=click.Path(exists=True))
-@click.option('--output', '-o', type=click.Path(), 
-              help='Output file path')
-@click.option('--format', '-f', 
+@cli.group()
+@click.pass_context
+def batch(ctx):
+    """Resumable batch generation tracked in a SQLite manifest"""
+    pass
+
+
+def _manifest_path(config, manifest, output_dir) -> str:
+    """--manifest, or the batch manifest file inside the output directory"""
+    if manifest:
+        return manifest
+    output_dir = output_dir or config.get('output.directory', './output')
+    return str(Path(output_dir) / config.get('generation.batch.manifest', '.ai-dev-batch.db'))
+
+
+def _run_batch(runner, units):
+    """Run batch units, printing one line per finished unit; returns the counts"""
+    total = sum(1 for unit in units if not runner.is_done(unit))
+    finished = 0
+    
+    def on_result(unit, error):
+        nonlocal finished
+        finished += 1
+        name = Path(unit['input_path']).name
+        if error:
+            console.print(f"[red]✗[/red] [{finished}/{total}] {name} ({unit['generator']}): {error}")
+        else:
+            console.print(f"[green]✓[/green] [{finished}/{total}] {name} ({unit['generator']}) → "
+                          f"{unit['output_path']} ({unit['items']} items, {_duration(unit['seconds'])})")
+    
+    try:
+        counts = runner.run(units, on_result)
+    except KeyboardInterrupt:
+        console.print("[yellow]⚠[/yellow] Interrupted; run the same command again to resume")
+        raise
+    
+    console.print(f"Done: {counts['done']}, failed: {counts['failed']}, "
+                  f"skipped (already done): {counts['skipped']}")
+    console.print(f"   Manifest: {runner.manifest.path}")
+    return counts
+
+
+@batch.command('run')
+@click.argument('input_files', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--generator', '-g', 'doc_types', multiple=True,
+              type=click.Choice(list(GENERATOR_TYPES)),
+              help='Generator to run on every input (repeatable, default: all)')
+@click.option('--output-dir', '-d', type=click.Path(file_okay=False),
+              help='Output directory (default: output.directory)')
+@click.option('--format', '-f',
               type=click.Choice(['json', 'csv', 'md', 'markdown', 'html']),
               help='Output format')
 @click.option('--encoding', '-e',
               type=click.Choice(['shift-jis', 'utf-8', 'cp932']),
               help='Output encoding')
+@click.option('--manifest', '-m', type=click.Path(dir_okay=False),
+              help='Manifest file (default: generation.batch.manifest in the output directory)')
+@click.option('--jobs', '-j', type=click.IntRange(min=1),
+              help='Units generated at the same time (default: generation.batch.max_workers)')
+@click.option('--chunk-tokens', type=click.IntRange(min=100),
+              help='Generate large inputs in chunks of this many estimated tokens')
 @click.pass_context
-def generate_test_cases(ctx, input_file, output, format, encoding):
-    """Generate test cases"""
+def batch_run(ctx, input_files, doc_types, output_dir, format, encoding, manifest, jobs, chunk_tokens):
+    """Generate documents for many inputs, skipping units already done
+    
+    Rerunning the same command after an interruption only runs the units
+    that are pending, were in flight, or failed.
+    """
+    from .batch import BatchManifest, BatchRunner
+    
     config = ctx.obj['config']
     model_manager = ctx.obj['model_manager']
     
-    # Override encoding if specified
     if encoding:
         config.set('output.encoding', encoding)
     
     if format:
         config.set('output.default_format', format)
     
-    generator = TestCasesGenerator(config, model_manager)
-    encoder = EncodingHandler()
-    input_text, _ = encoder.read_file_auto(input_file)
+    output_dir = output_dir or config.get('output.directory', './output')
+    jobs = jobs or config.get('generation.batch.max_workers', 4)
     
-    with console.status(f"Generating test cases with {model_manager.get_current_model_name()}..."):
-        try:
-            test_cases = generator.generate(input_text)
-            
-            if not output:
-                output = f"{config.get('output.directory', './output')}/test_cases.{format or 'md'}"
-            
-            saved_path = generator.save_to_file(test_cases, output, format, "Test Cases")
-            
-            console.print(f"[green]✓[/green] Test cases generated: {saved_path}")
-            console.print(f"   Encoding: {config.get('output.encoding', 'utf-8')}")
-            console.print(f"   Cases: {len(test_cases)}")
-            
-        except Exception as e:
-            console.print(f"[red]✗[/red] Error: {str(e)}")
+    with BatchManifest(_manifest_path(config, manifest, output_dir)) as batch_manifest:
+        runner = BatchRunner(config, model_manager, batch_manifest, jobs, chunk_tokens)
+        units = runner.plan(list(input_files), list(doc_types or GENERATOR_TYPES), output_dir)
+        console.print(f"Batch: {len(units)} units ({sum(map(runner.is_done, units))} already done) "
+                      f"with {model_manager.get_current_model_name()}, {jobs} parallel")
+        counts = _run_batch(runner, units)
+    
+    if counts['failed']:
+        console.print("[yellow]⚠[/yellow] Rerun the same command or 'ai-dev batch retry' to retry failed units")
+        ctx.exit(1)
+
+
+@batch.command('retry')
+@click.option('--output-dir', '-d', type=click.Path(file_okay=False),
+              help='Output directory holding the manifest (default: output.directory)')
+@click.option('--manifest', '-m', type=click.Path(exists=True, dir_okay=False),
+              help='Manifest file (default: generation.batch.manifest in the output directory)')
+@click.option('--jobs', '-j', type=click.IntRange(min=1),
+              help='Units generated at the same time (default: generation.batch.max_workers)')
+@click.pass_context
+def batch_retry(ctx, output_dir, manifest, jobs):
+    """Rerun only the failed units recorded in a manifest"""
+    from .batch import BatchManifest, BatchRunner
+    from .batch.manifest import FAILED
+    
+    config = ctx.obj['config']
+    model_manager = ctx.obj['model_manager']
+    path = _manifest_path(config, manifest, output_dir)
+    if not Path(path).exists():
+        console.print(f"[red]✗[/red] No batch manifest at {path}")
+        ctx.exit(1)
+    
+    with BatchManifest(path) as batch_manifest:
+        failed = batch_manifest.units(FAILED)
+        model = model_manager.get_current_model_name() or 'default'
+        units = [unit for unit in failed if unit['model'] == model]
+        if len(units) < len(failed):
+            others = sorted({unit['model'] for unit in failed} - {model})
+            console.print(f"[yellow]⚠[/yellow] {len(failed) - len(units)} failed units were run with "
+                          f"{', '.join(others)}; retry them with --ai")
+        if not units:
+            console.print("[green]✓[/green] No failed units to retry")
+            return
+        
+        runner = BatchRunner(config, model_manager, batch_manifest,
+                             jobs or config.get('generation.batch.max_workers', 4))
+        counts = _run_batch(runner, units)
+    
+    if counts['failed']:
+        ctx.exit(1)
+
+
+@batch.command('status')
+@click.option('--output-dir', '-d', type=click.Path(file_okay=False),
+              help='Output directory holding the manifest (default: output.directory)')
+@click.option('--manifest', '-m', type=click.Path(exists=True, dir_okay=False),
+              help='Manifest file (default: generation.batch.manifest in the output directory)')
+@click.pass_context
+def batch_status(ctx, output_dir, manifest):
+    """Show how many units are done, pending and failed"""
+    from .batch import BatchManifest
+    from .batch.manifest import FAILED
+    
+    path = _manifest_path(ctx.obj['config'], manifest, output_dir)
+    if not Path(path).exists():
+        console.print(f"[red]✗[/red] No batch manifest at {path}")
+        ctx.exit(1)
+    
+    with BatchManifest(path) as batch_manifest:
+        counts = batch_manifest.counts()
+        failed = batch_manifest.units(FAILED)
+    
+    console.print(f"Manifest: {path}")
+    for status in ('done', 'pending', 'running', 'failed'):
+        console.print(f"   {status}: {counts.get(status, 0)}")
+    if counts.get('running'):
+        console.print("[dim]   (running units were interrupted and resume on the next run)[/dim]")
+    for unit in failed:
+        console.print(f"[red]✗[/red] {unit['input_path']} ({unit['generator']}, {unit['model']}, "
+                      f"{unit['attempts']} attempts): {unit['error']}")
 
 
 @cli.group()
@@ -399,6 +901,328 @@ def config_set(ctx, key, value):
     console.print(f"[green]✓[/green] Set {key} = {value}")
 
 
+@cli.group('cache')
+@click.pass_context
+def cache(ctx):
+    """Manage the AI response and file analysis caches"""
+    pass
+
+
+@cache.command('info')
+@click.pass_context
+def cache_info(ctx):
+    """Show response and analysis cache statistics"""
+    from rich.table import Table
+    from .analyzers.cache import analysis_cache
+    
+    caches = [("Response Cache", ctx.obj['model_manager'].response_cache),
+              ("Analysis Cache", analysis_cache())]
+    for title, store in caches:
+        table = Table(title=title)
+        table.add_column("Setting", style="cyan", no_wrap=True)
+        table.add_column("Value", style="magenta")
+        for key, value in store.info().items():
+            table.add_row(key, str(value))
+        
+        console.print(table)
+
+
+@cache.command('clear')
+@click.option('--responses', 'only', flag_value='responses',
+              help='Only remove cached AI responses')
+@click.option('--analysis', 'only', flag_value='analysis',
+              help='Only remove cached file analyses')
+@click.pass_context
+def cache_clear(ctx, only):
+    """Remove cached AI responses and file analyses"""
+    from .analyzers.cache import analysis_cache
+    
+    if only != 'analysis':
+        removed = ctx.obj['model_manager'].response_cache.clear()
+        console.print(f"[green]✓[/green] Removed {removed} cached responses")
+    if only != 'responses':
+        removed = analysis_cache().clear()
+        console.print(f"[green]✓[/green] Removed {removed} cached analyses")
+
+
+def _duration(value) -> str:
+    """Format seconds as ms below one second"""
+    if value is None:
+        return "-"
+    return f"{value:.2f}s" if value >= 1 else f"{value * 1000:.0f}ms"
+
+
+def _latency_cells(values):
+    """p50/p95/p99 cells for a list of durations in seconds"""
+    return [_duration(percentile(values, p)) for p in (50, 95, 99)]
+
+
+def _throughput(records) -> str:
+    """Records per minute over the span in which they ran"""
+    if not records:
+        return "-"
+    start = min(r['ts'] - r.get('seconds', 0) for r in records)
+    end = max(r['ts'] for r in records)
+    return f"{len(records) / max(end - start, 1) * 60:.1f}/min"
+
+
+@cli.command('stats')
+@click.option('--days', type=float,
+              help='Only include records from the last N days')
+@click.option('--clear', is_flag=True,
+              help='Delete the metrics log')
+@click.pass_context
+def stats(ctx, days, clear):
+    """Report model call latency, throughput and failure rates"""
+    from rich.table import Table
+    
+    if clear:
+        metrics.clear()
+        console.print("[green]✓[/green] Metrics log cleared")
+        return
+    
+    since = time.time() - days * 86400 if days else None
+    records = metrics.read(since)
+    if not records:
+        console.print(f"[yellow]No metrics recorded yet ({metrics.path})[/yellow]")
+        return
+    
+    # Model calls
+    calls: Dict[str, list] = {}
+    for record in records:
+        if record.get('kind') == 'call':
+            calls.setdefault(f"{record.get('backend')} / {record.get('model')}", []).append(record)
+    
+    table = Table(title="Model Calls")
+    for column in ("Model", "Calls", "Failed", "Timeouts", "Rate limited", "p50", "p95", "p99",
+                   "Throughput", "Avg attempts", "Avg prompt KB"):
+        table.add_column(column, style="cyan" if column == "Model" else None, no_wrap=column == "Model")
+    for name, group in sorted(calls.items()):
+        ok = [r for r in group if r.get('status') == 'ok']
+        failed = len(group) - len(ok)
+        table.add_row(
+            name,
+            str(len(group)),
+            f"{failed} ({failed / len(group):.0%})",
+            str(sum(1 for r in group if r.get('status') == 'timeout')),
+            str(sum(1 for r in group if r.get('status') == 'rate_limited') + sum(r.get('requeues', 0) for r in group)),
+            *_latency_cells([r['seconds'] for r in ok]),
+            _throughput(group),
+            f"{sum(r.get('attempts', 0) for r in group) / len(group):.2f}",
+            f"{sum(r.get('prompt_bytes', 0) for r in group) / len(group) / 1024:.1f}"
+        )
+    console.print(table)
+    
+    # Generators (end-to-end generate commands) and individual stages
+    generators: Dict[str, list] = {}
+    stages: Dict[str, list] = {}
+    for record in records:
+        if record.get('kind') != 'stage':
+            continue
+        if record.get('stage') == 'generate':
+            generators.setdefault(record.get('generator', '?'), []).append(record)
+        stages.setdefault(record.get('stage', '?'), []).append(record)
+    
+    if generators:
+        table = Table(title="Generators")
+        for column in ("Generator", "Runs", "Failed", "p50", "p95", "p99", "Throughput", "Avg items"):
+            table.add_column(column, style="cyan" if column == "Generator" else None, no_wrap=column == "Generator")
+        for name, group in sorted(generators.items()):
+            ok = [r for r in group if r.get('status') == 'ok']
+            failed = len(group) - len(ok)
+            table.add_row(
+                name,
+                str(len(group)),
+                f"{failed} ({failed / len(group):.0%})",
+                *_latency_cells([r['seconds'] for r in ok]),
+                _throughput(group),
+                f"{sum(r.get('items', 0) for r in ok) / len(ok):.1f}" if ok else "-"
+            )
+        console.print(table)
+    
+    table = Table(title="Stages")
+    for column in ("Stage", "Count", "Failed", "p50", "p95", "p99"):
+        table.add_column(column, style="cyan" if column == "Stage" else None, no_wrap=column == "Stage")
+    for name, group in sorted(stages.items()):
+        table.add_row(
+            name,
+            str(len(group)),
+            str(sum(1 for r in group if r.get('status') != 'ok')),
+            *_latency_cells([r['seconds'] for r in group])
+        )
+    console.print(table)
+
+
+@cli.command('serve')
+@click.option('--socket', 'socket_path', type=click.Path(dir_okay=False), envvar='AI_DEV_SOCKET',
+              help='Unix socket to listen on (default: $AI_DEV_SOCKET or ~/.cache/ai-dev/ai-dev.sock)')
+@click.option('--workers', '-w', type=click.IntRange(min=1), default=4, show_default=True,
+              help='Jobs run at the same time')
+@click.pass_context
+def serve(ctx, socket_path, workers):
+    """Run a warm worker daemon for ai-dev-client"""
+    from .server import WorkerDaemon, serve as run_server
+    
+    model_manager = ctx.obj['model_manager']
+    daemon = WorkerDaemon(ctx.obj['config'], workers=workers, verbose=ctx.obj['verbose'],
+                          model_name=model_manager.current_model_name if not model_manager.pool_mode else None,
+                          pool=model_manager.pool_mode)
+    
+    def ready(path):
+        console.print(f"[green]✓[/green] ai-dev serve listening on {path} "
+                      f"({workers} workers, model: {daemon.model_manager({}).get_current_model_name()})")
+        console.print("   Submit jobs with: ai-dev-client generate requirements input.txt")
+    
+    try:
+        run_server(daemon, socket_path, on_ready=ready)
+    except RuntimeError as e:
+        console.print(f"[red]✗[/red] {e}")
+        ctx.exit(1)
+    console.print("[green]✓[/green] ai-dev serve stopped")
+
+
+@cli.group()
+@click.pass_context
+def bench(ctx):
+    """Benchmark ai-dev offline against stub model CLIs"""
+    pass
+
+
+@bench.command('pipeline')
+@click.option('--generator', '-g', 'generator_types', multiple=True,
+              type=click.Choice(list(GENERATOR_TYPES)),
+              help='Generator to benchmark (repeatable, default: all)')
+@click.option('--format', '-f', 'formats', multiple=True,
+              type=click.Choice(['json', 'csv', 'md', 'html']),
+              help='Output format (repeatable, default: all)')
+@click.option('--encoding', '-e', 'encodings', multiple=True,
+              type=click.Choice(['shift-jis', 'utf-8', 'cp932']),
+              help='Output encoding (repeatable, default: utf-8 and shift-jis)')
+@click.option('--backend', type=click.Choice(['gemini', 'claude']), default='gemini',
+              help='Which CLI wrapper drives the stub')
+@click.option('--runs', type=click.IntRange(min=1), default=1,
+              help='Repetitions of every combination')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=4,
+              help='Combinations run in parallel')
+@click.option('--latency', type=float, default=0.5,
+              help='Stub response latency in seconds')
+@click.option('--jitter', type=float, default=0.2,
+              help='Stub latency jitter as a fraction of --latency')
+@click.option('--failure-rate', type=click.FloatRange(0, 1), default=0.0,
+              help='Probability that a stub call fails')
+@click.option('--failure-kind', type=click.Choice(['error', 'rate_limit', 'hang']), default='error',
+              help='How failing stub calls fail')
+@click.option('--items', type=click.IntRange(min=0), default=5,
+              help='Items per stub response')
+@click.option('--item-bytes', type=click.IntRange(min=0), default=200,
+              help='Approximate size of each stub item')
+@click.option('--input', 'input_file', type=click.Path(exists=True),
+              help='Input document (default: built-in synthetic text)')
+@click.option('--cache', 'use_cache', is_flag=True,
+              help='Enable the response cache (in a temporary directory)')
+@click.option('--json', 'json_output', type=click.Path(),
+              help='Also write the report as JSON')
+@click.pass_context
+def bench_pipeline(ctx, generator_types, formats, encodings, backend, runs, jobs, latency, jitter,
+                   failure_rate, failure_kind, items, item_bytes, input_file, use_cache, json_output):
+    """Run every generator, format and encoding through a stub CLI"""
+    import json
+    from rich.table import Table
+    from .bench import run_pipeline_benchmark
+    from .generators import get_generator
+    
+    generators = {name: get_generator(name) for name in (generator_types or GENERATOR_TYPES)}
+    input_text = read_input(input_file)[0] if input_file else None
+    stub_settings = {
+        'latency': latency, 'jitter': jitter, 'failure_rate': failure_rate,
+        'failure_kind': failure_kind, 'items': items, 'item_bytes': item_bytes
+    }
+    
+    formats = list(formats or ['md', 'csv', 'json', 'html'])
+    encodings = list(encodings or ['utf-8', 'shift-jis'])
+    total = len(generators) * len(formats) * len(encodings) * runs
+    with console.status(f"Benchmarking {total} generations against the stub {backend} CLI..."):
+        report = run_pipeline_benchmark(
+            ctx.obj['config'], generators, formats=formats, encodings=encodings,
+            backend=backend, runs=runs, jobs=jobs, input_text=input_text,
+            stub_settings=stub_settings, use_cache=use_cache
+        )
+    
+    table = Table(title="Pipeline Benchmark")
+    for column in ("Generator", "Format", "Encoding", "Runs", "Failed", "p50", "p95", "Items/s"):
+        table.add_column(column, style="cyan" if column == "Generator" else None)
+    for case in report['cases']:
+        table.add_row(
+            case['generator'], case['format'], case['encoding'], str(case['runs']), str(case['failures']),
+            _duration(case['p50']), _duration(case['p95']), f"{case['items_per_second']:.1f}"
+        )
+    console.print(table)
+    
+    table = Table(title="Stages")
+    for column in ("Stage", "Count", "Total", "p50", "p95"):
+        table.add_column(column, style="cyan" if column == "Stage" else None)
+    for stage in report['stages']:
+        table.add_row(stage['stage'], str(stage['count']), f"{stage['total']:.2f}s",
+                      _duration(stage['p50']), _duration(stage['p95']))
+    console.print(table)
+    
+    console.print(f"Runs: {report['total_runs']} ({report['failures']} failed) in {report['wall_seconds']:.2f}s "
+                  f"= {report['runs_per_second']:.2f} runs/s")
+    console.print(f"ai-dev overhead outside the CLI call: {report['overhead_seconds']:.2f}s "
+                  f"({report['overhead_share']:.1%} of generation time)")
+    
+    if json_output:
+        Path(json_output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+        console.print(f"[green]✓[/green] Report written to {json_output}")
+
+
+@bench.command('startup')
+@click.option('--runs', type=click.IntRange(min=1), default=5,
+              help='Interpreter starts per command')
+@click.option('--budget-ms', type=click.IntRange(min=1), default=STARTUP_BUDGET_MS,
+              help='Fail if any command\'s median start time exceeds this')
+@click.option('--json', 'json_output', type=click.Path(),
+              help='Also write the report as JSON')
+@click.pass_context
+def bench_startup(ctx, runs, budget_ms, json_output):
+    """Time light commands in a fresh interpreter and check no heavy module loads"""
+    import json
+    from rich.table import Table
+    from .bench import run_startup_benchmark
+    
+    with console.status("Timing CLI startup..."):
+        report = run_startup_benchmark(runs=runs, config_path=ctx.obj['config'].config_path)
+    
+    table = Table(title="CLI Startup")
+    for column in ("Command", "Runs", "p50", "Min", "Max", "Heavy modules"):
+        table.add_column(column, style="cyan" if column == "Command" else None)
+    for command in report['commands']:
+        table.add_row(f"ai-dev {command['command']}", str(command['runs']), _duration(command['p50']),
+                      _duration(command['min']), _duration(command['max']),
+                      ", ".join(command['heavy_modules']) or "-")
+    console.print(table)
+    console.print(f"Bare interpreter start: {_duration(report['interpreter_p50'])}")
+    
+    if json_output:
+        Path(json_output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+        console.print(f"[green]✓[/green] Report written to {json_output}")
+    
+    failed = False
+    if report['heavy_modules']:
+        console.print(f"[red]✗[/red] Heavy modules loaded at startup: {', '.join(report['heavy_modules'])}")
+        failed = True
+    if report['slowest_p50'] * 1000 > budget_ms:
+        console.print(f"[red]✗[/red] Slowest command took {report['slowest_p50'] * 1000:.0f}ms "
+                      f"(budget {budget_ms}ms)")
+        failed = True
+    if any(command['failures'] for command in report['commands']):
+        console.print("[red]✗[/red] Some commands did not run to completion")
+        failed = True
+    if failed:
+        ctx.exit(1)
+    console.print(f"[green]✓[/green] Startup within {budget_ms}ms budget")
+
+
 @cli.group()
 @click.pass_context
 def analyze(ctx):
@@ -416,8 +1240,19 @@ def analyze(ctx):
               help='Output format')
 @click.option('--extract-text', is_flag=True,
               help='Extract only text content')
+@click.option('--workers', '-w', type=click.IntRange(min=0),
+              help='Processes extracting PDF pages / PowerPoint slides (default/0: one per CPU, 1: serial)')
+@click.option('--pages', '-p',
+              help='PDF pages to analyze, e.g. 1-50 or 1-10,20-')
+@click.option('--summary-only', is_flag=True,
+              help='PDF: stop reading once the summary is complete')
+@click.option('--text-output', type=click.Path(),
+              help='Also write the extracted text to this file during the same pass')
+@click.option('--full-text', is_flag=True,
+              help='PDF: include the full extracted text in the report (PowerPoint reports always do)')
 @click.pass_context
-def analyze_file(ctx, input_file, output, format, extract_text):
+def analyze_file(ctx, input_file, output, format, extract_text, workers, pages, summary_only, text_output,
+                 full_text):
     """Analyze various file formats (txt, md, pptx, xlsx, csv, pdf)"""
     from pathlib import Path
     import json
@@ -425,30 +1260,34 @@ def analyze_file(ctx, input_file, output, format, extract_text):
     file_path = Path(input_file)
     file_ext = file_path.suffix.lower()
     
-    # Select appropriate analyzer
-    analyzer = None
-    if file_ext in ['.txt', '.md']:
-        analyzer = TextAnalyzer()
-        analyzer_name = "Text"
-    elif file_ext in ['.pptx']:
-        analyzer = PPTAnalyzer()
-        analyzer_name = "PowerPoint"
-    elif file_ext in ['.xlsx', '.xls', '.csv']:
-        analyzer = SpreadsheetAnalyzer()
-        analyzer_name = "Spreadsheet"
-    elif file_ext == '.pdf':
-        analyzer = PDFAnalyzer()
-        analyzer_name = "PDF"
-    else:
+    # Select appropriate analyzer; only its backend (pandas, PyPDF2, ...) is imported
+    from .analyzers import get_analyzer, supported_extensions
+    from .analyzers.report import format_analysis_markdown, format_analysis_text
+    
+    try:
+        analyzer, analyzer_name = get_analyzer(str(file_path))
+    except ValueError:
         console.print(f"[red]✗[/red] Unsupported file type: {file_ext}")
-        console.print("Supported formats: .txt, .md, .pptx, .xlsx, .xls, .csv, .pdf")
+        console.print(f"Supported formats: {', '.join(supported_extensions())}")
         return
+    if workers is not None and hasattr(analyzer, 'workers'):
+        analyzer.workers = workers
+    streams_pages = hasattr(analyzer, 'iter_pages')
+    if (pages or summary_only) and not streams_pages:
+        console.print("[red]✗[/red] --pages and --summary-only are only supported for PDF files")
+        return
+    if summary_only and (text_output or full_text):
+        console.print("[red]✗[/red] --text-output and --full-text read every page; "
+                      "they cannot be combined with --summary-only")
+        return
+    page_options = {'pages': pages} if streams_pages else {}
+    report_options = {'full_text': full_text} if streams_pages else {}
     
     with console.status(f"Analyzing {analyzer_name} file..."):
         try:
             if extract_text:
                 # Extract text only
-                result = analyzer.extract_text(str(file_path))
+                result = analyzer.extract_text_cached(str(file_path), **page_options)
                 console.print(f"[green]✓[/green] Text extracted from {input_file}")
                 
                 if output:
@@ -462,8 +1301,19 @@ def analyze_file(ctx, input_file, output, format, extract_text):
                         console.print("... (truncated)")
             else:
                 # Full analysis
-                result = analyzer.analyze(str(file_path))
+                if text_output and streams_pages:
+                    # Report and text come from one pass over the pages
+                    with open(text_output, 'w', encoding='utf-8') as f:
+                        result = analyzer.analyze(str(file_path), pages=pages, text_output=f, **report_options)
+                else:
+                    result = analyzer.analyze_cached(str(file_path), summary_only=summary_only,
+                                                     **page_options, **report_options)
+                    if text_output:
+                        with open(text_output, 'w', encoding='utf-8') as f:
+                            f.write(analyzer.extract_text_cached(str(file_path)))
                 console.print(f"[green]✓[/green] {analyzer_name} file analyzed")
+                if text_output:
+                    console.print(f"   Text saved to: {text_output}")
                 
                 # Format output
                 if format == 'json':
@@ -482,9 +1332,9 @@ def analyze_file(ctx, input_file, output, format, extract_text):
                     
                     output_content = json.dumps(result, ensure_ascii=False, indent=2, cls=NumpyEncoder)
                 elif format in ['md', 'markdown']:
-                    output_content = _format_analysis_markdown(result, analyzer_name)
+                    output_content = format_analysis_markdown(result, analyzer_name)
                 else:  # text
-                    output_content = _format_analysis_text(result, analyzer_name)
+                    output_content = format_analysis_text(result, analyzer_name)
                 
                 if output:
                     with open(output, 'w', encoding='utf-8') as f:
@@ -508,61 +1358,5 @@ def analyze_file(ctx, input_file, output, format, extract_text):
                 traceback.print_exc()
 
 
-def _format_analysis_markdown(analysis: Dict[str, Any], analyzer_type: str) -> str:
-    """Format analysis results as Markdown"""
-    lines = [f"# {analyzer_type} Analysis Report\n"]
-    
-    # File info
-    if 'file_info' in analysis:
-        lines.append("## File Information")
-        for key, value in analysis['file_info'].items():
-            lines.append(f"- **{key}**: {value}")
-        lines.append("")
-    
-    # Statistics
-    if 'statistics' in analysis:
-        lines.append("## Statistics")
-        for key, value in analysis['statistics'].items():
-            lines.append(f"- **{key}**: {value}")
-        lines.append("")
-    
-    # Summary
-    if 'summary' in analysis:
-        lines.append("## Summary")
-        lines.append(analysis['summary'])
-        lines.append("")
-    
-    # Content preview
-    if 'full_text' in analysis:
-        lines.append("## Content Preview")
-        lines.append("```")
-        lines.append(analysis['full_text'][:1000])
-        if len(analysis['full_text']) > 1000:
-            lines.append("... (truncated)")
-        lines.append("```")
-    
-    return '\n'.join(lines)
-
-
-def _format_analysis_text(analysis: Dict[str, Any], analyzer_type: str) -> str:
-    """Format analysis results as plain text"""
-    lines = [f"{analyzer_type} Analysis Report", "=" * 50, ""]
-    
-    def format_dict(d, indent=0):
-        result = []
-        for key, value in d.items():
-            if isinstance(value, dict):
-                result.append(" " * indent + f"{key}:")
-                result.extend(format_dict(value, indent + 2))
-            elif isinstance(value, list):
-                result.append(" " * indent + f"{key}: [{len(value)} items]")
-            else:
-                result.append(" " * indent + f"{key}: {value}")
-        return result
-    
-    lines.extend(format_dict(analysis))
-    return '\n'.join(lines)
-
-
 if __name__ == '__main__':
     cli()
\ No newline at end of file
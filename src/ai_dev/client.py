@@ -0,0 +1,126 @@
+"""Thin client for the 'ai-dev serve' worker daemon
+
+Only the standard library is imported here, so submitting a job costs a
+socket round-trip instead of loading pandas, rich and the model wrappers.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+DEFAULT_SOCKET = '~/.cache/ai-dev/ai-dev.sock'
+SOCKET_ENV = 'AI_DEV_SOCKET'
+
+GENERATOR_CHOICES = ['requirements', 'qa', 'tasks', 'test-concept', 'test-cases']
+
+
+class ServerNotRunning(RuntimeError):
+    """Nothing is listening on the daemon socket"""
+
+
+def resolve_socket(path: Optional[str] = None) -> Path:
+    """Socket path from the argument, $AI_DEV_SOCKET or the default"""
+    return Path(path or os.environ.get(SOCKET_ENV) or DEFAULT_SOCKET).expanduser()
+
+
+def request(message: Dict[str, Any], socket_path: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Send one job and yield the events the daemon streams back"""
+    path = resolve_socket(socket_path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except (FileNotFoundError, ConnectionRefusedError) as e:
+        sock.close()
+        raise ServerNotRunning(f"ai-dev serve is not running on {path}") from e
+
+    with sock, sock.makefile('r', encoding='utf-8') as events:
+        sock.sendall(json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n')
+        for line in events:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _absolute(path: Optional[str]) -> Optional[str]:
+    return os.path.abspath(path) if path else None
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='ai-dev-client',
+                                     description='Submit ai-dev jobs to a running "ai-dev serve" daemon')
+    parser.add_argument('--socket', help=f'Daemon socket (default: ${SOCKET_ENV} or {DEFAULT_SOCKET})')
+    parser.add_argument('--ai', '-a', choices=['gemini', 'claude'], help='AI model to use')
+    parser.add_argument('--pool', action='store_true', help='Route requests across all available AI models')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the AI response cache')
+    parser.add_argument('--refresh', action='store_true', help='Ignore cached AI responses and store fresh ones')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Print streamed items')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', help='Generate documents')
+    generate.add_argument('doc_type', choices=GENERATOR_CHOICES)
+    generate.add_argument('input_file')
+    generate.add_argument('--output', '-o', help='Output file path')
+    generate.add_argument('--format', '-f', choices=['json', 'csv', 'md', 'markdown', 'html'])
+    generate.add_argument('--encoding', '-e', choices=['shift-jis', 'utf-8', 'cp932'])
+    generate.add_argument('--chunked', action='store_true')
+    generate.add_argument('--chunk-tokens', type=int)
+    generate.add_argument('--stream', action='store_true')
+    generate.add_argument('--force', action='store_true')
+
+    analyze = commands.add_parser('analyze', help='Analyze files and extract information')
+    analyze_commands = analyze.add_subparsers(dest='analyze_command', required=True)
+    analyze_file = analyze_commands.add_parser('file', help='Analyze one file')
+    analyze_file.add_argument('input_file')
+    analyze_file.add_argument('--output', '-o')
+    analyze_file.add_argument('--format', '-f', choices=['json', 'text', 'md', 'markdown'], default='md')
+    analyze_file.add_argument('--extract-text', action='store_true')
+
+    commands.add_parser('status', help='Show daemon status')
+    commands.add_parser('shutdown', help='Stop the daemon after running jobs finish')
+    return parser
+
+
+def _message(args: argparse.Namespace) -> Dict[str, Any]:
+    """Translate parsed arguments into a daemon job"""
+    options: Dict[str, Any] = {'ai': args.ai, 'pool': args.pool,
+                               'no_cache': args.no_cache, 'refresh': args.refresh}
+    if args.command == 'generate':
+        options.update(doc_type=args.doc_type, input_file=_absolute(args.input_file),
+                       output=_absolute(args.output), format=args.format, encoding=args.encoding,
+                       chunked=args.chunked, chunk_tokens=args.chunk_tokens, stream=args.stream,
+                       force=args.force)
+    elif args.command == 'analyze':
+        options.update(input_file=_absolute(args.input_file), output=_absolute(args.output),
+                       format=args.format, extract_text=args.extract_text)
+    return {'command': args.command, 'cwd': os.getcwd(), 'options': options}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if getattr(args, 'input_file', None) and not os.path.exists(args.input_file):
+        print(f"Error: path '{args.input_file}' does not exist", file=sys.stderr)
+        return 2
+
+    status = 1
+    try:
+        for event in request(_message(args), args.socket):
+            kind = event.get('event')
+            if kind == 'message':
+                print(event['text'], file=sys.stderr if event.get('stderr') else sys.stdout, flush=True)
+            elif kind == 'item' and args.verbose:
+                print(json.dumps(event['item'], ensure_ascii=False), flush=True)
+            elif kind == 'done':
+                status = 0 if event.get('ok') else 1
+    except ServerNotRunning as e:
+        print(f"✗ {e} (start it with 'ai-dev serve')", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        return 130
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,13 @@
 """Configuration Management Module"""
 
 from .manager import ConfigManager
-from .schemas import ConfigSchema, GenerationConfig, OutputConfig
 
-__all__ = ["ConfigManager", "ConfigSchema", "GenerationConfig", "OutputConfig"]
\ No newline at end of file
+__all__ = ["ConfigManager", "ConfigSchema", "GenerationConfig", "OutputConfig"]
+
+
+def __getattr__(name):
+    # The pydantic schemas are only needed for validation
+    if name in ("ConfigSchema", "GenerationConfig", "OutputConfig"):
+        from . import schemas
+        return getattr(schemas, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
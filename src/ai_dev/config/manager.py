@@ -4,7 +4,6 @@ import yaml
 import json
 from pathlib import Path
 from typing import Any, Dict, Optional
-from .schemas import ConfigSchema
 
 
 class ConfigManager:
@@ -49,13 +48,28 @@ class ConfigManager:
                         "available": ["gemini-2.5-pro", "gemini-2.5-flash", "gemini-2.5-flash-lite"]
                     },
                     "options": ["--model=gemini-2.5-pro", "--temperature=0.7", "--max-tokens=8192", "--format=json"],
-                    "timeout": 60
+                    "timeout": 60,
+                    "max_concurrency": 4,
+                    "max_input_tokens": None,
+                    "prompt_transport": "stdin",
+                    "rate_limit": {"requests_per_minute": None, "tokens_per_minute": None, "max_inflight": 4},
+                    "retry": {"max_attempts": 3, "multiplier": 2.0, "hedge": False}
                 },
                 "claude": {
                     "command": "claude-code",
                     "model": "claude-opus-4",
                     "options": ["--temperature=0.7", "--max-tokens=8192"],
-                    "timeout": 60
+                    "timeout": 60,
+                    "max_concurrency": 4,
+                    "max_input_tokens": None,
+                    "prompt_transport": "stdin",
+                    "rate_limit": {"requests_per_minute": None, "tokens_per_minute": None, "max_inflight": 4},
+                    "retry": {"max_attempts": 3, "multiplier": 2.0, "hedge": False}
+                },
+                "pool": {
+                    "enabled": False,
+                    "failure_cooldown": 30,
+                    "members": []
                 }
             },
             "cli_execution": {
@@ -67,6 +81,26 @@ class ConfigManager:
                 "retry_delay": 2
             },
             "generation": {
+                "chunking": {
+                    "max_tokens": 8000,
+                    "max_workers": 4
+                },
+                "packing": {
+                    "max_tokens": 6000,
+                    "max_files": 20,
+                    "max_workers": 4
+                },
+                "batch": {
+                    "manifest": ".ai-dev-batch.db",
+                    "max_workers": 4,
+                    "extensions": [".txt", ".md", ".markdown"]
+                },
+                "compaction": {
+                    "enabled": True,
+                    "fold_width": True,
+                    "collapse_duplicate_lines": True,
+                    "strip_boilerplate": True
+                },
                 "requirements": {
                     "columns": [
                         {"id": "要件ID"},
@@ -115,12 +149,28 @@ class ConfigManager:
                 "directory": "./output",
                 "timestamp": True
             },
+            "cache": {
+                "enabled": True,
+                "directory": "~/.cache/ai-dev/responses",
+                "max_size_mb": 512,
+                "ttl": None
+            },
+            "metrics": {
+                "enabled": True,
+                "file": "~/.cache/ai-dev/metrics.jsonl",
+                "max_size_mb": 50
+            },
             "analysis": {
                 "extract_images": True,
                 "extract_tables": True,
                 "max_file_size": "50MB",
                 "input_encoding": "auto",
-                "supported_formats": [".pptx", ".xlsx", ".csv", ".txt", ".md"]
+                "supported_formats": [".pptx", ".xlsx", ".csv", ".txt", ".md"],
+                "cache": {
+                    "enabled": True,
+                    "directory": "~/.cache/ai-dev/analysis",
+                    "max_size_mb": 256
+                }
             }
         }
     
@@ -168,6 +218,8 @@ class ConfigManager:
     
     def validate(self) -> bool:
         """Validate configuration against schema"""
+        from .schemas import ConfigSchema  # pydantic is slow to import; only needed here
+        
         try:
             ConfigSchema(**self.config_data)
             return True
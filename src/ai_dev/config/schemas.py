@@ -18,8 +18,40 @@ class GenerationTypeConfig(BaseModel):
     template: Optional[str] = None
 
 
+class ChunkingConfig(BaseModel):
+    """Chunked (map-reduce) generation configuration"""
+    max_tokens: int = 8000
+    max_workers: int = 4
+
+
+class PackingConfig(BaseModel):
+    """Packing of many small inputs into one model call"""
+    max_tokens: int = 6000
+    max_files: int = 20
+    max_workers: int = 4
+
+
+class BatchConfig(BaseModel):
+    """Resumable batch generation"""
+    manifest: str = ".ai-dev-batch.db"
+    max_workers: int = 4
+    extensions: List[str] = [".txt", ".md", ".markdown"]
+
+
+class CompactionConfig(BaseModel):
+    """Input compaction applied before prompts are built"""
+    enabled: bool = True
+    fold_width: bool = True
+    collapse_duplicate_lines: bool = True
+    strip_boilerplate: bool = True
+
+
 class GenerationConfig(BaseModel):
     """Generation settings configuration"""
+    chunking: ChunkingConfig = ChunkingConfig()
+    packing: PackingConfig = PackingConfig()
+    batch: BatchConfig = BatchConfig()
+    compaction: CompactionConfig = CompactionConfig()
     requirements: GenerationTypeConfig
     qa: GenerationTypeConfig
     tasks: GenerationTypeConfig
@@ -37,6 +69,27 @@ class OutputConfig(BaseModel):
     timestamp: bool = True
 
 
+class RetryConfig(BaseModel):
+    """Retry and request hedging configuration"""
+    deadline: Optional[int] = None  # Defaults to timeout * max_attempts
+    max_attempts: int = 3
+    multiplier: float = 2.0
+    hedge: bool = False
+    hedge_percentile: float = 0.9
+    hedge_min_samples: int = 5
+    latency_file: str = "~/.cache/ai-dev/latency.json"
+
+
+class RateLimitConfig(BaseModel):
+    """Per-backend rate limit configuration (shared across processes)"""
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+    max_inflight: Optional[int] = None
+    max_requeues: int = 5
+    backoff: float = 10.0
+    directory: str = "~/.cache/ai-dev/ratelimit"
+
+
 class AIModelConfig(BaseModel):
     """AI Model configuration"""
     command: str
@@ -44,6 +97,18 @@ class AIModelConfig(BaseModel):
     models: Optional[Dict[str, Any]] = None
     options: List[str] = []
     timeout: int = 60
+    max_concurrency: int = 4  # Concurrent async calls per model
+    max_input_tokens: Optional[int] = None  # Budget for the compacted input text
+    prompt_transport: str = "stdin"  # stdin or argv
+    retry: RetryConfig = RetryConfig()
+    rate_limit: RateLimitConfig = RateLimitConfig()
+
+
+class PoolConfig(BaseModel):
+    """Multi-model pool configuration"""
+    enabled: bool = False
+    failure_cooldown: float = 30  # Seconds, doubled per consecutive failure
+    members: List[str] = []  # "claude", "gemini:gemini-2.5-flash"; empty = all configured
 
 
 class AIModelsConfig(BaseModel):
@@ -51,6 +116,7 @@ class AIModelsConfig(BaseModel):
     default: str = "gemini"
     gemini: Optional[AIModelConfig] = None
     claude: Optional[AIModelConfig] = None
+    pool: PoolConfig = PoolConfig()
 
 
 class CLIExecutionConfig(BaseModel):
@@ -63,6 +129,28 @@ class CLIExecutionConfig(BaseModel):
     retry_delay: int = 2
 
 
+class CacheConfig(BaseModel):
+    """Response cache configuration"""
+    enabled: bool = True
+    directory: str = "~/.cache/ai-dev/responses"
+    max_size_mb: int = 512
+    ttl: Optional[int] = None  # seconds, None = never expire
+
+
+class MetricsConfig(BaseModel):
+    """Call and stage metrics log configuration"""
+    enabled: bool = True
+    file: str = "~/.cache/ai-dev/metrics.jsonl"
+    max_size_mb: float = 50
+
+
+class AnalysisCacheConfig(BaseModel):
+    """Analyzer result cache configuration"""
+    enabled: bool = True
+    directory: str = "~/.cache/ai-dev/analysis"
+    max_size_mb: int = 256
+
+
 class AnalysisConfig(BaseModel):
     """File analysis configuration"""
     extract_images: bool = True
@@ -70,6 +158,7 @@ class AnalysisConfig(BaseModel):
     max_file_size: str = "50MB"
     input_encoding: str = "auto"
     supported_formats: List[str] = [".pptx", ".xlsx", ".csv", ".txt", ".md"]
+    cache: AnalysisCacheConfig = AnalysisCacheConfig()
 
 
 class ProjectConfig(BaseModel):
@@ -87,4 +176,6 @@ class ConfigSchema(BaseModel):
     cli_execution: CLIExecutionConfig = CLIExecutionConfig()
     generation: GenerationConfig
     output: OutputConfig = OutputConfig()
+    cache: CacheConfig = CacheConfig()
+    metrics: MetricsConfig = MetricsConfig()
     analysis: AnalysisConfig = AnalysisConfig()
\ No newline at end of file
@@ -1,17 +1,50 @@
 """Document generator modules"""
 
-from .base import GeneratorBase
-from .requirements import RequirementsGenerator
-from .qa import QAGenerator
-from .tasks import TasksGenerator
-from .test_concept import TestConceptGenerator
-from .test_cases import TestCasesGenerator
+import importlib
+
+from .base import GeneratorBase, PackedGenerationError, PartialGenerationError
+
+# Document type -> (module, class name); imported on first use
+GENERATOR_CLASSES = {
+    "requirements": (".requirements", "RequirementsGenerator"),
+    "qa": (".qa", "QAGenerator"),
+    "tasks": (".tasks", "TasksGenerator"),
+    "test-concept": (".test_concept", "TestConceptGenerator"),
+    "test-cases": (".test_cases", "TestCasesGenerator")
+}
+
+# Document type -> (default output name, document title)
+GENERATOR_TYPES = {
+    "requirements": ("requirements", "Requirements"),
+    "qa": ("qa", "QA Document"),
+    "tasks": ("tasks", "Task List"),
+    "test-concept": ("test_concept", "Test Concept"),
+    "test-cases": ("test_cases", "Test Cases")
+}
 
 __all__ = [
     "GeneratorBase",
+    "PackedGenerationError",
+    "PartialGenerationError",
     "RequirementsGenerator",
     "QAGenerator",
     "TasksGenerator",
     "TestConceptGenerator",
-    "TestCasesGenerator"
-]
\ No newline at end of file
+    "TestCasesGenerator",
+    "GENERATOR_CLASSES",
+    "GENERATOR_TYPES",
+    "get_generator"
+]
+
+
+def get_generator(doc_type: str) -> type:
+    """Generator class for a document type ('requirements', 'qa', ...)"""
+    module, class_name = GENERATOR_CLASSES[doc_type]
+    return getattr(importlib.import_module(module, __package__), class_name)
+
+
+def __getattr__(name):
+    for module, class_name in GENERATOR_CLASSES.values():
+        if name == class_name:
+            return getattr(importlib.import_module(module, __package__), class_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,25 +1,57 @@
 """Base generator class for all document generators"""
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
 from pathlib import Path
 import json
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from ..config.manager import ConfigManager
 from ..ai_models.model_manager import ModelManager
 from ..utils.encoder import EncodingHandler
-from ..utils.formatter import OutputFormatter
+from ..utils.formatter import OutputFormatter, StreamingWriter
+from ..utils.metrics import metrics
+from .chunking import split_into_chunks, merge_items
+from .compaction import CompactionReport, compact_text
+from .fingerprint import TEMPLATE_PLACEHOLDER, digest, text_hash
+from .packing import PACK_INSTRUCTION, build_packed_input, pack_inputs, section_id, split_packed_response
+
+
+class PartialGenerationError(RuntimeError):
+    """A streamed generation stopped early; the items produced so far were saved"""
+    
+    def __init__(self, output_path: str, items_written: int, cause: Exception):
+        self.output_path = output_path
+        self.items_written = items_written
+        self.cause = cause
+        super().__init__(
+            f"{cause} (partial result with {items_written} items saved to {output_path})"
+        )
+
+
+class PackedGenerationError(RuntimeError):
+    """Some packs of a packed generation failed; the other inputs have results"""
+    
+    def __init__(self, results: Dict[str, List[Dict[str, Any]]], errors: Dict[str, Exception]):
+        self.results = results
+        self.errors = errors
+        super().__init__(f"{len(errors)} of {len(results) + len(errors)} inputs failed")
 
 
 class GeneratorBase(ABC):
     """Base class for all document generators"""
     
+    CONFIG_SECTION = ''  # generation.<section> holding this generator's columns and criteria
+    PROMPT_VERSION = 1  # Bump when a prompt changes so fingerprinted outputs are regenerated
+    
     def __init__(self, config: ConfigManager, model_manager: ModelManager):
         self.config = config
         self.model_manager = model_manager
         self.encoder = EncodingHandler()
         self.formatter = OutputFormatter()
+        self.compaction_report: Optional[CompactionReport] = None
+        self._input_compacted = False  # Set while generate_chunked feeds pre-compacted chunks
     
     @abstractmethod
     def generate(self, 
@@ -28,11 +60,180 @@ class GeneratorBase(ABC):
         """Generate document based on input text"""
         pass
     
+    async def agenerate(self,
+                        input_text: str,
+                        context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Generate asynchronously; many generations can share one event loop"""
+        prompt = self.build_prompt(input_text, context)
+        
+        model = self.model_manager.get_current_model()
+        if not model:
+            raise RuntimeError("No AI model configured")
+        
+        response = await model.agenerate(
+            prompt,
+            output_format='json',
+            encoding=self.config.get('output.encoding', 'shift-jis')
+        )
+        
+        return self._format_output(response)
+    
+    def generate_chunked(self,
+                        input_text: str,
+                        context: Optional[Dict[str, Any]] = None,
+                        max_tokens: Optional[int] = None,
+                        max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Generate from inputs larger than the model context (map-reduce)
+
+        The input is split along section/page/slide boundaries under the token
+        budget, each chunk is generated concurrently, and the item lists are
+        merged with duplicates removed and IDs renumbered.
+        """
+        chunk_config = self.config.get('generation.chunking', {})
+        max_tokens = max_tokens or chunk_config.get('max_tokens', 8000)
+        max_workers = max_workers or chunk_config.get('max_workers', 4)
+        
+        # Compact before splitting so chunk sizes reflect what is sent; the
+        # model budget doesn't apply because every chunk gets its own call
+        input_text = self.compact_input(input_text, enforce_budget=False)
+        chunks = split_into_chunks(input_text, max_tokens)
+        
+        self._input_compacted = True
+        try:
+            if len(chunks) == 1:
+                return self.generate(input_text, context)
+            
+            def run(index: int) -> List[Dict[str, Any]]:
+                chunk_context = dict(context or {})
+                chunk_context['入力範囲'] = f"全{len(chunks)}部中の第{index + 1}部（他の部分は別途処理されます）"
+                return self.generate(chunks[index], chunk_context)
+            
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+                results = list(executor.map(run, range(len(chunks))))
+        finally:
+            self._input_compacted = False
+        
+        return merge_items(results)
+    
+    def generate_packed(self,
+                        inputs: Dict[str, str],
+                        max_tokens: Optional[int] = None,
+                        max_files: Optional[int] = None,
+                        max_workers: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Generate for many small inputs with one model call per pack
+
+        Inputs are packed into ID-tagged sections under the token budget and
+        the model is asked to tag every item with its section. Items are split
+        back per input and their IDs renumbered; an input that got no items
+        is generated again on its own. Raises PackedGenerationError (carrying
+        the successful results) if any pack fails.
+        """
+        pack_config = self.config.get('generation.packing', {})
+        max_tokens = max_tokens or pack_config.get('max_tokens', 6000)
+        max_files = max_files or pack_config.get('max_files', 20)
+        max_workers = max_workers or pack_config.get('max_workers', 4)
+        
+        # Compact each input on its own; repeated lines across inputs are not boilerplate
+        compacted = [(name, self.compact_input(text, enforce_budget=False)) for name, text in inputs.items()]
+        packs = pack_inputs(compacted, max_tokens, max_files)
+        
+        def run(pack: List[Tuple[str, str]]) -> Dict[str, List[Dict[str, Any]]]:
+            if len(pack) == 1:
+                name, text = pack[0]
+                return {name: self.generate(text)}
+            
+            items = self.generate(build_packed_input(pack), {'入力形式': PACK_INSTRUCTION})
+            grouped, _ = split_packed_response(items, len(pack))
+            results = {}
+            for index, (name, text) in enumerate(pack):
+                section_items = grouped[section_id(index)]
+                # The model skipped or mislabelled this input: retry it alone
+                results[name] = merge_items([section_items]) if section_items else self.generate(text)
+            return results
+        
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        errors: Dict[str, Exception] = {}
+        self._input_compacted = True
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(packs)))) as executor:
+                futures = {executor.submit(run, pack): pack for pack in packs}
+                for future in as_completed(futures):
+                    try:
+                        results.update(future.result())
+                    except Exception as e:
+                        errors.update((name, e) for name, _ in futures[future])
+        finally:
+            self._input_compacted = False
+        
+        results = {name: results[name] for name in inputs if name in results}
+        if errors:
+            raise PackedGenerationError(results, errors)
+        return results
+    
     @abstractmethod
     def _build_prompt(self, input_text: str, context: Optional[Dict[str, Any]]) -> str:
         """Build prompt for AI model"""
         pass
     
+    def compact_input(self, input_text: str, enforce_budget: bool = True) -> str:
+        """Shrink the input text and apply the model's max_input_tokens budget
+
+        What was removed or trimmed is kept in ``compaction_report``.
+        """
+        options = self.config.get('generation.compaction', {})
+        if not options.get('enabled', True):
+            return input_text
+        
+        budget = None
+        if enforce_budget:
+            model = self.model_manager.get_current_model()
+            budget = getattr(model, 'max_input_tokens', None)
+        
+        with metrics.stage("compaction", generator=type(self).__name__) as stage:
+            text, report = compact_text(input_text, budget, options)
+            stage.update(original_tokens=report.original_tokens,
+                         compacted_tokens=report.compacted_tokens,
+                         trimmed_tokens=report.trimmed_tokens)
+        self.compaction_report = report
+        return text
+    
+    def precompact(self, input_text: str) -> str:
+        """Compact the input ahead of time; later prompts from this generator use it as is
+        
+        Lets a batch compact the next input while other model calls are in flight.
+        """
+        input_text = self.compact_input(input_text)
+        self._input_compacted = True
+        return input_text
+    
+    def fingerprint(self, input_hash: str, format: Optional[str] = None, mode: str = "single") -> Dict[str, Any]:
+        """Everything an output depends on, with a digest over all of it"""
+        model_name, model_options = self.model_manager.model_settings()
+        fields = {
+            "input_sha256": input_hash,
+            "generator": type(self).__name__,
+            "config": self.config.get(f'generation.{self.CONFIG_SECTION}', {}) if self.CONFIG_SECTION else {},
+            "model": model_name,
+            "model_options": model_options,
+            "prompt_version": self.PROMPT_VERSION,
+            "prompt_template": text_hash(self._build_prompt(TEMPLATE_PLACEHOLDER, None)),
+            "compaction": self.config.get('generation.compaction', {}),
+            "output": self._output_settings(format),
+            "mode": mode
+        }
+        fields["digest"] = digest(fields)
+        return fields
+    
+    def build_prompt(self, input_text: str, context: Optional[Dict[str, Any]] = None) -> str:
+        """Build the prompt, recording how long it took in the metrics log"""
+        if not self._input_compacted:
+            input_text = self.compact_input(input_text)
+        
+        with metrics.stage("prompt_build", generator=type(self).__name__) as stage:
+            prompt = self._build_prompt(input_text, context)
+            stage["prompt_bytes"] = len(prompt.encode('utf-8'))
+        return prompt
+    
     def _format_output(self, response: Any) -> List[Dict[str, Any]]:
         """Format AI response into structured output"""
         if isinstance(response, list):
@@ -48,45 +249,98 @@ class GeneratorBase(ABC):
         else:
             return []
     
-    def save_to_file(self, 
-                    data: List[Dict[str, Any]], 
-                    output_path: str,
-                    format: Optional[str] = None,
-                    title: str = ""):
-        """Save generated data to file"""
+    def generate_stream(self,
+                       input_text: str,
+                       context: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Generate items incrementally, yielding each one as the model produces it"""
+        prompt = self.build_prompt(input_text, context)
         
-        # Get output configuration
+        model = self.model_manager.get_current_model()
+        if not model:
+            raise RuntimeError("No AI model configured")
+        
+        yield from model.stream_generate(
+            prompt,
+            output_format='json',
+            encoding=self.config.get('output.encoding', 'shift-jis')
+        )
+    
+    def _output_settings(self, format: Optional[str]) -> Dict[str, Any]:
+        """Resolve format, encoding, BOM and line ending from the output config"""
         output_config = self.config.get('output', {})
         if format is None:
             format = output_config.get('default_format', 'markdown')
         
         encoding = output_config.get('encoding', 'shift-jis')
-        encoding = self.encoder.normalize_encoding_name(encoding)
-        
-        add_bom = output_config.get('bom', False)
-        line_ending = output_config.get('line_ending', 'crlf')
-        add_timestamp = output_config.get('timestamp', True)
-        
-        # Add timestamp to filename if configured
-        if add_timestamp:
+        return {
+            "format": format,
+            "encoding": self.encoder.normalize_encoding_name(encoding),
+            "add_bom": output_config.get('bom', False),
+            "line_ending": output_config.get('line_ending', 'crlf')
+        }
+    
+    def _resolve_output_path(self, output_path: str) -> str:
+        """Add a timestamp to the filename if configured and create the directory"""
+        if self.config.get('output.timestamp', True):
             path = Path(output_path)
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             new_name = f"{path.stem}_{timestamp}{path.suffix}"
             output_path = str(path.parent / new_name)
         
-        # Format content
-        content = self.formatter.format_output(data, format, title)
-        
-        # Create output directory if not exists
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        return output_path
+    
+    def save_stream(self,
+                   items: Iterable[Dict[str, Any]],
+                   output_path: str,
+                   format: Optional[str] = None,
+                   title: str = "") -> Tuple[str, int]:
+        """Write items to file as they arrive; returns (path, item count)
+
+        If the item stream fails part way (e.g. a timeout late in a long call),
+        the rows already written are kept and PartialGenerationError is raised.
+        """
+        settings = self._output_settings(format)
+        output_path = self._resolve_output_path(output_path)
         
-        # Write to file with encoding
-        self.encoder.write_file(
-            output_path,
-            content,
-            encoding=encoding,
-            add_bom=add_bom,
-            line_ending=line_ending
-        )
+        writer = StreamingWriter(output_path, title=title, **settings)
+        try:
+            for item in items:
+                writer.write(item)
+        except Exception as e:
+            writer.close()
+            if writer.count == 0:
+                Path(output_path).unlink(missing_ok=True)
+                raise
+            raise PartialGenerationError(output_path, writer.count, e) from e
+        
+        writer.close()
+        return output_path, writer.count
+    
+    def save_to_file(self, 
+                    data: List[Dict[str, Any]], 
+                    output_path: str,
+                    format: Optional[str] = None,
+                    title: str = ""):
+        """Save generated data to file"""
+        
+        # Get output configuration
+        settings = self._output_settings(format)
+        
+        # Add timestamp to filename if configured
+        output_path = self._resolve_output_path(output_path)
+        
+        with metrics.stage("write", generator=type(self).__name__, format=settings['format'], items=len(data)):
+            # Format content
+            content = self.formatter.format_output(data, settings['format'], title)
+            
+            # Write to file with encoding
+            self.encoder.write_file(
+                output_path,
+                content,
+                encoding=settings['encoding'],
+                add_bom=settings['add_bom'],
+                line_ending=settings['line_ending']
+            )
         
-        return output_path
\ No newline at end of file
+        return output_path
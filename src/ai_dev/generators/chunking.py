@@ -0,0 +1,100 @@
+"""Split large inputs into chunks and merge chunked generation results"""
+
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+from ..utils.sections import split_sections
+from ..utils.tokens import estimate_tokens
+
+_ID_PATTERN = re.compile(r'^(.*?)(\d+)$')
+ID_FIELDS = ('id', 'test_id')
+
+
+def _split_oversized(section: str, max_tokens: int) -> List[str]:
+    """Split a section that exceeds the budget by paragraphs, lines, then characters"""
+    for separator in ('\n\n', '\n'):
+        parts = [p for p in section.split(separator) if p.strip()]
+        if len(parts) > 1:
+            return _pack([p + separator for p in parts], max_tokens)
+
+    # One huge line: fall back to fixed-size slices
+    pieces = []
+    step = max(1, max_tokens)  # At least one character per token
+    for start in range(0, len(section), step):
+        pieces.append(section[start:start + step])
+    return pieces
+
+
+def _pack(parts: List[str], max_tokens: int) -> List[str]:
+    """Greedily pack consecutive parts into chunks under max_tokens"""
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for part in parts:
+        tokens = estimate_tokens(part)
+        if tokens > max_tokens:
+            if current:
+                chunks.append(''.join(current))
+                current, current_tokens = [], 0
+            chunks.extend(_split_oversized(part, max_tokens))
+            continue
+
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(''.join(current))
+            current, current_tokens = [], 0
+        current.append(part)
+        current_tokens += tokens
+
+    if current:
+        chunks.append(''.join(current))
+    return chunks
+
+
+def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+    """Split input text along section/page/slide boundaries under a token budget"""
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+    return [chunk for chunk in _pack(split_sections(text), max_tokens) if chunk.strip()]
+
+
+def _split_id(value: Any) -> Tuple[str, int]:
+    """Split 'REQ-001' into ('REQ-', 3); returns ('', 0) if not numbered"""
+    match = _ID_PATTERN.match(str(value))
+    if not match:
+        return '', 0
+    return match.group(1), max(3, len(match.group(2)))
+
+
+def merge_items(results: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Merge per-chunk item lists, removing duplicates and renumbering IDs"""
+    merged: List[Dict[str, Any]] = []
+    seen = set()
+    counters: Dict[str, int] = {}
+
+    for items in results:
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+
+            id_field = next((f for f in ID_FIELDS if f in item), None)
+
+            # Items are duplicates when everything except the ID matches
+            signature = json.dumps(
+                {k: v for k, v in item.items() if k != id_field},
+                ensure_ascii=False, sort_keys=True, default=str
+            )
+            if signature in seen:
+                continue
+            seen.add(signature)
+
+            if id_field:
+                prefix, width = _split_id(item[id_field])
+                if width:
+                    counters[prefix] = counters.get(prefix, 0) + 1
+                    item = {**item, id_field: f"{prefix}{counters[prefix]:0{width}d}"}
+
+            merged.append(item)
+
+    return merged
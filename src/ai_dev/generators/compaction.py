@@ -0,0 +1,258 @@
+"""Shrink input text before it is inserted into a prompt"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.sections import SECTION_BOUNDARY, split_sections
+from ..utils.tokens import estimate_tokens
+
+MAX_INDENT = 8
+BOILERPLATE_MAX_LENGTH = 60
+
+# Full-width ASCII (Ａ-Ｚ, ０-９, ！-～) and the ideographic space fold to their
+# half-width forms, which tokenize at a quarter of the cost
+_WIDE = re.compile('[\uff01-\uff5e\u3000]')
+_WIDTH_TABLE = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}
+_WIDTH_TABLE[0x3000] = ord(' ')
+
+# Invisible characters PDF extraction and Office exports leave behind
+_INVISIBLE_PATTERN = re.compile('[\u200b\u200c\u200d\u2060\ufeff\u00ad\u00a0\u000c]')
+_INVISIBLE = dict.fromkeys([0x200b, 0x200c, 0x200d, 0x2060, 0xfeff, 0x00ad])
+_INVISIBLE[0x00a0] = ord(' ')
+_INVISIBLE[0x000c] = ord('\n')
+
+_TRAILING_SPACE = re.compile(r'[ \t]+$', re.MULTILINE)
+_INNER_SPACE = re.compile(r'(?<=\S)[ \t]{3,}(?=\S)')
+# Runs of one punctuation character: "-------", "======", "・・・・", "……"
+_REPEATED_CHAR = re.compile(r'([^\w\s])\1{3,}')
+# Spreadsheet sections written by the analyzers with df.to_string(); only
+# there is padding pure layout and NaN/NaT/None an empty cell
+_TABLE_SECTION = re.compile(r'^=== (?:CSV Data|Sheet: .*) ===\n')
+_DEEP_INDENT = re.compile(r'^[ \t]{%d,}' % (MAX_INDENT + 1), re.MULTILINE)
+_EMPTY_CELL = re.compile(r'(?:(?<=  )|^)(?:NaN|NaT|None)(?=  |$)', re.MULTILINE)
+_DIGITS = re.compile(r'\d+')
+
+
+class CompactionReport:
+    """What compaction removed from one input"""
+
+    def __init__(self, original_tokens: int):
+        self.original_tokens = original_tokens
+        self.compacted_tokens = original_tokens
+        self.budget: Optional[int] = None
+        self.steps: Dict[str, int] = {}
+        self.trimmed_tokens = 0
+        self.trimmed_sections: List[str] = []
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.original_tokens - self.compacted_tokens
+
+    @property
+    def reduction(self) -> float:
+        return self.saved_tokens / self.original_tokens if self.original_tokens else 0.0
+
+    @property
+    def trimmed(self) -> bool:
+        return self.trimmed_tokens > 0
+
+    def count(self, step: str, n: int) -> None:
+        if n:
+            self.steps[step] = self.steps.get(step, 0) + n
+
+    def summary(self) -> str:
+        steps = ", ".join(f"{name} {n}" for name, n in self.steps.items())
+        text = (f"{self.original_tokens:,} → {self.compacted_tokens:,} tokens "
+                f"(-{self.reduction:.0%})")
+        return f"{text}; {steps}" if steps else text
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "original_tokens": self.original_tokens,
+            "compacted_tokens": self.compacted_tokens,
+            "budget": self.budget,
+            "steps": dict(self.steps),
+            "trimmed_tokens": self.trimmed_tokens,
+            "trimmed_sections": list(self.trimmed_sections)
+        }
+
+
+def _normalize_whitespace(text: str, report: CompactionReport) -> str:
+    """Trim trailing space and shrink column padding"""
+    text = _TRAILING_SPACE.sub('', text)
+    # Two spaces still separate table columns whose cells contain single spaces
+    text, n = _INNER_SPACE.subn('  ', text)
+    report.count("padding", n)
+    text, n = _REPEATED_CHAR.subn(lambda m: m.group(1) * 3, text)
+    report.count("repeated_chars", n)
+    return text
+
+
+def _compact_tables(text: str, report: CompactionReport) -> str:
+    """Cap indentation and blank out empty cells in spreadsheet sections"""
+    if '=== CSV Data ===' not in text and '=== Sheet: ' not in text:
+        return text
+
+    sections = split_sections(text)
+    for index, section in enumerate(sections):
+        if _TABLE_SECTION.match(section):
+            section = _DEEP_INDENT.sub(' ' * MAX_INDENT, section)
+            section, n = _EMPTY_CELL.subn('-', section)
+            report.count("empty_cells", n)
+            sections[index] = section
+    return ''.join(sections)
+
+
+def _collapse_duplicate_lines(lines: List[str], report: CompactionReport) -> List[str]:
+    """Replace runs of identical lines with one line and a repeat count"""
+    result: List[str] = []
+    i = 0
+    while i < len(lines):
+        j = i + 1
+        while j < len(lines) and lines[j] == lines[i]:
+            j += 1
+        if lines[i] and j - i > 1:
+            result.append(f"{lines[i]} (×{j - i})")
+            report.count("duplicate_lines", j - i - 1)
+        else:
+            result.extend(lines[i:j])
+        i = j
+    return result
+
+
+def _boilerplate_key(line: str) -> Optional[str]:
+    """Key under which repeated headers/footers match ("Page 3 of 9" ~ "Page 4 of 9")"""
+    stripped = line.strip()
+    if not stripped or len(stripped) > BOILERPLATE_MAX_LENGTH or SECTION_BOUNDARY.match(stripped):
+        return None
+    if '  ' in stripped:
+        return None  # A table row (e.g. the header row of every sheet), not a page footer
+    return _DIGITS.sub('#', stripped)
+
+
+def _strip_boilerplate(text: str, report: CompactionReport) -> str:
+    """Drop header/footer lines that repeat on most pages, keeping the first"""
+    sections = split_sections(text)
+    if len(sections) < 3:
+        return text
+
+    section_lines = [section.split('\n') for section in sections]
+    counts: Dict[str, int] = {}
+    for lines in section_lines:
+        for key in {_boilerplate_key(line) for line in lines} - {None}:
+            counts[key] = counts.get(key, 0) + 1
+
+    threshold = max(3, len(sections) // 2 + 1)
+    boilerplate = {key for key, n in counts.items() if n >= threshold}
+    if not boilerplate:
+        return text
+
+    seen = set()
+    result = []
+    for lines in section_lines:
+        kept = []
+        for line in lines:
+            key = _boilerplate_key(line)
+            if key in boilerplate:
+                if key in seen:
+                    report.count("boilerplate_lines", 1)
+                    continue
+                seen.add(key)
+            kept.append(line)
+        result.append('\n'.join(kept))
+    return ''.join(result)
+
+
+def _collapse_blank_lines(text: str) -> str:
+    return re.sub(r'\n{3,}', '\n\n', text).strip('\n')
+
+
+def _trim_marker(max_tokens: int, trimmed_tokens: int) -> str:
+    return (f"\n[... 入力が上限（約{max_tokens:,}トークン）を超えたため、"
+            f"以降の約{trimmed_tokens:,}トークンを省略しました ...]")
+
+
+def _enforce_budget(text: str, max_tokens: int, report: CompactionReport) -> str:
+    """Keep whole sections in order until the budget is spent
+
+    The trim marker counts toward the budget; it is left out only when the
+    budget is too small to hold it.
+    """
+    report.budget = max_tokens
+    total = estimate_tokens(text)
+    if total <= max_tokens:
+        return text
+
+    # Reserve room for the marker at its longest (nothing kept); token
+    # estimates of the pieces add up to at least that of their concatenation
+    marker_tokens = estimate_tokens(_trim_marker(max_tokens, total))
+    with_marker = marker_tokens < max_tokens
+    if with_marker:
+        max_tokens -= marker_tokens
+
+    kept: List[str] = []
+    used = 0
+    sections = split_sections(text)
+    for index, section in enumerate(sections):
+        tokens = estimate_tokens(section)
+        if used + tokens <= max_tokens:
+            kept.append(section)
+            used += tokens
+            continue
+
+        # Fill what is left of the budget with the first lines of this section
+        lines = []
+        for line in section.split('\n'):
+            line_tokens = estimate_tokens(line + '\n')
+            if used + line_tokens > max_tokens:
+                break
+            lines.append(line)
+            used += line_tokens
+        if lines:
+            kept.append('\n'.join(lines) + '\n')
+
+        dropped = sections[index:]
+        report.trimmed_sections = [s.strip().split('\n', 1)[0][:80] for s in dropped]
+        report.trimmed_tokens = sum(estimate_tokens(s) for s in dropped) - sum(
+            estimate_tokens(line + '\n') for line in lines)
+        break
+
+    if with_marker:
+        kept.append(_trim_marker(report.budget, report.trimmed_tokens))
+    return ''.join(kept)
+
+
+def compact_text(text: str,
+                 max_tokens: Optional[int] = None,
+                 options: Optional[Dict[str, Any]] = None) -> Tuple[str, CompactionReport]:
+    """Normalize whitespace, collapse repetition and apply a token budget
+
+    The content-preserving steps (width folding, whitespace, repeated
+    characters and lines, page headers/footers, and in spreadsheet sections
+    deep indents and NaN/None cells) run first; only if the text is still
+    over ``max_tokens`` are trailing sections cut, and the report says which.
+    """
+    options = options or {}
+    report = CompactionReport(estimate_tokens(text))
+
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    if _INVISIBLE_PATTERN.search(text):
+        text = text.translate(_INVISIBLE)
+    if options.get('fold_width', True):
+        report.count("width_folded", len(_WIDE.findall(text)))
+        text = text.translate(_WIDTH_TABLE)
+
+    text = _normalize_whitespace(text, report)
+    text = _compact_tables(text, report)
+    if options.get('collapse_duplicate_lines', True):
+        text = '\n'.join(_collapse_duplicate_lines(text.split('\n'), report))
+
+    if options.get('strip_boilerplate', True):
+        text = _strip_boilerplate(text, report)
+    text = _collapse_blank_lines(text)
+
+    if max_tokens:
+        text = _enforce_budget(text, max_tokens, report)
+
+    report.compacted_tokens = estimate_tokens(text)
+    return text, report
@@ -0,0 +1,87 @@
+"""Fingerprint sidecars recording what each output was generated from"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SIDECAR_SUFFIX = '.fingerprint.json'
+
+# Stands in for the input text when hashing a generator's prompt template
+TEMPLATE_PLACEHOLDER = '\x00input\x00'
+
+
+def file_hash(path: str) -> str:
+    """sha256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def digest(fields: Dict[str, Any]) -> str:
+    """Stable hash of fingerprint fields"""
+    return text_hash(json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str))
+
+
+def sidecar_path(output_path: str) -> Path:
+    """Sidecar for an output path as requested (before any timestamp is added)"""
+    path = Path(output_path)
+    return path.with_name(path.name + SIDECAR_SUFFIX)
+
+
+def read_sidecar(output_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(sidecar_path(output_path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_sidecar(output_path: str, fingerprint: Dict[str, Any], saved_path: str, items: int,
+                  data: Optional[List[Dict[str, Any]]] = None) -> None:
+    """Record the fingerprint of a completed output (temp file + rename)
+
+    ``data`` keeps the generated items themselves, for pipeline stages whose
+    items feed downstream stages even when the stage is skipped.
+    """
+    path = sidecar_path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    record = {"output": os.path.abspath(saved_path), "items": items, "fingerprint": fingerprint}
+    if data is not None:
+        record["data"] = data
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.fingerprint-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False, indent=2, default=str)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def generation_fingerprint(generator: Any, input_file: str, format: Optional[str] = None,
+                           chunked: bool = False, chunk_tokens: Optional[int] = None) -> Dict[str, Any]:
+    """Fingerprint of generating from input_file with the generator's current settings"""
+    if chunked or chunk_tokens:
+        mode = f"chunked:{chunk_tokens or generator.config.get('generation.chunking.max_tokens', 8000)}"
+    else:
+        mode = "single"
+    return generator.fingerprint(file_hash(input_file), format, mode)
+
+
+def up_to_date(output_path: str, fingerprint: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The sidecar record if it matches ``fingerprint`` and its output still exists"""
+    record = read_sidecar(output_path)
+    if not record or record.get('fingerprint', {}).get('digest') != fingerprint['digest']:
+        return None
+    if not Path(record.get('output', '')).exists():
+        return None
+    return record
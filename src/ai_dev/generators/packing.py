@@ -0,0 +1,81 @@
+"""Pack many small inputs into one prompt and split the response per input"""
+
+import re
+from typing import Any, Dict, List, Tuple
+
+from ..utils.tokens import estimate_tokens
+
+SECTION_FIELD = 'section_id'
+
+# Instruction added to the prompt context of every packed call
+PACK_INSTRUCTION = (
+    "入力内容には <<<S001: ファイル名>>> と <<<END S001>>> で区切られた複数の独立した文書が含まれています。"
+    f"文書ごとに個別に生成し、すべての要素に \"{SECTION_FIELD}\" フィールドで元の文書のID（例: \"S001\"）を含めてください。"
+    "IDの連番は文書ごとに001から振ってください。"
+)
+
+_SECTION_ID = re.compile(r'S\d{3,}')
+
+
+def section_id(index: int) -> str:
+    return f"S{index + 1:03d}"
+
+
+def pack_inputs(inputs: List[Tuple[str, str]], max_tokens: int, max_files: int) -> List[List[Tuple[str, str]]]:
+    """Greedily group (name, text) inputs into packs under max_tokens and max_files
+
+    An input larger than the budget gets a pack of its own.
+    """
+    packs: List[List[Tuple[str, str]]] = []
+    current: List[Tuple[str, str]] = []
+    current_tokens = 0
+
+    for name, text in inputs:
+        tokens = estimate_tokens(text) + 20  # Section markers
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_files):
+            packs.append(current)
+            current, current_tokens = [], 0
+        current.append((name, text))
+        current_tokens += tokens
+
+    if current:
+        packs.append(current)
+    return packs
+
+
+def build_packed_input(pack: List[Tuple[str, str]]) -> str:
+    """Join inputs into one text with delimited, ID-tagged sections"""
+    sections = []
+    for index, (name, text) in enumerate(pack):
+        sid = section_id(index)
+        sections.append(f"<<<{sid}: {name}>>>\n{text.strip()}\n<<<END {sid}>>>")
+    return "\n\n".join(sections)
+
+
+def split_packed_response(items: List[Any], count: int) -> Tuple[Dict[str, List[Dict[str, Any]]], List[Any]]:
+    """Group response items by section ID, in section order
+
+    Accepts items tagged with ``section_id`` as well as a single object keyed
+    by section ID. Returns ({section id: items}, items that matched no section).
+    """
+    grouped: Dict[str, List[Dict[str, Any]]] = {section_id(i): [] for i in range(count)}
+    expected = set(grouped)
+    unmatched: List[Any] = []
+
+    # {"S001": [...], "S002": [...]}
+    if len(items) == 1 and isinstance(items[0], dict) and items[0] and set(items[0]) <= expected:
+        for sid, value in items[0].items():
+            grouped[sid].extend(v for v in (value if isinstance(value, list) else [value]) if isinstance(v, dict))
+        return grouped, unmatched
+
+    for item in items:
+        if not isinstance(item, dict):
+            unmatched.append(item)
+            continue
+        match = _SECTION_ID.search(str(item.get(SECTION_FIELD, '')))
+        sid = match.group(0) if match else None
+        if sid not in expected:
+            unmatched.append(item)
+            continue
+        grouped[sid].append({k: v for k, v in item.items() if k != SECTION_FIELD})
+    return grouped, unmatched
@@ -0,0 +1,108 @@
+"""Run generators as a DAG, feeding upstream items to downstream stages"""
+
+import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Stage -> stages whose items it is generated from (roots read the input document)
+PIPELINE = {
+    'requirements': [],
+    'qa': [],
+    'tasks': ['requirements'],
+    'test-concept': ['requirements'],
+    'test-cases': ['test-concept'],
+}
+
+STAGE_LABELS = {
+    'requirements': "要件定義",
+    'qa': "QA",
+    'tasks': "タスク一覧",
+    'test-concept': "テスト観点",
+    'test-cases': "テストケース",
+}
+
+Items = List[Dict[str, Any]]
+
+
+def with_dependencies(targets: List[str], dag: Optional[Dict[str, List[str]]] = None) -> Dict[str, List[str]]:
+    """Sub-DAG holding the targets and everything upstream of them"""
+    dag = dag or PIPELINE
+    selected: Dict[str, List[str]] = {}
+    pending = list(targets)
+    while pending:
+        stage = pending.pop()
+        if stage not in selected:
+            selected[stage] = dag[stage]
+            pending.extend(dag[stage])
+    return {stage: deps for stage, deps in dag.items() if stage in selected}
+
+
+def upstream_input(upstream: Dict[str, Items]) -> str:
+    """Upstream items as compact JSON Lines, one block per stage, empty fields dropped"""
+    blocks = []
+    for stage, items in upstream.items():
+        lines = [json.dumps({k: v for k, v in item.items() if v not in (None, '', [], {})},
+                            ensure_ascii=False, separators=(',', ':'))
+                 for item in items if isinstance(item, dict)]
+        blocks.append(f"==== {STAGE_LABELS.get(stage, stage)}（{len(lines)}件） ====\n" + "\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+def upstream_context(upstream: Dict[str, Items]) -> Dict[str, str]:
+    """Prompt context telling the model what the structured input is"""
+    labels = "・".join(STAGE_LABELS.get(stage, stage) for stage in upstream)
+    return {
+        "入力": f"入力内容は前工程で作成済みの{labels}の項目です（1行1項目のJSON）。"
+                "原文の代わりにこれらの項目を元に作成し、関連する項目のIDを参照してください。"
+    }
+
+
+def run_dag(dag: Dict[str, List[str]],
+            run_stage: Callable[[str, Dict[str, Items]], Items],
+            max_workers: int = 4,
+            on_stage: Optional[Callable[[str, Optional[Items], Optional[Exception]], None]] = None
+            ) -> Tuple[Dict[str, Items], Dict[str, Exception]]:
+    """Run each stage once all its dependencies are done; independent stages run concurrently
+
+    ``run_stage(stage, {dependency: items})`` returns the stage's items.
+    A stage whose dependency failed is not run and gets an error of its own.
+    Returns ({stage: items}, {stage: error}).
+    """
+    results: Dict[str, Items] = {}
+    errors: Dict[str, Exception] = {}
+    remaining = dict(dag)
+
+    def report(stage: str, items: Optional[Items], error: Optional[Exception]) -> None:
+        if error is None:
+            results[stage] = items
+        else:
+            errors[stage] = error
+        if on_stage:
+            on_stage(stage, items, error)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        running = {}
+        while remaining or running:
+            for stage, deps in list(remaining.items()):
+                failed = [dep for dep in deps if dep in errors]
+                if failed:
+                    del remaining[stage]
+                    report(stage, None, RuntimeError(f"Skipped: upstream {', '.join(failed)} failed"))
+                elif all(dep in results for dep in deps):
+                    del remaining[stage]
+                    running[executor.submit(run_stage, stage, {dep: results[dep] for dep in deps})] = stage
+
+            if not running:
+                if remaining:  # A cycle or a dependency outside the DAG
+                    raise ValueError(f"Unresolvable pipeline stages: {', '.join(remaining)}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    report(stage, future.result(), None)
+                except Exception as e:
+                    report(stage, None, e)
+
+    return results, errors
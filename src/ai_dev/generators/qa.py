@@ -8,13 +8,15 @@ from .base import GeneratorBase
 class QAGenerator(GeneratorBase):
     """Generate QA documents"""
     
+    CONFIG_SECTION = 'qa'
+    
     def generate(self, 
                 input_text: str, 
                 context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Generate QA based on input text"""
         
         # Build prompt
-        prompt = self._build_prompt(input_text, context)
+        prompt = self.build_prompt(input_text, context)
         
         # Get current AI model and generate
         model = self.model_manager.get_current_model()
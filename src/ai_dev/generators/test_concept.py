@@ -8,13 +8,15 @@ from .base import GeneratorBase
 class TestConceptGenerator(GeneratorBase):
     """Generate test concept documents"""
     
+    CONFIG_SECTION = 'test_concept'
+    
     def generate(self, 
                 input_text: str, 
                 context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Generate test concept based on input text"""
         
         # Build prompt
-        prompt = self._build_prompt(input_text, context)
+        prompt = self.build_prompt(input_text, context)
         
         # Get current AI model and generate
         model = self.model_manager.get_current_model()
@@ -0,0 +1,310 @@
+"""Long-running worker daemon serving generate/analyze jobs over a Unix socket
+
+Keeps the configuration, ModelManager instances (with their availability
+probes and response cache), analyzers and generator modules warm, so a job submitted by
+``ai-dev-client`` skips the per-invocation import, YAML and probe cost.
+Each connection carries one JSON request line; the daemon answers with
+JSON event lines (``message``, ``item``, ``done``).
+"""
+
+import copy
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from .ai_models.model_manager import ModelManager
+from .analyzers import get_analyzer, read_input, supported_extensions
+from .analyzers.cache import configure as configure_analysis_cache
+from .client import resolve_socket
+from .config.manager import ConfigManager
+from .generators.fingerprint import generation_fingerprint, up_to_date, write_sidecar
+from .utils.metrics import metrics
+
+Send = Callable[..., None]
+
+
+def _json_default(value: Any) -> Any:
+    """numpy scalars and arrays in analysis results"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+def _tee(items: Iterable[Dict[str, Any]], send: Send) -> Iterator[Dict[str, Any]]:
+    """Forward streamed items to the client as they are written"""
+    for item in items:
+        send('item', item=item)
+        yield item
+
+
+class WorkerDaemon:
+    """Warm state and a bounded worker pool shared by all client connections"""
+
+    def __init__(self,
+                 config: ConfigManager,
+                 workers: int = 4,
+                 model_name: Optional[str] = None,
+                 pool: bool = False,
+                 verbose: bool = False):
+        self.config = config
+        self.workers = workers
+        self.model_name = model_name  # Defaults for jobs that don't pick a model
+        self.pool = pool
+        self.verbose = verbose
+        self.started = time.time()
+        self.jobs_running = 0
+        self.jobs_done = 0
+        self.jobs_failed = 0
+        self._slots = threading.BoundedSemaphore(workers)
+        self._lock = threading.Lock()
+        self._model_managers: Dict[Tuple, ModelManager] = {}
+        self.on_shutdown: Optional[Callable[[], None]] = None  # Set by serve()
+        configure_analysis_cache(config.get('analysis.cache', {}))
+
+    def warm_up(self) -> bool:
+        """Import every analyzer and generator, create the default model and probe its CLI"""
+        from .generators import GENERATOR_CLASSES, get_generator
+
+        for extension in supported_extensions():
+            get_analyzer(f"file{extension}")
+        for doc_type in GENERATOR_CLASSES:
+            get_generator(doc_type)
+        return self.model_manager({}).validate_current_model()
+
+    def model_manager(self, options: Dict[str, Any]) -> ModelManager:
+        """Shared ModelManager for a model selection and cache mode"""
+        key = (options.get('ai') or self.model_name, bool(options.get('pool') or self.pool),
+               bool(options.get('no_cache')), bool(options.get('refresh')))
+        with self._lock:
+            manager = self._model_managers.get(key)
+            if manager is None:
+                manager = ModelManager(self.config.get_all(), model_name=key[0], pool=key[1])
+                if key[2]:
+                    manager.response_cache.enabled = False
+                if key[3]:
+                    manager.response_cache.refresh = True
+                self._model_managers[key] = manager
+        return manager
+
+    def _job_config(self, options: Dict[str, Any]) -> ConfigManager:
+        """Per-job copy of the configuration with the output overrides applied"""
+        config = copy.copy(self.config)
+        config.config_data = copy.deepcopy(self.config.config_data)
+        if options.get('encoding'):
+            config.set('output.encoding', options['encoding'])
+        if options.get('format'):
+            config.set('output.default_format', options['format'])
+        return config
+
+    def dispatch(self, request: Dict[str, Any], send: Send) -> None:
+        """Run one request, reporting progress through ``send``"""
+        command = request.get('command')
+        options = request.get('options', {})
+        if command == 'status':
+            status = self.status()
+            for key, value in status.items():
+                send('message', text=f"{key}: {value}")
+            send('done', ok=True, result=status)
+            return
+        if command == 'shutdown':
+            send('message', text="✓ ai-dev serve is shutting down")
+            send('done', ok=True)
+            if self.on_shutdown:
+                self.on_shutdown()
+            return
+        if command not in ('generate', 'analyze'):
+            send('message', text=f"✗ Unknown command: {command}", stderr=True)
+            send('done', ok=False)
+            return
+
+        job = self._generate if command == 'generate' else self._analyze
+        with self._slots:
+            with self._lock:
+                self.jobs_running += 1
+            ok = False
+            try:
+                job(options, request.get('cwd') or os.getcwd(), send)
+                ok = True
+            except Exception as e:
+                send('message', text=f"✗ Error: {e}", stderr=True)
+                if self.verbose:
+                    send('message', text=traceback.format_exc(), stderr=True)
+            finally:
+                with self._lock:
+                    self.jobs_running -= 1
+                    self.jobs_done += 1
+                    self.jobs_failed += 0 if ok else 1
+        send('done', ok=ok)
+
+    def _generate(self, options: Dict[str, Any], cwd: str, send: Send) -> None:
+        from .generators import GENERATOR_TYPES, get_generator
+
+        config = self._job_config(options)
+        model_manager = self.model_manager(options)
+        file_stem, title = GENERATOR_TYPES[options['doc_type']]
+        generator_class = get_generator(options['doc_type'])
+        generator = generator_class(config, model_manager)
+
+        format = options.get('format')
+        output = options.get('output') or str(
+            Path(cwd) / config.get('output.directory', './output') / f"{file_stem}.{format or 'md'}")
+
+        chunked = options.get('chunked') or options.get('chunk_tokens')
+        # Same skip rule as 'ai-dev generate': a matching sidecar means nothing changed
+        fingerprint = generation_fingerprint(generator, options['input_file'], format,
+                                             bool(chunked), options.get('chunk_tokens'))
+        record = None if options.get('force') else up_to_date(output, fingerprint)
+        if record:
+            send('message', text=f"✓ Up to date: {record['output']} "
+                                 f"({record.get('items', 0)} items; use --force to regenerate)")
+            return
+
+        input_text, _ = read_input(options['input_file'])
+        mode = "stream" if options.get('stream') else "chunked" if chunked else "single"
+        with metrics.stage("generate", generator=generator_class.__name__,
+                           model=model_manager.get_current_model_name(), mode=mode, daemon=True) as stage:
+            if options.get('stream'):
+                saved_path, count = generator.save_stream(
+                    _tee(generator.generate_stream(input_text), send), output, format, title)
+            else:
+                if chunked:
+                    items = generator.generate_chunked(input_text, max_tokens=options.get('chunk_tokens'))
+                else:
+                    items = generator.generate(input_text)
+                saved_path, count = generator.save_to_file(items, output, format, title), len(items)
+            stage["items"] = count
+        write_sidecar(output, fingerprint, saved_path, count)
+
+        send('message', text=f"✓ {title} generated: {saved_path}")
+        send('message', text=f"   Encoding: {config.get('output.encoding', 'utf-8')}")
+        send('message', text=f"   Items: {count}")
+
+    def _analyze(self, options: Dict[str, Any], cwd: str, send: Send) -> None:
+        from .analyzers.report import format_analysis_markdown, format_analysis_text
+
+        input_file = options['input_file']
+        analyzer, analyzer_name = get_analyzer(input_file)
+
+        if options.get('extract_text'):
+            output_content = analyzer.extract_text_cached(input_file)
+            send('message', text=f"✓ Text extracted from {input_file}")
+        else:
+            result = analyzer.analyze_cached(input_file)
+            send('message', text=f"✓ {analyzer_name} file analyzed")
+            format = options.get('format') or 'md'
+            if format == 'json':
+                output_content = json.dumps(result, ensure_ascii=False, indent=2, default=_json_default)
+            elif format in ['md', 'markdown']:
+                output_content = format_analysis_markdown(result, analyzer_name)
+            else:
+                output_content = format_analysis_text(result, analyzer_name)
+
+        if options.get('output'):
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output_content)
+            send('message', text=f"   Saved to: {options['output']}")
+        else:
+            send('message', text=output_content)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "uptime": f"{time.time() - self.started:.0f}s",
+            "workers": self.workers,
+            "jobs_running": self.jobs_running,
+            "jobs_done": self.jobs_done,
+            "jobs_failed": self.jobs_failed,
+            "models": ", ".join(sorted({m.get_current_model_name() or '-' for m in self._model_managers.values()}))
+        }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """One connection = one JSON request line, answered with JSON event lines"""
+
+    def handle(self) -> None:
+        write_lock = threading.Lock()
+        connected = True
+
+        def send(event: str, **fields: Any) -> None:
+            nonlocal connected
+            if not connected:
+                return
+            line = json.dumps({"event": event, **fields}, ensure_ascii=False, default=str) + "\n"
+            try:
+                with write_lock:
+                    self.wfile.write(line.encode('utf-8'))
+                    self.wfile.flush()
+            except OSError:
+                connected = False  # Client went away; finish the job anyway
+
+        try:
+            request = json.loads(self.rfile.readline() or b'{}')
+        except ValueError:
+            send('message', text="✗ Malformed request", stderr=True)
+            send('done', ok=False)
+            return
+
+        self.server.daemon.dispatch(request, send)
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = False
+    block_on_close = True  # Let running jobs finish on shutdown
+
+    def __init__(self, path: str, daemon: WorkerDaemon):
+        self.daemon = daemon
+        super().__init__(path, _RequestHandler)
+
+
+def _claim_socket(path: Path) -> None:
+    """Remove a socket left by a daemon that died; refuse if one is running"""
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except (ConnectionRefusedError, FileNotFoundError):
+        path.unlink(missing_ok=True)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"ai-dev serve is already running on {path}")
+
+
+def serve(daemon: WorkerDaemon,
+          socket_path: Optional[str] = None,
+          on_ready: Optional[Callable[[Path], None]] = None) -> None:
+    """Run the daemon until SIGTERM/SIGINT or a 'shutdown' request"""
+    path = resolve_socket(socket_path)
+    _claim_socket(path)
+    daemon.warm_up()
+
+    old_umask = os.umask(0o077)  # Only the owner may submit jobs
+    try:
+        server = _UnixServer(str(path), daemon)
+    finally:
+        os.umask(old_umask)
+
+    def stop(*_):
+        # shutdown() blocks until serve_forever returns, so never call it on that thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    daemon.on_shutdown = stop
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        if on_ready:
+            on_ready(path)
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
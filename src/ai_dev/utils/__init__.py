@@ -1,7 +1,7 @@
 """Utility modules"""
 
 from .encoder import EncodingHandler
-from .formatter import OutputFormatter
+from .formatter import OutputFormatter, StreamingWriter
 from .cli_executor import CLIExecutor
 
-__all__ = ["EncodingHandler", "OutputFormatter", "CLIExecutor"]
\ No newline at end of file
+__all__ = ["EncodingHandler", "OutputFormatter", "StreamingWriter", "CLIExecutor"]
\ No newline at end of file
@@ -1,10 +1,13 @@
 """Encoding utilities for handling Shift-JIS and other encodings"""
 
 import codecs
+import os
 import chardet
 from typing import Optional, Tuple
 from pathlib import Path
 
+from .metrics import metrics
+
 
 class EncodingHandler:
     """Handle encoding detection and conversion"""
@@ -33,26 +36,31 @@ class EncodingHandler:
     @staticmethod
     def read_file_auto(file_path: str) -> Tuple[str, str]:
         """Read file with automatic encoding detection"""
-        encoding = EncodingHandler.detect_encoding(file_path)
+        with metrics.stage("encoding_detection"):
+            encoding = EncodingHandler.detect_encoding(file_path)
         
-        try:
-            with codecs.open(file_path, 'r', encoding=encoding) as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            # Try alternative encodings
-            for enc in ['utf-8', 'shift-jis', 'cp932', 'euc-jp', 'iso-2022-jp']:
-                try:
-                    with codecs.open(file_path, 'r', encoding=enc) as f:
-                        content = f.read()
-                        encoding = enc
-                        break
-                except:
-                    continue
-            else:
-                # If all fail, read as binary and decode with errors='ignore'
-                with open(file_path, 'rb') as f:
-                    content = f.read().decode('utf-8', errors='ignore')
-                    encoding = 'utf-8'
+        with metrics.stage("input_read") as stage:
+            try:
+                with codecs.open(file_path, 'r', encoding=encoding) as f:
+                    content = f.read()
+            except UnicodeDecodeError:
+                # Try alternative encodings
+                for enc in ['utf-8', 'shift-jis', 'cp932', 'euc-jp', 'iso-2022-jp']:
+                    try:
+                        with codecs.open(file_path, 'r', encoding=enc) as f:
+                            content = f.read()
+                            encoding = enc
+                            break
+                    except:
+                        continue
+                else:
+                    # If all fail, read as binary and decode with errors='ignore'
+                    with open(file_path, 'rb') as f:
+                        content = f.read().decode('utf-8', errors='ignore')
+                        encoding = 'utf-8'
+            
+            stage["bytes"] = os.path.getsize(file_path)
+            stage["encoding"] = encoding
         
         return content, encoding
     
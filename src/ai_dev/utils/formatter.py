@@ -2,8 +2,11 @@
 
 import json
 import csv
+import codecs
+import html
+import textwrap
 from io import StringIO
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, TextIO
 from tabulate import tabulate
 
 
@@ -141,4 +144,119 @@ class OutputFormatter:
         if formatter:
             return formatter(data)
         else:
-            raise ValueError(f"Unsupported format: {format}")
\ No newline at end of file
+            raise ValueError(f"Unsupported format: {format}")
+
+
+class StreamingWriter:
+    """Write rows to an output file progressively, as items are produced
+
+    The file is valid (closed JSON array, finished HTML table) after ``close()``
+    even when the item stream ends early, so partial results are kept.
+    """
+    
+    def __init__(self,
+                 file_path: str,
+                 format: str = "markdown",
+                 title: str = "",
+                 encoding: str = "utf-8",
+                 add_bom: bool = False,
+                 line_ending: str = "crlf"):
+        self.format = format.lower()
+        if self.format not in ('markdown', 'md', 'csv', 'json', 'html'):
+            raise ValueError(f"Unsupported format: {format}")
+        
+        self.title = title
+        self.newline = '\r\n' if line_ending == 'crlf' else '\n'
+        self.count = 0
+        self.headers: Optional[List[str]] = None
+        self._csv_writer = None
+        
+        self._file: TextIO = open(file_path, 'w', encoding=encoding, errors='replace', newline='')
+        if add_bom and encoding.lower() in ['utf-8', 'utf8']:
+            self._file.write(codecs.BOM_UTF8.decode('utf-8'))
+    
+    def __enter__(self) -> 'StreamingWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    def _write(self, text: str) -> None:
+        self._file.write(text.replace('\n', self.newline))
+    
+    @staticmethod
+    def _cell(value: Any) -> str:
+        """Render a value for a single Markdown/HTML table cell"""
+        if isinstance(value, (list, tuple)):
+            return " ".join([f"{i+1}. {v}" for i, v in enumerate(value)])
+        return str(value).replace('\r', '').replace('\n', ' ')
+    
+    def _start(self, item: Dict[str, Any]) -> None:
+        """Write the header once the first item defines the columns"""
+        self.headers = list(item.keys())
+        
+        if self.format in ('markdown', 'md'):
+            if self.title:
+                self._write(f"# {self.title}\n\n")
+            self._write("| " + " | ".join(self.headers) + " |\n")
+            self._write("|" + "|".join(["---"] * len(self.headers)) + "|\n")
+        elif self.format == 'csv':
+            self._csv_writer = csv.DictWriter(
+                self._file, fieldnames=self.headers,
+                extrasaction='ignore', lineterminator=self.newline
+            )
+            self._csv_writer.writeheader()
+        elif self.format == 'json':
+            self._write("[\n")
+        elif self.format == 'html':
+            self._write("<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"UTF-8\">\n")
+            if self.title:
+                self._write(f"<title>{self.title}</title>\n")
+            self._write("</head>\n<body>\n")
+            if self.title:
+                self._write(f"<h1>{self.title}</h1>\n")
+            self._write("<table>\n<thead>\n<tr>")
+            self._write("".join(f"<th>{html.escape(h)}</th>" for h in self.headers))
+            self._write("</tr>\n</thead>\n<tbody>\n")
+    
+    def write(self, item: Dict[str, Any]) -> None:
+        """Append one row and flush it to disk"""
+        if not isinstance(item, dict):
+            item = {"content": item}
+        if self.headers is None:
+            self._start(item)
+        
+        if self.format in ('markdown', 'md'):
+            cells = [self._cell(item.get(h, "")).replace('|', '\\|') for h in self.headers]
+            self._write("| " + " | ".join(cells) + " |\n")
+        elif self.format == 'csv':
+            self._csv_writer.writerow(item)
+        elif self.format == 'json':
+            prefix = ",\n" if self.count else ""
+            self._write(prefix + textwrap.indent(json.dumps(item, ensure_ascii=False, indent=2), "  "))
+        elif self.format == 'html':
+            cells = "".join(f"<td>{html.escape(self._cell(item.get(h, '')))}</td>" for h in self.headers)
+            self._write(f"<tr>{cells}</tr>\n")
+        
+        self.count += 1
+        self._file.flush()
+    
+    def close(self) -> None:
+        """Finish the document and close the file"""
+        if self._file.closed:
+            return
+        
+        if self.headers is None:
+            # No items at all: match the batch formatter's empty output
+            if self.format in ('markdown', 'md'):
+                self._write("No data available")
+            elif self.format == 'json':
+                self._write("[]")
+            elif self.format == 'html':
+                self._write("<p>No data available</p>")
+        elif self.format == 'json':
+            self._write("\n]")
+        elif self.format == 'html':
+            self._write("</tbody>\n</table>\n</body>\n</html>")
+        
+        self._file.close()
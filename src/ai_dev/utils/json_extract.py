@@ -0,0 +1,91 @@
+"""Single-pass JSON extraction from free-form model output"""
+
+import json
+from typing import Any, Optional, Tuple
+
+from .json_stream import JSON_START, JSONItemStream
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = ' \t\r\n'
+
+# Brackets that start something JSON-like but fail to decode trigger a salvage
+# scan; bound those so pathological output can't make extraction quadratic
+MAX_SALVAGE_ATTEMPTS = 20
+
+
+def _fenced_region(text: str) -> Optional[str]:
+    """Body of the first ``` code fence (to the end of text if it never closes)"""
+    fence = text.find('```')
+    if fence == -1:
+        return None
+    body_start = text.find('\n', fence)
+    if body_start == -1:
+        return None
+    body_end = text.find('```', body_start)
+    return text[body_start + 1:] if body_end == -1 else text[body_start + 1:body_end]
+
+
+def _salvage_array(text: str, start: int) -> list:
+    """Decode the elements of the array opening at ``start`` until it breaks off"""
+    items = []
+    pos = start + 1
+    length = len(text)
+    while True:
+        while pos < length and text[pos] in _WHITESPACE:
+            pos += 1
+        try:
+            item, pos = _DECODER.raw_decode(text, pos)
+        except RecursionError:
+            return items  # Nested too deeply to decode; keep what closed before it
+        except json.JSONDecodeError:
+            # A malformed element mid-array: let the bracket-tracking parser
+            # skip it and pick up the elements after it
+            return items + JSONItemStream(in_array=True).feed(text[pos:])
+        items.append(item)
+        
+        while pos < length and text[pos] in _WHITESPACE:
+            pos += 1
+        if pos >= length or text[pos] != ',':
+            return items
+        pos += 1
+
+
+def _decode(text: str) -> Tuple[Optional[Any], bool]:
+    """Decode the first JSON value in text, salvaging items from a truncated array"""
+    attempts = 0
+    for match in JSON_START.finditer(text):
+        start = match.start()
+        try:
+            value, _ = _DECODER.raw_decode(text, start)
+            return value, True
+        except RecursionError:
+            pass  # Nested too deeply to decode; treat as malformed and salvage
+        except json.JSONDecodeError as e:
+            if not text[start + 1:e.pos].strip():
+                continue  # Rejected at once ("[nothing]"); not worth a salvage scan
+        
+        attempts += 1
+        if attempts > MAX_SALVAGE_ATTEMPTS:
+            break
+        
+        # Truncated or partly malformed: keep every element that closed cleanly
+        items = _salvage_array(text, start) if text[start] == '[' else []
+        if items:
+            return items, False
+    return None, False
+
+
+def extract_json(text: str) -> Tuple[Optional[Any], bool]:
+    """Extract JSON from model output
+
+    Looks inside the first code fence, then the whole text. Returns
+    ``(value, complete)``; ``complete`` is False when only the finished
+    elements of a truncated array could be recovered, and ``value`` is None
+    when nothing could be decoded.
+    """
+    region = _fenced_region(text)
+    if region is not None:
+        value, complete = _decode(region)
+        if value is not None:
+            return value, complete
+    return _decode(text)
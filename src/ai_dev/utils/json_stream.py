@@ -0,0 +1,131 @@
+"""Incremental parser that yields JSON array items as soon as they are complete"""
+
+import json
+import re
+from typing import Any, List
+
+# An opening bracket followed by something that can start a JSON value/key;
+# stray brackets in prose ("[注意]", "{ 例 }", "see [a]") are not the payload.
+# Shared with json_extract so streaming and whole-text parsing agree.
+JSON_START = re.compile(r'\[(?=\s*[\[{"\-\d\]tfn])|\{(?=\s*["}])')
+# A bracket at the end of a chunk, whose lookahead has not arrived yet
+_PENDING_START = re.compile(r'[\[{]\s*$')
+_SPECIAL = re.compile(r'[\[\]{}",\\]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class JSONItemStream:
+    """Parse a JSON array from text chunks, emitting each element once it closes
+
+    Text before the first ``[`` or ``{`` that can start JSON (prose, ```json
+    fences, CLI banners) is skipped. A top-level object is treated as a
+    one-element array. Elements that fail to decode are counted in ``skipped``
+    instead of aborting the stream, and a truncated tail simply never produces
+    an item. With ``in_array`` the text is taken to start just inside an array.
+    """
+    
+    def __init__(self, in_array: bool = False):
+        self.started = in_array
+        self.done = False
+        self.single_object = False
+        self.depth = 1 if in_array else 0
+        self._pending = ''
+        self.in_string = False
+        self.escape = False
+        self.skipped = 0
+        self._buffer: List[str] = []
+    
+    def feed(self, text: str) -> List[Any]:
+        """Consume a chunk of text and return the items completed by it"""
+        items: List[Any] = []
+        if not self.started:
+            text = self._pending + text
+            self._pending = ''
+        pos = 0
+        length = len(text)
+        
+        while pos < length and not self.done:
+            if not self.started:
+                match = JSON_START.search(text, pos)
+                if not match:
+                    pending = _PENDING_START.search(text, pos)
+                    if pending:
+                        self._pending = text[pending.start():]
+                    break
+                self.started = True
+                self.depth = 1
+                if match.group() == '[':
+                    pos = match.end()
+                else:
+                    # Bare object: parse it as the only element of a virtual array
+                    self.single_object = True
+                    pos = match.start()
+                continue
+            
+            if self.in_string:
+                if self.escape:
+                    self._buffer.append(text[pos])
+                    self.escape = False
+                    pos += 1
+                    continue
+                match = _STRING_SPECIAL.search(text, pos)
+                if not match:
+                    self._buffer.append(text[pos:])
+                    break
+                self._buffer.append(text[pos:match.end()])
+                pos = match.end()
+                if match.group() == '\\':
+                    self.escape = True
+                else:
+                    self.in_string = False
+                continue
+            
+            match = _SPECIAL.search(text, pos)
+            if not match:
+                self._buffer.append(text[pos:])
+                break
+            
+            char = match.group()
+            before = text[pos:match.start()]
+            pos = match.end()
+            
+            if char == '"':
+                self._buffer.append(before + char)
+                self.in_string = True
+            elif char in '[{':
+                self._buffer.append(before + char)
+                self.depth += 1
+            elif char in ']}':
+                self.depth -= 1
+                if self.depth <= 0:
+                    # End of the top-level array
+                    self._buffer.append(before)
+                    self._flush(items)
+                    self.done = True
+                else:
+                    self._buffer.append(before + char)
+                    if self.depth == 1:
+                        self._flush(items)
+                        if self.single_object:
+                            self.done = True
+            elif char == ',':
+                if self.depth == 1:
+                    self._buffer.append(before)
+                    self._flush(items)
+                else:
+                    self._buffer.append(before + char)
+            else:
+                self._buffer.append(before + char)
+        
+        return items
+    
+    def _flush(self, items: List[Any]) -> None:
+        """Decode the buffered element, if any"""
+        raw = ''.join(self._buffer).strip()
+        self._buffer = []
+        if not raw:
+            return
+        try:
+            items.append(json.loads(raw))
+        except (json.JSONDecodeError, RecursionError):  # Nested too deeply counts as malformed
+            self.skipped += 1
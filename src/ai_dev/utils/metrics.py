@@ -0,0 +1,95 @@
+"""Structured JSONL metrics for model calls and generator stages"""
+
+import json
+import math
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class MetricsLog:
+    """Append-only JSONL log of model calls and pipeline stages
+
+    Each record is written with a single ``write`` on a file opened in append
+    mode, so concurrent threads and processes don't interleave lines. The file
+    is rotated to ``<name>.1`` once it grows past ``max_size_mb``.
+    """
+
+    def __init__(self,
+                 path: str = '~/.cache/ai-dev/metrics.jsonl',
+                 enabled: bool = True,
+                 max_size_mb: float = 50):
+        self.path = Path(path).expanduser()
+        self.enabled = enabled
+        self.max_size = int(max_size_mb * 1024 * 1024)
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """Apply the ``metrics`` configuration section"""
+        self.path = Path(config.get('file', '~/.cache/ai-dev/metrics.jsonl')).expanduser()
+        self.enabled = config.get('enabled', True)
+        self.max_size = int(config.get('max_size_mb', 50) * 1024 * 1024)
+
+    def record(self, kind: str, **fields: Any) -> None:
+        """Append one record; failures to write never affect the caller"""
+        if not self.enabled:
+            return
+
+        entry = {"ts": round(time.time(), 3), "kind": kind, "pid": os.getpid(), **fields}
+        line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists() and self.path.stat().st_size > self.max_size:
+                os.replace(self.path, self.path.with_name(self.path.name + '.1'))
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+        except OSError:
+            pass
+
+    @contextmanager
+    def stage(self, name: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+        """Time a pipeline stage; the yielded dict can carry extra fields"""
+        extra: Dict[str, Any] = {}
+        started = time.perf_counter()
+        status = "error"
+        try:
+            yield extra
+            status = "ok"
+        finally:
+            self.record("stage", stage=name, seconds=round(time.perf_counter() - started, 4),
+                        status=status, **fields, **extra)
+
+    def read(self, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Load records (including the rotated file), optionally newer than ``since``"""
+        records = []
+        for path in (self.path.with_name(self.path.name + '.1'), self.path):
+            if not path.exists():
+                continue
+            with open(path, encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # A line cut short by a crash
+                    if since is None or entry.get('ts', 0) >= since:
+                        records.append(entry)
+        return records
+
+    def clear(self) -> None:
+        """Delete the metrics log"""
+        for path in (self.path, self.path.with_name(self.path.name + '.1')):
+            path.unlink(missing_ok=True)
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile (p in 0-100)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+# Shared instance; configured from the ``metrics`` section at CLI start-up
+metrics = MetricsLog()
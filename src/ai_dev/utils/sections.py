@@ -0,0 +1,17 @@
+"""Section boundaries in analyzer output, shared by chunking and compaction"""
+
+import re
+from typing import List
+
+# Section boundaries emitted by the analyzers ("=== Page 3 ===", "=== Slide 2 ===",
+# "=== Sheet: Name ===") and Markdown headings
+SECTION_BOUNDARY = re.compile(r'^(===\s.*\s===|#{1,6}\s+\S.*)$', re.MULTILINE)
+
+
+def split_sections(text: str) -> List[str]:
+    """Split text at page, slide, sheet and heading boundaries"""
+    starts = [m.start() for m in SECTION_BOUNDARY.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    starts.append(len(text))
+    return [text[a:b] for a, b in zip(starts, starts[1:]) if text[a:b].strip()]
@@ -0,0 +1,19 @@
+"""Offline token estimation for prompt budgeting"""
+
+import re
+
+# CJK ideographs, kana, full-width forms and CJK punctuation
+_CJK_PATTERN = re.compile(r'[\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff00-\uffef]')
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the number of model tokens in text
+
+    Japanese text tokenizes at about one token per character, while
+    ASCII-heavy text averages about four characters per token.
+    """
+    if not text:
+        return 0
+    cjk_chars = len(_CJK_PATTERN.findall(text))
+    other_chars = len(text) - cjk_chars
+    return cjk_chars + (other_chars + 3) // 4
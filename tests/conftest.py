@@ -0,0 +1,137 @@
+"""Shared fixtures: an isolated home directory, a fake model CLI and generated documents"""
+
+import json
+import stat
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+# Stands in for the gemini/claude CLIs: logs each call and answers with a JSON array.
+# FAKE_CLI_MODE: ok (default), fail, sleep:<seconds> or ratelimit:<calls> (the first
+# <calls> calls answer 429); FAKE_CLI_ITEMS: items per answer
+FAKE_CLI = textwrap.dedent('''
+    import json, os, sys, time
+    if '--version' in sys.argv:
+        print('0.0.0-fake')
+        sys.exit(0)
+    started = time.time()
+    stdin = '' if sys.stdin.isatty() else sys.stdin.read()
+    mode = os.environ.get('FAKE_CLI_MODE', 'ok')
+    if mode.startswith('sleep:'):
+        time.sleep(float(mode.split(':', 1)[1]))
+    with open(os.environ['FAKE_CLI_LOG'], 'a', encoding='utf-8') as log:
+        log.write(json.dumps({"argv": sys.argv[1:], "stdin": stdin, "pid": os.getpid(),
+                              "started": started, "finished": time.time()}) + "\\n")
+    if mode == 'fail':
+        print('Error: fake backend failure', file=sys.stderr)
+        sys.exit(1)
+    if mode.startswith('ratelimit:'):
+        with open(os.environ['FAKE_CLI_LOG'], encoding='utf-8') as log:
+            if len(log.readlines()) <= int(mode.split(':', 1)[1]):
+                print('Error: 429 Too Many Requests', file=sys.stderr)
+                sys.exit(1)
+    count = int(os.environ.get('FAKE_CLI_ITEMS', '3'))
+    items = [{"id": f"ITEM-{n:03d}", "title": f"項目{n}"} for n in range(1, count + 1)]
+    print("```json\\n" + json.dumps(items, ensure_ascii=False) + "\\n```")
+''')
+
+
+@pytest.fixture(autouse=True)
+def home(tmp_path_factory, monkeypatch):
+    """Keep caches, metrics and rate-limit state out of the real home directory"""
+    home = tmp_path_factory.mktemp('home')
+    monkeypatch.setenv('HOME', str(home))
+    return home
+
+
+class FakeCLI:
+    """A fake model CLI plus a configuration file pointing ai-dev at it"""
+
+    def __init__(self, directory: Path, monkeypatch):
+        self.directory = directory
+        self.log = directory / 'calls.jsonl'
+        self.output_dir = directory / 'output'
+        script = directory / 'fake_cli.py'
+        script.write_text(FAKE_CLI, encoding='utf-8')
+        for backend in ('gemini', 'claude'):
+            shim = directory / backend
+            shim.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n', encoding='utf-8')
+            shim.chmod(shim.stat().st_mode | stat.S_IEXEC)
+
+        self.monkeypatch = monkeypatch
+        monkeypatch.setenv('FAKE_CLI_LOG', str(self.log))
+        self.config = {
+            "ai_models": {
+                "default": "gemini",
+                **{backend: {
+                    "command": str(directory / backend),
+                    "options": [],
+                    "timeout": 30,
+                    "prompt_transport": "stdin",
+                    "rate_limit": {"directory": str(directory / 'ratelimit')},
+                    "retry": {"max_attempts": 1, "latency_file": str(directory / f'{backend}_latency.json')},
+                } for backend in ('gemini', 'claude')},
+            },
+            "cache": {"enabled": False, "directory": str(directory / 'responses')},
+            "analysis": {"cache": {"enabled": False, "directory": str(directory / 'analysis')}},
+            "metrics": {"enabled": True, "file": str(directory / 'metrics.jsonl')},
+            "output": {"directory": str(self.output_dir), "timestamp": False,
+                       "encoding": "utf-8", "default_format": "md"},
+        }
+        self.config_path = directory / 'config.yaml'
+        self.save()
+
+    def save(self) -> None:
+        self.config_path.write_text(yaml.safe_dump(self.config, allow_unicode=True), encoding='utf-8')
+
+    def set_mode(self, mode: str) -> None:
+        self.monkeypatch.setenv('FAKE_CLI_MODE', mode)
+
+    def calls(self):
+        if not self.log.exists():
+            return []
+        return [json.loads(line) for line in self.log.read_text(encoding='utf-8').splitlines()]
+
+    def invoke(self, *args: str):
+        """Run ``ai-dev --config <config> <args>`` in-process"""
+        from ai_dev.cli import cli
+        return CliRunner().invoke(cli, ['--config', str(self.config_path), *args], catch_exceptions=False)
+
+
+@pytest.fixture
+def fake_cli(tmp_path, monkeypatch):
+    return FakeCLI(tmp_path, monkeypatch)
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """Write a PDF whose pages carry the given ASCII text, one Helvetica line per text line"""
+    PyPDF2 = pytest.importorskip('PyPDF2')
+    from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+    def make(pages, name='document.pdf'):
+        writer = PyPDF2.PdfWriter()
+        font = writer._add_object(DictionaryObject({
+            NameObject('/Type'): NameObject('/Font'),
+            NameObject('/Subtype'): NameObject('/Type1'),
+            NameObject('/BaseFont'): NameObject('/Helvetica'),
+        }))
+        for text in pages:
+            page = PyPDF2.PageObject.create_blank_page(width=300, height=400)
+            content = DecodedStreamObject()
+            content.set_data(''.join(f"BT /F1 10 Tf 20 {380 - 14 * n} Td ({line}) Tj ET\n"
+                                     for n, line in enumerate(text.splitlines())).encode('latin-1'))
+            page[NameObject('/Contents')] = writer._add_object(content)
+            page[NameObject('/Resources')] = DictionaryObject({
+                NameObject('/Font'): DictionaryObject({NameObject('/F1'): font}),
+            })
+            writer.add_page(page)
+        path = tmp_path / name
+        with open(path, 'wb') as f:
+            writer.write(f)
+        return path
+    return make
@@ -0,0 +1,197 @@
+"""Tests for the on-disk analyzer result cache"""
+
+import os
+import threading
+
+import pytest
+
+from ai_dev.analyzers import cache as cache_module
+from ai_dev.analyzers import get_analyzer
+from ai_dev.analyzers.cache import AnalysisCache
+
+
+class Analyzer:
+    VERSION = 1
+
+    def __init__(self, config=None):
+        self.config = config or {}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AnalysisCache(str(tmp_path / 'analysis'))
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / 'deck.txt'
+    path.write_text("スライド1の本文", encoding='utf-8')
+    return path
+
+
+def _counting(value="result"):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"value": value, "call": len(calls)}
+    return compute, calls
+
+
+def test_unchanged_file_is_served_from_the_cache(cache, document):
+    compute, calls = _counting()
+
+    first = cache.cached(str(document), Analyzer(), 'analyze', compute)
+    second = cache.cached(str(document), Analyzer(), 'analyze', compute)
+
+    assert first == second == {"value": "result", "call": 1}
+    assert len(calls) == 1
+    assert cache.info()["entries"] == 1
+
+
+def test_key_covers_kind_analyzer_class_version_and_config(cache, document):
+    class Other(Analyzer):
+        pass
+
+    newer = Analyzer()
+    newer.VERSION = 2
+    keys = {
+        cache.make_key(str(document), Analyzer(), 'analyze'),
+        cache.make_key(str(document), Analyzer(), 'extract_text'),
+        cache.make_key(str(document), Other(), 'analyze'),
+        cache.make_key(str(document), newer, 'analyze'),
+        cache.make_key(str(document), Analyzer({"max_rows": 10}), 'analyze'),
+    }
+
+    assert len(keys) == 5
+    assert cache.make_key(str(document), Analyzer(), 'analyze') in keys
+
+
+def test_modified_time_invalidates(cache, document):
+    key = cache.make_key(str(document), Analyzer(), 'analyze')
+    stat = document.stat()
+    os.utime(document, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.make_key(str(document), Analyzer(), 'analyze') != key
+
+
+def test_size_invalidates(cache, document):
+    key = cache.make_key(str(document), Analyzer(), 'analyze')
+    stat = document.stat()
+    document.write_text("スライド1の本文（改訂）", encoding='utf-8')
+    os.utime(document, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert cache.make_key(str(document), Analyzer(), 'analyze') != key
+
+
+def test_content_hash_invalidates_a_same_size_same_mtime_replacement(cache, document, tmp_path):
+    key = cache.make_key(str(document), Analyzer(), 'analyze')
+    stat = document.stat()
+    replacement = tmp_path / 'replacement.txt'
+    replacement.write_text("スライド2の本文", encoding='utf-8')
+    assert replacement.stat().st_size == stat.st_size
+    os.replace(replacement, document)
+    os.utime(document, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert cache.make_key(str(document), Analyzer(), 'analyze') != key
+
+
+def test_content_hash_is_remembered_per_file_identity(cache, document, monkeypatch):
+    cache.make_key(str(document), Analyzer(), 'analyze')
+    opened = []
+    real_open = open
+    monkeypatch.setattr('builtins.open', lambda path, *a, **k: opened.append(str(path)) or real_open(path, *a, **k))
+
+    cache.make_key(str(document), Analyzer(), 'analyze')
+
+    assert str(document) not in opened
+
+
+def test_refresh_recomputes_and_stores(cache, document):
+    compute, calls = _counting()
+    cache.cached(str(document), Analyzer(), 'analyze', compute)
+
+    cache.refresh = True
+    assert cache.cached(str(document), Analyzer(), 'analyze', compute)["call"] == 2
+    cache.refresh = False
+    assert cache.cached(str(document), Analyzer(), 'analyze', compute)["call"] == 2
+    assert len(calls) == 2
+
+
+def test_disabled_cache_always_computes(tmp_path, document):
+    cache = AnalysisCache(str(tmp_path / 'analysis'), enabled=False)
+    compute, calls = _counting()
+
+    cache.cached(str(document), Analyzer(), 'analyze', compute)
+    cache.cached(str(document), Analyzer(), 'analyze', compute)
+
+    assert len(calls) == 2
+    assert not (tmp_path / 'analysis').exists()
+
+
+@pytest.mark.parametrize("garbage", [b"", b"not zlib", b"x\x9c\x03\x00\x00\x00\x00\x01"])
+def test_corrupt_entry_is_dropped_and_recomputed(cache, document, garbage):
+    compute, calls = _counting()
+    key = cache.make_key(str(document), Analyzer(), 'analyze')
+    cache.cached(str(document), Analyzer(), 'analyze', compute)
+    entry = cache._path(key, cache.SUFFIX)
+    entry.write_bytes(garbage)
+
+    assert cache.get(key) == (False, None)
+    assert not entry.exists()
+    assert cache.cached(str(document), Analyzer(), 'analyze', compute)["call"] == 2
+    assert cache.get(key) == (True, {"value": "result", "call": 2})
+
+
+def test_unpicklable_result_is_returned_but_not_stored(cache, document):
+    lock = threading.Lock()
+
+    assert cache.cached(str(document), Analyzer(), 'analyze', lambda: lock) is lock
+    assert cache.info()["entries"] == 0
+
+
+def test_missing_file_is_left_to_the_analyzer(cache, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        cache.cached(str(tmp_path / 'missing.txt'), Analyzer(), 'analyze',
+                     lambda: open(tmp_path / 'missing.txt'))
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = AnalysisCache(str(tmp_path / 'analysis'), max_size_mb=35 * 1024 / (1024 * 1024))
+    payload = {key: os.urandom(10 * 1024) for key in ('aa', 'bb', 'cc', 'dd')}
+    for atime, key in enumerate(('aa', 'bb', 'cc'), start=1):
+        cache.put(key * 32, payload[key])
+        os.utime(cache._path(key * 32, cache.SUFFIX), (atime * 1000, atime * 1000))
+
+    assert cache.get('aa' * 32) == (True, payload['aa'])  # Now the most recently used
+    cache.put('dd' * 32, payload['dd'])
+
+    assert cache.get('bb' * 32) == (False, None)
+    assert [cache.get(key * 32)[0] for key in ('aa', 'cc', 'dd')] == [True, True, True]
+    assert cache.info()["size_mb"] <= 35 / 1024
+
+
+def test_clear_and_info(cache, document):
+    cache.cached(str(document), Analyzer(), 'analyze', lambda: "a")
+    cache.cached(str(document), Analyzer(), 'extract_text', lambda: "b")
+
+    assert cache.info()["entries"] == 2
+    assert cache.clear() == 2
+    assert cache.info()["entries"] == 0
+
+
+def test_analyzers_share_the_configured_cache(tmp_path, document, monkeypatch):
+    monkeypatch.setattr(cache_module, '_cache', cache_module.analysis_cache())  # Restored afterwards
+    cache_module.configure({"directory": str(tmp_path / 'shared')})
+    analyzer, _ = get_analyzer(str(document))
+    calls = []
+    extract_text = type(analyzer).extract_text
+    monkeypatch.setattr(type(analyzer), 'extract_text',
+                        lambda self, path, **options: calls.append(path) or extract_text(self, path, **options))
+
+    first = analyzer.extract_text_cached(str(document))
+    second = get_analyzer(str(document))[0].extract_text_cached(str(document))
+
+    assert first == second and "スライド1" in first
+    assert calls == [str(document)]
+    assert cache_module.analysis_cache().info()["entries"] == 1
@@ -0,0 +1,95 @@
+"""Tests for the asyncio execution path of the model wrappers"""
+
+import asyncio
+import json
+import time
+
+from ai_dev.ai_models.model_manager import ModelManager
+from ai_dev.config.manager import ConfigManager
+from ai_dev.generators.qa import QAGenerator
+
+
+def _model(fake_cli, **settings):
+    fake_cli.config["ai_models"]["gemini"].update(settings)
+    return ModelManager(fake_cli.config).get_current_model()
+
+
+def _max_overlap(calls):
+    edges = sorted([(c["started"], 1) for c in calls] + [(c["finished"], -1) for c in calls])
+    running = peak = 0
+    for _, step in edges:
+        running += step
+        peak = max(peak, running)
+    return peak
+
+
+def test_agenerate_parses_like_generate(fake_cli):
+    model = _model(fake_cli)
+
+    assert asyncio.run(model.agenerate("ログイン機能")) == model.generate("ログイン機能")
+
+
+def test_generator_agenerate(fake_cli):
+    config = ConfigManager(str(fake_cli.config_path))
+    generator = QAGenerator(config, ModelManager(fake_cli.config))
+
+    items = asyncio.run(generator.agenerate("ログイン機能"))
+
+    assert [item["id"] for item in items] == ["ITEM-001", "ITEM-002", "ITEM-003"]
+
+
+def test_concurrent_calls_are_capped_per_model(fake_cli):
+    fake_cli.set_mode('sleep:0.3')
+    model = _model(fake_cli, max_concurrency=2)
+
+    async def main():
+        return await asyncio.gather(*(model.agenerate(f"prompt {n}") for n in range(5)))
+
+    results = asyncio.run(main())
+
+    assert all(len(items) == 3 for items in results)
+    assert _max_overlap(fake_cli.calls()) == 2
+
+
+def test_each_event_loop_gets_its_own_semaphore(fake_cli):
+    model = _model(fake_cli)
+
+    async def semaphore():
+        return model._semaphore()
+
+    first, second = asyncio.run(semaphore()), asyncio.run(semaphore())
+
+    assert first is not second
+
+
+def test_timeout_kills_the_process(fake_cli):
+    fake_cli.set_mode('sleep:30')
+    model = _model(fake_cli, timeout=1, retry={"max_attempts": 1, "deadline": 1})
+
+    started = time.perf_counter()
+    try:
+        asyncio.run(model.agenerate("slow"))
+    except RuntimeError as e:
+        assert "timed out" in str(e)
+    else:
+        raise AssertionError("expected a timeout")
+    assert time.perf_counter() - started < 10
+
+
+def test_cancel_while_waiting_for_a_slot_leaks_nothing(fake_cli):
+    model = _model(fake_cli, rate_limit={"max_inflight": 1, "directory": str(fake_cli.directory / 'rl')})
+    state_file = fake_cli.directory / 'rl' / f"{model.rate_limiter.name}.json"
+
+    async def main():
+        held = model.rate_limiter.acquire()
+        task = asyncio.create_task(model.agenerate("waiting"))
+        await asyncio.sleep(0.3)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        model.rate_limiter.release(held)
+        await asyncio.sleep(1.0)  # Long enough for a stray acquire to grab the freed slot
+
+    asyncio.run(main())
+
+    assert json.loads(state_file.read_text(encoding='utf-8'))["inflight"] == {}
+    assert fake_cli.calls() == []
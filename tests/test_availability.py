@@ -0,0 +1,108 @@
+"""Tests for the cached CLI availability probe and lazy model creation"""
+
+import os
+import stat
+
+import pytest
+
+from ai_dev.ai_models import availability
+from ai_dev.ai_models.availability import AvailabilityCache
+from ai_dev.ai_models.model_manager import ModelManager
+
+
+@pytest.fixture
+def cli(tmp_path, monkeypatch):
+    """A 'fakecli' on PATH that counts its --version probes and fails if 'broken' exists"""
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    script = bin_dir / 'fakecli'
+    script.write_text(f'#!/bin/sh\necho probe >> "{tmp_path}/probes"\n'
+                      f'[ -e "{tmp_path}/broken" ] && exit 1\nexit 0\n', encoding='utf-8')
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv('PATH', f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    class CLI:
+        path = script
+
+        @staticmethod
+        def probes():
+            probes = tmp_path / 'probes'
+            return len(probes.read_text().splitlines()) if probes.exists() else 0
+
+        @staticmethod
+        def break_it():
+            (tmp_path / 'broken').touch()
+
+        @staticmethod
+        def fix_it():
+            (tmp_path / 'broken').unlink()
+
+    return CLI
+
+
+def _cache(tmp_path, **kwargs):
+    return AvailabilityCache(str(tmp_path / 'availability.json'), **kwargs)
+
+
+def test_available_cli_is_probed_once(tmp_path, cli):
+    assert _cache(tmp_path).is_available('fakecli')
+    assert _cache(tmp_path).is_available('fakecli')
+
+    assert cli.probes() == 1
+
+
+def test_changed_executable_is_probed_again(tmp_path, cli):
+    _cache(tmp_path).is_available('fakecli')
+    with open(cli.path, 'a') as f:
+        f.write("# upgraded\n")
+
+    assert _cache(tmp_path).is_available('fakecli')
+    assert cli.probes() == 2
+
+
+def test_failed_probe_is_trusted_only_for_the_negative_ttl(tmp_path, cli, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(availability.time, 'time', lambda: now[0])
+    cli.break_it()
+    assert not _cache(tmp_path, negative_ttl=60).is_available('fakecli')
+
+    cli.fix_it()
+    now[0] += 30
+    assert not _cache(tmp_path, negative_ttl=60).is_available('fakecli')
+    assert cli.probes() == 1
+
+    now[0] += 31
+    assert _cache(tmp_path, negative_ttl=60).is_available('fakecli')
+    assert cli.probes() == 2
+
+
+def test_missing_command_is_not_probed(tmp_path, cli):
+    assert not _cache(tmp_path).is_available('no-such-cli-here')
+    assert not (tmp_path / 'availability.json').exists()
+
+
+def test_clear_forgets_results(tmp_path, cli):
+    cache = _cache(tmp_path)
+    cache.is_available('fakecli')
+    cache.clear()
+    cache.is_available('fakecli')
+
+    assert cli.probes() == 2
+
+
+def test_model_is_created_on_first_use(fake_cli):
+    manager = ModelManager(fake_cli.config)
+
+    assert manager.current_model is None
+    assert manager.get_current_model_name() == 'gemini'
+    assert manager.get_current_model() is manager.get_current_model()
+
+
+def test_light_commands_never_start_the_cli(fake_cli):
+    fake_cli.config["ai_models"]["gemini"]["command"] = "/nonexistent/gemini"
+    fake_cli.save()
+
+    result = fake_cli.invoke('config', 'show')
+
+    assert result.exit_code == 0, result.output
+    assert "not found" not in result.output
@@ -0,0 +1,137 @@
+"""Tests for resumable batch generation"""
+
+from pathlib import Path
+
+import pytest
+
+from ai_dev.ai_models.model_manager import ModelManager
+from ai_dev.batch import BatchManifest, BatchRunner
+from ai_dev.batch.manifest import DONE, FAILED, PENDING
+from ai_dev.config.manager import ConfigManager
+
+# Large enough to split into several chunks at --chunk-tokens 100
+LARGE_INPUT = "\n\n".join(f"=== Page {n} ===\n" + f"第{n}章の仕様。" * 30 for n in range(1, 5))
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    paths = []
+    for name in ('a', 'b', 'c'):
+        path = tmp_path / 'in' / f"{name}.txt"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(f"入力{name}の仕様", encoding='utf-8')
+        paths.append(str(path))
+    return paths
+
+
+def _runner(fake_cli, manifest, jobs=1, chunk_tokens=None):
+    config = ConfigManager(str(fake_cli.config_path))
+    return BatchRunner(config, ModelManager(fake_cli.config), manifest, jobs, chunk_tokens)
+
+
+def _run_inputs(fake_cli, start=0):
+    """Input names the fake CLI was called for, from the calls after ``start``"""
+    return sorted(name for call in fake_cli.calls()[start:] for name in 'abc' if f"入力{name}の" in call["stdin"])
+
+
+def test_plan_names_outputs_and_records_chunk_tokens(fake_cli, inputs, tmp_path):
+    other = tmp_path / 'other' / 'a.txt'
+    other.parent.mkdir()
+    other.write_text("別の入力", encoding='utf-8')
+
+    with BatchManifest(str(tmp_path / 'batch.db')) as manifest:
+        units = _runner(fake_cli, manifest, chunk_tokens=500).plan(
+            inputs + [str(other)], ['qa', 'tasks'], str(tmp_path / 'out'))
+
+    names = sorted(unit['output_path'].rsplit('/', 1)[1] for unit in units)
+    assert names == ['a_qa-2.md', 'a_qa.md', 'a_tasks-2.md', 'a_tasks.md',
+                     'b_qa.md', 'b_tasks.md', 'c_qa.md', 'c_tasks.md']
+    assert {unit['status'] for unit in units} == {PENDING}
+    assert {unit['chunk_tokens'] for unit in units} == {500}
+
+
+def test_interrupted_run_resumes_only_unfinished_units(fake_cli, inputs, tmp_path):
+    def interrupt(unit, error):
+        raise KeyboardInterrupt
+
+    with BatchManifest(str(tmp_path / 'batch.db')) as manifest:
+        runner = _runner(fake_cli, manifest)
+        units = runner.plan(inputs, ['qa'], str(tmp_path / 'out'))
+        with pytest.raises(KeyboardInterrupt):
+            runner.run(units, on_result=interrupt)
+
+        done = [unit for unit in manifest.units() if unit['status'] == DONE]
+        # One worker: the unit that finished first, maybe the one running when interrupted
+        assert 1 <= len(done) < len(units)
+        calls_before = len(fake_cli.calls())
+
+        units = runner.plan(inputs, ['qa'], str(tmp_path / 'out'))
+        counts = runner.run(units)
+
+        assert counts == {'done': 3 - len(done), 'failed': 0, 'skipped': len(done)}
+        done_ids = {unit['id'] for unit in done}
+        resumed = sorted(Path(unit['input_path']).stem for unit in units if unit['id'] not in done_ids)
+        assert _run_inputs(fake_cli, calls_before) == resumed
+        assert {unit['status'] for unit in manifest.units()} == {DONE}
+
+
+def test_rerun_retries_failed_units_and_missing_outputs(fake_cli, inputs, tmp_path):
+    out = tmp_path / 'out'
+    assert fake_cli.invoke('batch', 'run', *inputs, '-g', 'qa', '-d', str(out)).exit_code == 0
+    with BatchManifest(str(out / '.ai-dev-batch.db')) as manifest:
+        a, b, c = manifest.units()
+        manifest.fail(b['id'], "boom", 0.1)
+    (out / 'c_qa.md').unlink()
+    calls_before = len(fake_cli.calls())
+
+    result = fake_cli.invoke('batch', 'run', *inputs, '-g', 'qa', '-d', str(out))
+
+    assert result.exit_code == 0, result.output
+    assert "Done: 2, failed: 0, skipped (already done): 1" in result.output
+    assert _run_inputs(fake_cli, calls_before) == ['b', 'c']
+
+
+def test_failed_units_exit_non_zero_and_show_in_status(fake_cli, inputs, tmp_path):
+    out = tmp_path / 'out'
+    fake_cli.set_mode('fail')
+
+    result = fake_cli.invoke('batch', 'run', *inputs[:2], '-g', 'qa', '-d', str(out))
+
+    assert result.exit_code == 1
+    assert "Done: 0, failed: 2" in result.output
+    status = fake_cli.invoke('batch', 'status', '-d', str(out)).output
+    assert "failed: 2" in status and "1 attempts" in status
+
+
+def test_retry_reuses_the_recorded_chunk_tokens(fake_cli, tmp_path):
+    source = tmp_path / 'large.txt'
+    source.write_text(LARGE_INPUT, encoding='utf-8')
+    out = tmp_path / 'out'
+    fake_cli.set_mode('fail')
+    assert fake_cli.invoke('batch', 'run', str(source), '-g', 'qa', '-d', str(out),
+                           '--chunk-tokens', '100').exit_code == 1
+    fake_cli.set_mode('ok')
+    calls_before = len(fake_cli.calls())
+
+    # 'batch retry' has no --chunk-tokens; the unit still runs in chunks
+    result = fake_cli.invoke('batch', 'retry', '-d', str(out))
+
+    assert result.exit_code == 0, result.output
+    assert len(fake_cli.calls()) - calls_before > 1
+    with BatchManifest(str(out / '.ai-dev-batch.db')) as manifest:
+        [unit] = manifest.units()
+    assert (unit['status'], unit['chunk_tokens'], unit['attempts']) == (DONE, 100, 2)
+
+
+def test_changed_input_fails_the_unit(fake_cli, inputs, tmp_path):
+    with BatchManifest(str(tmp_path / 'batch.db')) as manifest:
+        runner = _runner(fake_cli, manifest)
+        units = runner.plan(inputs[:1], ['qa'], str(tmp_path / 'out'))
+        with open(inputs[0], 'a', encoding='utf-8') as f:
+            f.write("追記")
+
+        assert runner.run(units) == {'done': 0, 'failed': 1, 'skipped': 0}
+        [unit] = manifest.units()
+
+    assert unit['status'] == FAILED and "Input changed" in unit['error']
+    assert not fake_cli.calls()
@@ -0,0 +1,125 @@
+"""Tests for the stub CLI and the offline pipeline benchmark"""
+
+import json
+import os
+import subprocess
+import sys
+
+from ai_dev.bench import StubEnvironment, run_pipeline_benchmark
+from ai_dev.bench import stub
+from ai_dev.bench.runner import STUB_SCRIPT, summarize
+from ai_dev.config.manager import ConfigManager
+from ai_dev.generators.qa import QAGenerator
+from ai_dev.utils.json_extract import extract_json
+from ai_dev.utils.metrics import metrics
+
+PROMPT = 'テスト項目を出力してください\n```json\n[{"test_id": "TC-001", "title": "...", "steps": "..."}]\n```\n'
+
+
+def _run_stub(prompt, *args, **env):
+    settings = {"AI_DEV_STUB_LATENCY": "0", **{f"AI_DEV_STUB_{k.upper()}": str(v) for k, v in env.items()}}
+    return subprocess.run([sys.executable, str(STUB_SCRIPT), *args], input=prompt, capture_output=True,
+                          text=True, encoding='utf-8', env={**os.environ, **settings}, timeout=30)
+
+
+def test_parse_args_accepts_both_cli_styles():
+    assert stub.parse_args(['--backend', 'gemini', '--model', 'flash', '--prompt', 'hi']) == ('gemini', 'flash', 'hi')
+    assert stub.parse_args(['--backend', 'claude', '--print', '--output-format', 'text', '--model=opus', 'hi']) \
+        == ('claude', 'opus', 'hi')
+
+
+def test_infer_fields_from_example_columns_or_default():
+    assert stub.infer_fields(PROMPT) == (["test_id", "title", "steps"], "TC-")
+    assert stub.infer_fields("列:\n- name: 名前\n- owner: 担当\n") == (["name", "owner"], "ITEM-")
+    assert stub.infer_fields("no hints") == (["id", "description"], "ITEM-")
+
+
+def test_stub_answers_with_the_prompt_shape_deterministically():
+    first = _run_stub(PROMPT, '--backend', 'gemini', items=3, seed=7)
+    second = _run_stub(PROMPT, '--backend', 'gemini', items=3, seed=7)
+    other_seed = _run_stub(PROMPT, '--backend', 'gemini', items=3, seed=8)
+
+    assert first.returncode == 0
+    assert first.stdout == second.stdout != other_seed.stdout
+    items, complete = extract_json(first.stdout)
+    assert complete
+    assert [item["test_id"] for item in items] == ["TC-001", "TC-002", "TC-003"]
+    assert set(items[0]) == {"test_id", "title", "steps"}
+
+
+def test_stub_failure_kinds():
+    limited = _run_stub(PROMPT, failure_rate=1, failure_kind='rate_limit')
+    failed = _run_stub(PROMPT, failure_rate=1)
+
+    assert limited.returncode == 1 and '429' in limited.stderr
+    assert failed.returncode == 1 and 'stub backend failure' in failed.stderr
+
+
+def test_stub_environment_sets_and_restores_settings(monkeypatch):
+    monkeypatch.setenv('AI_DEV_STUB_LATENCY', '9')
+    monkeypatch.delenv('AI_DEV_STUB_ITEMS', raising=False)
+
+    with StubEnvironment({'latency': 0, 'items': 2}) as env:
+        assert os.environ['AI_DEV_STUB_LATENCY'] == '0'
+        assert os.environ['AI_DEV_STUB_ITEMS'] == '2'
+        result = subprocess.run([env.command('claude'), '--print'], input=PROMPT, capture_output=True,
+                                text=True, encoding='utf-8', timeout=30)
+        directory = env.directory
+
+    assert result.returncode == 0
+    assert len(extract_json(result.stdout)[0]) == 2
+    assert os.environ['AI_DEV_STUB_LATENCY'] == '9'
+    assert 'AI_DEV_STUB_ITEMS' not in os.environ
+    assert not directory.exists()
+
+
+def test_summarize_splits_cli_time_from_overhead():
+    results = [
+        {"generator": "qa", "format": "md", "encoding": "utf-8", "run": 0, "seconds": 2.0, "items": 4, "status": "ok"},
+        {"generator": "qa", "format": "md", "encoding": "utf-8", "run": 1, "seconds": 9.0, "items": 0,
+         "status": "error: boom"},
+    ]
+    records = [
+        {"kind": "call", "seconds": 1.5},
+        {"kind": "stage", "stage": "generate", "seconds": 2.0},
+        {"kind": "stage", "stage": "parse", "seconds": 0.1},
+    ]
+
+    report = summarize(results, records, wall=4.0)
+
+    [case] = report["cases"]
+    assert (case["runs"], case["failures"], case["p50"], case["items_per_second"]) == (2, 1, 2.0, 2.0)
+    assert [row["stage"] for row in report["stages"]] == ["cli_call", "generate", "parse"]
+    assert (report["total_runs"], report["failures"], report["runs_per_second"]) == (2, 1, 0.5)
+    assert report["overhead_seconds"] == 0.5
+    assert report["overhead_share"] == 0.25
+
+
+def test_pipeline_benchmark_runs_every_combination(fake_cli):
+    config = ConfigManager(str(fake_cli.config_path))
+    saved = (metrics.path, metrics.enabled)
+
+    report = run_pipeline_benchmark(config, {"qa": QAGenerator}, formats=["md", "json"],
+                                    encodings=["utf-8", "shift-jis"], runs=2, jobs=4,
+                                    stub_settings={"latency": 0, "items": 2})
+
+    assert report["total_runs"] == 8 and report["failures"] == 0
+    assert [(c["format"], c["encoding"], c["runs"]) for c in report["cases"]] == [
+        ("json", "shift-jis", 2), ("json", "utf-8", 2), ("md", "shift-jis", 2), ("md", "utf-8", 2)]
+    stages = {row["stage"]: row["count"] for row in report["stages"]}
+    assert stages["cli_call"] == 8 and stages["generate"] == 8
+    # The benchmark's metrics stay out of the configured log
+    assert (metrics.path, metrics.enabled) == saved
+    assert not fake_cli.calls()
+
+
+def test_bench_pipeline_command_writes_json_report(fake_cli, tmp_path):
+    report_path = tmp_path / 'report.json'
+
+    result = fake_cli.invoke('bench', 'pipeline', '-g', 'qa', '-f', 'csv', '-e', 'utf-8',
+                             '--latency', '0', '--items', '2', '--json', str(report_path))
+
+    assert result.exit_code == 0, result.output
+    report = json.loads(report_path.read_text(encoding='utf-8'))
+    assert report["total_runs"] == 1 and report["failures"] == 0
+    assert not (fake_cli.directory / 'metrics.jsonl').exists()
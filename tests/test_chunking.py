@@ -0,0 +1,65 @@
+"""Tests for chunked-generation input splitting and result merging"""
+
+from ai_dev.generators.chunking import merge_items, split_into_chunks
+from ai_dev.utils.tokens import estimate_tokens
+
+
+def test_small_input_is_one_chunk():
+    assert split_into_chunks("短い入力", 100) == ["短い入力"]
+
+
+def test_splits_at_page_boundaries():
+    pages = [f"=== Page {n} ===\n" + "本文" * 30 + "\n" for n in range(1, 5)]
+    chunks = split_into_chunks(''.join(pages), 80)
+
+    assert len(chunks) == 4
+    assert [c.splitlines()[0] for c in chunks] == [f"=== Page {n} ===" for n in range(1, 5)]
+    assert ''.join(chunks) == ''.join(pages)
+
+
+def test_oversized_section_is_split_under_budget():
+    text = "# 見出し\n" + "\n\n".join("段落" * 20 for _ in range(10))
+    chunks = split_into_chunks(text, 50)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 50 for chunk in chunks)
+
+
+def test_single_huge_line_falls_back_to_slices():
+    chunks = split_into_chunks("あ" * 250, 100)
+
+    assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+
+
+def test_merge_renumbers_ids_across_chunks():
+    merged = merge_items([
+        [{"id": "REQ-001", "title": "ログイン"}, {"id": "REQ-002", "title": "ログアウト"}],
+        [{"id": "REQ-001", "title": "パスワード再設定"}],
+    ])
+
+    assert [item["id"] for item in merged] == ["REQ-001", "REQ-002", "REQ-003"]
+    assert merged[2]["title"] == "パスワード再設定"
+
+
+def test_merge_counts_each_prefix_separately():
+    merged = merge_items([
+        [{"test_id": "TC-01", "name": "a"}, {"test_id": "NFR-0001", "name": "b"}],
+        [{"test_id": "TC-07", "name": "c"}],
+    ])
+
+    assert [item["test_id"] for item in merged] == ["TC-001", "NFR-0001", "TC-002"]
+
+
+def test_merge_drops_duplicates_that_differ_only_by_id():
+    merged = merge_items([
+        [{"id": "REQ-001", "title": "ログイン"}],
+        [{"id": "REQ-005", "title": "ログイン"}, {"id": "REQ-006", "title": "2段階認証"}],
+    ])
+
+    assert merged == [{"id": "REQ-001", "title": "ログイン"}, {"id": "REQ-002", "title": "2段階認証"}]
+
+
+def test_merge_keeps_unnumbered_ids_and_skips_non_objects():
+    merged = merge_items([[{"id": "login", "title": "x"}, "stray text", {"title": "y"}]])
+
+    assert merged == [{"id": "login", "title": "x"}, {"title": "y"}]
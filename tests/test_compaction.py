@@ -0,0 +1,151 @@
+"""Tests for input compaction and the token budget"""
+
+import pytest
+
+from ai_dev.generators.compaction import (
+    CompactionReport, _enforce_budget, _strip_boilerplate, compact_text
+)
+from ai_dev.utils.sections import split_sections
+from ai_dev.utils.tokens import estimate_tokens
+
+
+def _pages(*bodies, label="Page"):
+    return "\n\n".join(f"=== {label} {n} ===\n{body}" for n, body in enumerate(bodies, 1))
+
+
+def test_split_sections_at_analyzer_markers_and_headings():
+    text = "前書き\n=== Page 1 ===\nA\n## 見出し\nB\n=== Sheet: 売上 ===\nC\n"
+
+    assert split_sections(text) == ["前書き\n", "=== Page 1 ===\nA\n", "## 見出し\nB\n", "=== Sheet: 売上 ===\nC\n"]
+    assert split_sections("本文のみ") == ["本文のみ"]
+
+
+def test_whitespace_width_and_repetition():
+    text = "ＡＢＣ１２３　テスト​   \n項目A      項目B\n----------\n"
+
+    compacted, report = compact_text(text)
+
+    assert compacted == "ABC123 テスト\n項目A  項目B\n---"
+    assert report.steps == {"width_folded": 7, "padding": 1, "repeated_chars": 1}
+
+
+def test_duplicate_lines_collapse_with_a_count():
+    compacted, report = compact_text("開始\n同じ行\n同じ行\n同じ行\n終了")
+
+    assert compacted == "開始\n同じ行 (×3)\n終了"
+    assert report.steps["duplicate_lines"] == 2
+
+
+def test_options_switch_steps_off():
+    text = "ＡＢＣ\n同じ行\n同じ行"
+
+    compacted, report = compact_text(text, options={"fold_width": False, "collapse_duplicate_lines": False})
+
+    assert compacted == text
+    assert report.steps == {}
+
+
+def test_indentation_and_none_outside_tables_are_kept():
+    code = "def f(x):\n" + " " * 16 + "return  None\nvalue  NaN  end"
+
+    compacted, report = compact_text(_pages(code))
+
+    assert " " * 16 + "return  None" in compacted
+    assert "value  NaN  end" in compacted
+    assert "empty_cells" not in report.steps
+
+
+def test_spreadsheet_sections_cap_indent_and_blank_empty_cells():
+    table = "            名前   金額\n0           りんご  100\n1           None    NaN"
+    text = f"=== Sheet: 売上 ===\n{table}\n\n=== Page 1 ===\n" + " " * 12 + "None  None"
+
+    compacted, report = compact_text(text)
+
+    sheet, page = split_sections(compacted)
+    assert sheet.split("\n")[1] == " " * 8 + "名前  金額"
+    assert sheet.split("\n")[3] == "1  -  -"
+    assert page.endswith(" " * 12 + "None  None")
+    assert report.steps["empty_cells"] == 2
+
+
+def test_strip_boilerplate_keeps_the_first_occurrence():
+    bodies = ["ログイン", "検索", "注文", "出荷"]
+    text = _pages(*(f"社外秘\n{body}の仕様\nPage {n} of 4" for n, body in enumerate(bodies, 1)))
+    report = CompactionReport(0)
+
+    stripped = _strip_boilerplate(text, report)
+
+    assert stripped.count("社外秘") == 1
+    assert stripped.count("of 4") == 1
+    assert all(f"{body}の仕様" in stripped for body in bodies)
+    assert report.steps["boilerplate_lines"] == 6
+
+
+def test_strip_boilerplate_leaves_short_documents_and_table_rows():
+    report = CompactionReport(0)
+    two_pages = _pages("社外秘\nA", "社外秘\nB")
+    sheets = _pages(*(f"名前  金額\n{fruit}  100" for fruit in ("りんご", "みかん", "ぶどう", "もも")),
+                    label="Sheet:")
+
+    assert _strip_boilerplate(two_pages, report) == two_pages
+    assert _strip_boilerplate(sheets, report) == sheets
+    assert report.steps == {}
+
+
+def test_enforce_budget_under_the_limit_is_a_no_op():
+    report = CompactionReport(0)
+
+    assert _enforce_budget("短い入力", 100, report) == "短い入力"
+    assert report.budget == 100 and not report.trimmed
+
+
+@pytest.mark.parametrize("max_tokens", [60, 120, 250, 400])
+def test_enforce_budget_keeps_whole_sections_and_the_marker_within_budget(max_tokens):
+    text = _pages(*("本文" * 40 for _ in range(6)))
+    report = CompactionReport(estimate_tokens(text))
+
+    trimmed = _enforce_budget(text, max_tokens, report)
+
+    assert estimate_tokens(trimmed) <= max_tokens
+    assert trimmed.endswith("トークンを省略しました ...]")
+    assert f"約{max_tokens:,}トークン" in trimmed
+    assert report.trimmed
+    assert report.trimmed_sections[-1] == "=== Page 6 ==="
+    assert text.startswith(trimmed[:trimmed.index("\n[...")].rstrip("\n"))
+
+
+def test_enforce_budget_too_small_for_the_marker_still_fits():
+    text = _pages(*("本文" * 40 for _ in range(3)))
+    report = CompactionReport(estimate_tokens(text))
+
+    trimmed = _enforce_budget(text, 10, report)
+
+    assert estimate_tokens(trimmed) <= 10
+    assert "省略" not in trimmed
+    assert report.trimmed_sections == ["=== Page 1 ===", "=== Page 2 ===", "=== Page 3 ==="]
+
+
+def test_compact_text_reports_the_budget():
+    text = _pages(*("本文" * 100 for _ in range(5)))
+
+    compacted, report = compact_text(text, max_tokens=300)
+
+    assert report.compacted_tokens == estimate_tokens(compacted) <= 300
+    assert report.budget == 300 and report.trimmed
+
+
+def test_compaction_report():
+    report = CompactionReport(200)
+    report.count("padding", 3)
+    report.count("padding", 2)
+    report.count("empty_cells", 0)
+    report.compacted_tokens = 150
+
+    assert report.saved_tokens == 50
+    assert report.reduction == 0.25
+    assert not report.trimmed
+    assert report.summary() == "200 → 150 tokens (-25%); padding 5"
+    assert report.as_dict() == {"original_tokens": 200, "compacted_tokens": 150, "budget": None,
+                                "steps": {"padding": 5}, "trimmed_tokens": 0, "trimmed_sections": []}
+    assert CompactionReport(0).reduction == 0.0
+    assert CompactionReport(10).summary() == "10 → 10 tokens (-0%)"
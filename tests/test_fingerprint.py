@@ -0,0 +1,144 @@
+"""Tests for fingerprint sidecars and skipping unchanged outputs"""
+
+import pytest
+
+from ai_dev.generators import get_generator
+from ai_dev.generators.fingerprint import (
+    read_sidecar, sidecar_path, up_to_date, write_sidecar
+)
+
+
+@pytest.fixture
+def spec(tmp_path):
+    path = tmp_path / 'spec.txt'
+    path.write_text("ログイン機能の仕様", encoding='utf-8')
+    return path
+
+
+@pytest.fixture
+def output(tmp_path):
+    return tmp_path / 'out' / 'qa.md'
+
+
+def _generate(fake_cli, spec, output, *args):
+    result = fake_cli.invoke('generate', 'qa', str(spec), '-o', str(output), *args)
+    assert result.exit_code == 0, result.output
+    return result
+
+
+def _regenerated(fake_cli, spec, output, *args):
+    """Whether another run called the model rather than skipping"""
+    before = len(fake_cli.calls())
+    result = _generate(fake_cli, spec, output, *args)
+    called = len(fake_cli.calls()) > before
+    assert called == ("Up to date" not in result.output)
+    return called
+
+
+def test_sidecar_records_the_output(fake_cli, spec, output):
+    _generate(fake_cli, spec, output)
+
+    record = read_sidecar(str(output))
+    assert record["output"] == str(output) and record["items"] == 3
+    fingerprint = record["fingerprint"]
+    assert fingerprint["generator"] == "QAGenerator" and fingerprint["mode"] == "single"
+    assert fingerprint["model"] == "gemini"
+    assert sidecar_path(str(output)).name == "qa.md.fingerprint.json"
+
+
+def test_unchanged_output_is_skipped(fake_cli, spec, output):
+    _generate(fake_cli, spec, output)
+
+    assert not _regenerated(fake_cli, spec, output)
+
+
+def test_changed_input_is_regenerated(fake_cli, spec, output):
+    _generate(fake_cli, spec, output)
+    spec.write_text("ログイン機能の仕様（改訂）", encoding='utf-8')
+
+    assert _regenerated(fake_cli, spec, output)
+    assert not _regenerated(fake_cli, spec, output)
+
+
+def test_changed_prompt_template_is_regenerated(fake_cli, spec, output, monkeypatch):
+    _generate(fake_cli, spec, output)
+    generator_class = get_generator('qa')
+    build_prompt = generator_class._build_prompt
+    monkeypatch.setattr(generator_class, '_build_prompt',
+                        lambda self, text, context: build_prompt(self, text, context) + "\n追加の指示")
+
+    assert _regenerated(fake_cli, spec, output)
+
+
+def test_prompt_version_bump_is_regenerated(fake_cli, spec, output, monkeypatch):
+    _generate(fake_cli, spec, output)
+    monkeypatch.setattr(get_generator('qa'), 'PROMPT_VERSION', 99)
+
+    assert _regenerated(fake_cli, spec, output)
+
+
+@pytest.mark.parametrize("change", [
+    lambda config: config["ai_models"]["gemini"].update(model="gemini-other"),
+    lambda config: config["ai_models"]["gemini"].update(options=["--sandbox"]),
+    lambda config: config["output"].update(encoding="shift-jis"),
+    lambda config: config.setdefault("generation", {}).setdefault("compaction", {}).update(fold_width=False),
+])
+def test_changed_model_or_output_settings_are_regenerated(fake_cli, spec, output, change):
+    _generate(fake_cli, spec, output)
+    change(fake_cli.config)
+    fake_cli.save()
+
+    assert _regenerated(fake_cli, spec, output)
+
+
+def test_model_selection_is_part_of_the_fingerprint(fake_cli, spec, output):
+    _generate(fake_cli, spec, output)
+    before = len(fake_cli.calls())
+
+    result = fake_cli.invoke('--ai', 'claude', 'generate', 'qa', str(spec), '-o', str(output))
+
+    assert result.exit_code == 0, result.output
+    assert len(fake_cli.calls()) > before
+
+
+def test_chunked_mode_is_part_of_the_fingerprint(fake_cli, spec, output):
+    _generate(fake_cli, spec, output)
+
+    assert _regenerated(fake_cli, spec, output, '--chunk-tokens', '500')
+    assert not _regenerated(fake_cli, spec, output, '--chunk-tokens', '500')
+    assert _regenerated(fake_cli, spec, output, '--chunk-tokens', '600')
+
+
+def test_force_regenerates(fake_cli, spec, output):
+    _generate(fake_cli, spec, output)
+
+    assert _regenerated(fake_cli, spec, output, '--force')
+
+
+def test_deleted_output_is_regenerated(fake_cli, spec, output):
+    _generate(fake_cli, spec, output)
+    output.unlink()
+
+    assert _regenerated(fake_cli, spec, output)
+    assert output.exists()
+
+
+def test_failed_generation_leaves_no_sidecar(fake_cli, spec, output):
+    fake_cli.set_mode('fail')
+
+    assert fake_cli.invoke('generate', 'qa', str(spec), '-o', str(output)).exit_code == 1
+    assert not sidecar_path(str(output)).exists()
+
+
+def test_up_to_date_and_corrupt_sidecars(tmp_path):
+    output = tmp_path / 'qa.md'
+    output.write_text("# QA", encoding='utf-8')
+    write_sidecar(str(output), {"digest": "abc"}, str(output), 2)
+
+    assert up_to_date(str(output), {"digest": "abc"})["items"] == 2
+    assert up_to_date(str(output), {"digest": "other"}) is None
+
+    sidecar_path(str(output)).write_text("{not json", encoding='utf-8')
+    assert read_sidecar(str(output)) is None
+    assert up_to_date(str(output), {"digest": "abc"}) is None
+    assert [p.name for p in tmp_path.iterdir() if p.name.startswith('.fingerprint-')] == []
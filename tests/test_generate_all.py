@@ -0,0 +1,36 @@
+"""Tests for 'generate all'"""
+
+# Output file stem of each generator
+STEMS = ['requirements', 'qa', 'tasks', 'test_concept', 'test_cases']
+
+
+def _input(fake_cli):
+    path = fake_cli.directory / 'spec.txt'
+    path.write_text("ユーザー認証システムの開発\n- ログイン\n- パスワードリセット\n", encoding='utf-8')
+    return str(path)
+
+
+def test_writes_every_document(fake_cli):
+    result = fake_cli.invoke('generate', 'all', _input(fake_cli), '-f', 'json')
+
+    assert result.exit_code == 0, result.output
+    for stem in STEMS:
+        assert (fake_cli.output_dir / f"{stem}.json").read_text(encoding='utf-8').count("ITEM-") == 3
+    assert len(fake_cli.calls()) == len(STEMS)
+
+
+def test_failed_generators_exit_non_zero(fake_cli):
+    fake_cli.set_mode('fail')
+
+    result = fake_cli.invoke('generate', 'all', _input(fake_cli))
+
+    assert result.exit_code == 1
+    assert "Failed:" in result.output
+
+
+def test_stream_with_chunked_is_one_usage_error(fake_cli):
+    result = fake_cli.invoke('generate', 'all', _input(fake_cli), '--stream', '--chunked')
+
+    assert result.exit_code == 2
+    assert result.output.count("--stream cannot be combined with --chunked") == 1
+    assert fake_cli.calls() == []
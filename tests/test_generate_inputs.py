@@ -0,0 +1,90 @@
+"""Tests for directory and glob inputs to 'generate <type>'"""
+
+import pytest
+
+from ai_dev.batch import expand_inputs, mirrored_outputs
+from ai_dev.generators import GENERATOR_TYPES
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for relative in ('spec.md', 'api/users.txt', 'api/orders.md', 'api/.draft.md', '.hidden/x.md', 'image.png'):
+        path = tmp_path / 'docs' / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("# 仕様\n本文\n", encoding='utf-8')
+    return tmp_path / 'docs'
+
+
+def _relative(inputs):
+    return [item.relative for item in inputs]
+
+
+def test_directory_is_searched_recursively_skipping_hidden_and_other_types(tree):
+    assert _relative(expand_inputs([str(tree)], ['.md', '.txt'])) == ['spec.md', 'api/orders.md', 'api/users.txt']
+
+
+def test_glob_is_relative_to_its_fixed_prefix(tree):
+    assert _relative(expand_inputs([f"{tree}/api/*.md"])) == ['orders.md']
+    assert _relative(expand_inputs([f"{tree}/**/*.md"])) == ['api/orders.md', 'spec.md']
+
+
+def test_file_reached_twice_is_generated_once(tree):
+    inputs = expand_inputs([str(tree / 'spec.md'), f"{tree}/*.md"])
+
+    assert [item.path for item in inputs] == [str(tree / 'spec.md')]
+
+
+def test_missing_inputs_raise(tree):
+    with pytest.raises(FileNotFoundError, match="does not exist"):
+        expand_inputs([str(tree / 'nope.md')])
+    with pytest.raises(FileNotFoundError, match="No input files"):
+        expand_inputs([f"{tree}/*.xlsx"])
+
+
+def test_outputs_mirror_the_tree_and_never_collide(tree):
+    (tree / 'api' / 'orders.txt').write_text("x", encoding='utf-8')
+    inputs = expand_inputs([str(tree)], ['.md', '.txt'])
+
+    assert mirrored_outputs(inputs, 'out', 'qa', 'md') == [
+        'out/spec_qa.md', 'out/api/orders_qa.md', 'out/api/orders_qa-2.md', 'out/api/users_qa.md'
+    ]
+
+
+def test_directory_input_writes_one_document_per_file(fake_cli, tree):
+    result = fake_cli.invoke('generate', 'qa', str(tree), '-d', str(fake_cli.output_dir), '-j', '2')
+
+    assert result.exit_code == 0, result.output
+    assert (fake_cli.output_dir / 'spec_qa.md').exists()
+    assert (fake_cli.output_dir / 'api' / 'users_qa.md').exists()
+    assert len(fake_cli.calls()) == 3
+
+
+def test_missing_path_is_a_usage_error(fake_cli, tree):
+    result = fake_cli.invoke('generate', 'tasks', str(tree / 'nope.md'))
+
+    assert result.exit_code == 2
+    assert "does not exist" in result.output
+
+
+@pytest.mark.parametrize("doc_type", list(GENERATOR_TYPES))
+def test_every_type_exits_non_zero_when_generation_fails(fake_cli, tree, doc_type):
+    fake_cli.set_mode('fail')
+
+    single = fake_cli.invoke('--verbose', 'generate', doc_type, str(tree / 'spec.md'))
+    several = fake_cli.invoke('generate', doc_type, str(tree), '-d', str(fake_cli.output_dir))
+
+    assert single.exit_code == 1
+    assert "Input encoding detected" in single.output and "Traceback" in single.output
+    assert several.exit_code == 1
+
+
+@pytest.mark.parametrize("doc_type", list(GENERATOR_TYPES))
+def test_every_type_writes_a_single_file(fake_cli, tree, doc_type):
+    output = fake_cli.output_dir / f"{doc_type}.json"
+
+    result = fake_cli.invoke('generate', doc_type, str(tree / 'spec.md'), '-o', str(output), '-f', 'json')
+
+    assert result.exit_code == 0, result.output
+    assert f"{GENERATOR_TYPES[doc_type][1]} generated" in result.output
+    assert "Items: 3" in result.output
+    assert output.exists()
@@ -0,0 +1,89 @@
+"""Tests for JSON extraction and salvage from model output"""
+
+import json
+import logging
+
+import pytest
+
+from ai_dev.ai_models.model_manager import ModelManager
+from ai_dev.utils.json_extract import extract_json
+from ai_dev.utils.json_stream import JSONItemStream
+
+DEEP = "[" * 100000 + "]" * 100000
+
+
+def test_plain_json():
+    assert extract_json('{"id": 1}') == ({"id": 1}, True)
+
+
+def test_fenced_json_wins_over_surrounding_prose():
+    text = '例: {"x": 0}\n```json\n[{"id": 1}]\n```\n以上です [参考]'
+
+    assert extract_json(text) == ([{"id": 1}], True)
+
+
+def test_unclosed_fence_is_read_to_the_end():
+    assert extract_json('```json\n[1, 2, 3]') == ([1, 2, 3], True)
+
+
+def test_prose_brackets_are_skipped():
+    text = '[注意] 以下が結果です { 例 } see [a]\n[{"id": 1}]'
+
+    assert extract_json(text) == ([{"id": 1}], True)
+
+
+def test_truncated_array_keeps_closed_elements():
+    text = '```json\n[{"id": 1}, {"id": 2}, {"id": 3, "title": "途中'
+
+    assert extract_json(text) == ([{"id": 1}, {"id": 2}], False)
+
+
+def test_malformed_element_mid_array_is_skipped():
+    text = '[{"id": 1}, {id: 2}, {"id": 3}, {"id": 4'
+
+    assert extract_json(text) == ([{"id": 1}, {"id": 3}], False)
+
+
+def test_nothing_decodable():
+    assert extract_json("JSONはありません [注意]") == (None, False)
+    assert extract_json("") == (None, False)
+
+
+@pytest.mark.parametrize("size", [1, 5, 17])
+def test_stream_agrees_with_whole_text_extraction(size):
+    text = '[注意] 結果:\n```json\n' + json.dumps([{"id": n, "s": "]},["} for n in range(5)]) + '\n```'
+    stream = JSONItemStream()
+    items = []
+    for start in range(0, len(text), size):
+        items.extend(stream.feed(text[start:start + size]))
+
+    assert items == extract_json(text)[0]
+
+
+def test_deep_nesting_is_malformed_not_an_error():
+    assert extract_json(DEEP) == (None, False)
+
+
+def test_deep_nesting_in_salvage_keeps_earlier_elements():
+    assert extract_json('[{"id": 1}, ' + DEEP[:50000]) == ([{"id": 1}], False)
+
+
+def test_deep_nesting_is_skipped_by_the_stream():
+    stream = JSONItemStream()
+
+    assert stream.feed('[{"id": 1}, ' + DEEP + ', {"id": 2}]') == [{"id": 1}, {"id": 2}]
+    assert stream.skipped == 1
+
+
+def test_truncated_response_is_logged_and_not_cached(fake_cli, caplog, capsys):
+    model = ModelManager(fake_cli.config).get_current_model()
+    discarded = []
+    model.discard_cached = discarded.append
+
+    with caplog.at_level(logging.WARNING, logger='ai_dev.ai_models.base'):
+        data = model.parse_output('```json\n[{"id": 1}, {"id": 2}, {"id"', 'json', 'prompt')
+
+    assert data == [{"id": 1}, {"id": 2}]
+    assert discarded == ['prompt']
+    assert any('recovered 2 complete item(s)' in r.getMessage() for r in caplog.records)
+    assert 'incomplete' not in capsys.readouterr().out
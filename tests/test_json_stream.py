@@ -0,0 +1,79 @@
+"""Tests for incremental JSON array item parsing"""
+
+import json
+
+import pytest
+
+from ai_dev.utils.json_stream import JSONItemStream
+
+ITEMS = [{"id": "REQ-001", "title": "ログイン", "tags": ["auth", "ui"]},
+         {"id": "REQ-002", "title": "括弧 ] と , を含む \"文字列\"", "note": None},
+         [1, 2, {"nested": {"deep": True}}], "plain", 42]
+OUTPUT = "生成結果です:\n```json\n" + json.dumps(ITEMS, ensure_ascii=False, indent=2) + "\n```\n"
+
+
+def _feed_all(stream, chunks):
+    items = []
+    for chunk in chunks:
+        items.extend(stream.feed(chunk))
+    return items
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(OUTPUT)])
+def test_items_are_the_same_however_the_text_is_split(size):
+    stream = JSONItemStream()
+    chunks = [OUTPUT[i:i + size] for i in range(0, len(OUTPUT), size)]
+
+    assert _feed_all(stream, chunks) == ITEMS
+    assert stream.done and stream.skipped == 0
+
+
+def test_items_are_emitted_as_soon_as_they_close():
+    stream = JSONItemStream()
+
+    assert stream.feed('[{"a": 1}, {"b"') == [{"a": 1}]
+    assert stream.feed(': 2}, ') == [{"b": 2}]
+    assert stream.feed('3]') == [3]
+    assert stream.done
+
+
+def test_prose_brackets_before_the_payload_are_ignored():
+    stream = JSONItemStream()
+    text = "[注意] 以下は { 例 } です see [a]\n[{\"id\": 1}]"
+
+    assert _feed_all(stream, text) == [{"id": 1}]
+
+
+def test_bracket_split_from_its_lookahead_still_starts_the_array():
+    stream = JSONItemStream()
+
+    assert stream.feed("結果: [") == []
+    assert stream.feed('{"id": 1}]') == [{"id": 1}]
+
+
+def test_bare_object_is_a_single_item():
+    stream = JSONItemStream()
+
+    assert _feed_all(stream, ['前置き {"id": 1, "x"', ': [1, 2]} 後書き {"id": 2}']) == [{"id": 1, "x": [1, 2]}]
+    assert stream.done
+
+
+def test_malformed_element_is_skipped():
+    stream = JSONItemStream()
+
+    assert stream.feed('[{"id": 1}, {id: 2}, {"id": 3}]') == [{"id": 1}, {"id": 3}]
+    assert stream.skipped == 1
+
+
+def test_truncated_tail_yields_only_closed_items():
+    stream = JSONItemStream()
+
+    assert stream.feed('[{"id": 1}, {"id": 2, "title": "途中で') == [{"id": 1}]
+    assert not stream.done
+
+
+def test_in_array_starts_inside_the_array():
+    stream = JSONItemStream(in_array=True)
+
+    assert stream.feed(' {"id": 1}, "x"]') == [{"id": 1}, "x"]
+
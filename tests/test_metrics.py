@@ -0,0 +1,143 @@
+"""Tests for the JSONL metrics log and the ``stats`` report"""
+
+import json
+import time
+
+import pytest
+
+from ai_dev.utils.metrics import MetricsLog, percentile
+
+
+def _log(tmp_path, **kwargs):
+    return MetricsLog(str(tmp_path / 'metrics.jsonl'), **kwargs)
+
+
+def test_records_round_trip(tmp_path):
+    log = _log(tmp_path)
+    log.record("call", model="m", seconds=1.5)
+
+    [entry] = log.read()
+    assert entry["kind"] == "call" and entry["model"] == "m" and entry["seconds"] == 1.5
+    assert "ts" in entry and "pid" in entry
+
+
+def test_disabled_log_writes_nothing(tmp_path):
+    log = _log(tmp_path, enabled=False)
+    log.record("call")
+
+    assert not log.path.exists()
+    assert log.read() == []
+
+
+def test_log_rotates_past_max_size(tmp_path):
+    log = _log(tmp_path, max_size_mb=200 / 1024 / 1024)
+    for n in range(10):
+        log.record("call", n=n, padding="x" * 40)
+
+    rotated = log.path.with_name('metrics.jsonl.1')
+    assert rotated.exists()
+    assert log.path.stat().st_size <= 200 + 100
+    assert rotated.stat().st_size <= 200 + 100
+    # Only the newest generations are kept, oldest first
+    numbers = [entry["n"] for entry in log.read()]
+    assert numbers == sorted(numbers) and numbers[-1] == 9 and numbers[0] > 0
+
+
+def test_read_skips_torn_lines_and_filters_by_time(tmp_path):
+    log = _log(tmp_path)
+    log.path.write_text(
+        json.dumps({"ts": 100, "kind": "call"}) + "\n"
+        + json.dumps({"ts": 200, "kind": "call"}) + "\n"
+        + '{"ts": 300, "ki', encoding='utf-8')
+
+    assert [entry["ts"] for entry in log.read()] == [100, 200]
+    assert [entry["ts"] for entry in log.read(since=150)] == [200]
+
+
+def test_clear_removes_rotated_file(tmp_path):
+    log = _log(tmp_path, max_size_mb=0)
+    log.record("call")
+    log.record("call")
+    log.clear()
+
+    assert log.read() == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stage_records_failures(tmp_path):
+    log = _log(tmp_path)
+    with log.stage("parse", model="m") as stage:
+        stage["items"] = 2
+    with pytest.raises(ValueError):
+        with log.stage("render"):
+            raise ValueError
+
+    parse, render = log.read()
+    assert (parse["stage"], parse["status"], parse["items"], parse["model"]) == ("parse", "ok", 2, "m")
+    assert (render["stage"], render["status"]) == ("render", "error")
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 100) == 100
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([], 50) is None
+
+
+def _write(fake_cli, records):
+    path = fake_cli.directory / 'metrics.jsonl'
+    path.write_text("".join(json.dumps(r) + "\n" for r in records), encoding='utf-8')
+
+
+def test_stats_aggregates_calls_generators_and_stages(fake_cli, monkeypatch):
+    monkeypatch.setenv('COLUMNS', '250')
+    now = time.time()
+    call = {"kind": "call", "backend": "gemini", "model": "flash", "attempts": 1, "requeues": 0,
+            "prompt_bytes": 2048}
+    _write(fake_cli, [
+        {**call, "ts": now - 50, "seconds": 1.0, "status": "ok"},
+        {**call, "ts": now - 40, "seconds": 3.0, "status": "ok", "requeues": 2, "attempts": 3},
+        {**call, "ts": now - 30, "seconds": 30.0, "status": "timeout"},
+        {**call, "ts": now - 20, "seconds": 2.0, "status": "rate_limited"},
+        {"kind": "stage", "ts": now - 10, "stage": "generate", "generator": "qa", "seconds": 4.0,
+         "status": "ok", "items": 6},
+        {"kind": "stage", "ts": now - 5, "stage": "parse", "seconds": 0.01, "status": "error"},
+        {"kind": "call", "backend": "gemini", "model": "flash", "ts": now - 10 * 86400,
+         "seconds": 9.0, "status": "ok"},
+    ])
+
+    result = fake_cli.invoke('stats', '--days', '1')
+
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    [model_row] = [line for line in lines if 'gemini / flash' in line]
+    # 4 calls: 2 failed, 1 timeout, 1 rate limited + 2 requeues, 2 KB prompts
+    cells = [cell.strip() for cell in model_row.split('│')[1:-1]]
+    assert cells[:5] == ['gemini / flash', '4', '2 (50%)', '1', '3']
+    assert cells[-2:] == ['1.50', '2.0']
+    [generator_row] = [line for line in lines if line.startswith('│ qa ')]
+    assert [cell.strip() for cell in generator_row.split('│')[1:4]] == ['qa', '1', '0 (0%)']
+    assert generator_row.split('│')[-2].strip() == '6.0'  # Avg items
+    [parse_row] = [line for line in lines if line.startswith('│ parse ')]
+    assert [cell.strip() for cell in parse_row.split('│')[1:4]] == ['parse', '1', '1']
+
+
+def test_generate_records_call_and_stage_metrics(fake_cli, tmp_path):
+    source = tmp_path / 'input.txt'
+    source.write_text("ログイン機能", encoding='utf-8')
+    assert fake_cli.invoke('generate', 'qa', str(source)).exit_code == 0
+
+    records = MetricsLog(str(fake_cli.directory / 'metrics.jsonl')).read()
+
+    [call] = [r for r in records if r["kind"] == "call"]
+    assert call["status"] == "ok" and call["attempts"] == 1
+    assert any(r["kind"] == "stage" and r["stage"] == "generate" and r["items"] == 3 for r in records)
+
+
+def test_stats_clear(fake_cli):
+    _write(fake_cli, [{"kind": "call", "ts": time.time(), "seconds": 1.0, "status": "ok"}])
+
+    assert 'cleared' in fake_cli.invoke('stats', '--clear').output
+    assert 'No metrics recorded yet' in fake_cli.invoke('stats').output
@@ -0,0 +1,141 @@
+"""Tests for packing many small inputs into one model call"""
+
+import pytest
+
+from ai_dev.bench import StubEnvironment
+from ai_dev.config.manager import ConfigManager
+from ai_dev.ai_models.model_manager import ModelManager
+from ai_dev.generators import PackedGenerationError
+from ai_dev.generators.packing import (
+    build_packed_input, pack_inputs, section_id, split_packed_response
+)
+from ai_dev.generators.qa import QAGenerator
+from ai_dev.utils.tokens import estimate_tokens
+
+
+def _inputs(count, size=10):
+    return [(f"doc{n}.txt", "あ" * size) for n in range(count)]
+
+
+def _names(packs):
+    return [[name for name, _ in pack] for pack in packs]
+
+
+def test_pack_inputs_respects_the_token_budget():
+    # 10 tokens of text + 20 for the section markers per input
+    packs = pack_inputs(_inputs(5), max_tokens=90, max_files=20)
+
+    assert _names(packs) == [["doc0.txt", "doc1.txt", "doc2.txt"], ["doc3.txt", "doc4.txt"]]
+
+
+def test_pack_inputs_respects_max_files():
+    packs = pack_inputs(_inputs(5), max_tokens=10_000, max_files=2)
+
+    assert [len(pack) for pack in packs] == [2, 2, 1]
+    assert [name for pack in packs for name, _ in pack] == [name for name, _ in _inputs(5)]
+
+
+def test_input_larger_than_a_pack_gets_a_pack_of_its_own():
+    inputs = [("small1", "a"), ("huge", "あ" * 500), ("small2", "b"), ("small3", "c")]
+
+    packs = pack_inputs(inputs, max_tokens=100, max_files=20)
+
+    assert _names(packs) == [["small1"], ["huge"], ["small2", "small3"]]
+    assert estimate_tokens(packs[1][0][1]) > 100
+
+
+def test_build_packed_input_tags_every_section():
+    packed = build_packed_input([("a.txt", "  本文A\n"), ("b.txt", "本文B")])
+
+    assert packed == "<<<S001: a.txt>>>\n本文A\n<<<END S001>>>\n\n<<<S002: b.txt>>>\n本文B\n<<<END S002>>>"
+    assert section_id(11) == "S012"
+
+
+def test_split_packed_response_by_section_id():
+    items = [
+        {"id": "QA-001", "section_id": "S002"},
+        {"id": "QA-001", "section_id": "S001"},
+        {"id": "QA-002", "section_id": "文書 S002"},
+    ]
+
+    grouped, unmatched = split_packed_response(items, 3)
+
+    assert grouped == {"S001": [{"id": "QA-001"}], "S002": [{"id": "QA-001"}, {"id": "QA-002"}], "S003": []}
+    assert unmatched == []
+
+
+def test_split_packed_response_accepts_an_object_keyed_by_section():
+    grouped, unmatched = split_packed_response([{"S001": [{"id": 1}, "noise"], "S002": {"id": 2}}], 2)
+
+    assert grouped == {"S001": [{"id": 1}], "S002": [{"id": 2}]}
+    assert unmatched == []
+
+
+def test_split_packed_response_keeps_missing_and_unknown_sections_apart():
+    items = [{"id": 1}, {"id": 2, "section_id": "S009"}, {"id": 3, "section_id": "S001"}, "text"]
+
+    grouped, unmatched = split_packed_response(items, 2)
+
+    assert grouped == {"S001": [{"id": 3}], "S002": []}
+    assert unmatched == [{"id": 1}, {"id": 2, "section_id": "S009"}, "text"]
+
+
+def _generator(fake_cli):
+    config = ConfigManager(str(fake_cli.config_path))
+    return QAGenerator(config, ModelManager(fake_cli.config))
+
+
+def _use_stub(fake_cli, stub):
+    for backend in ('gemini', 'claude'):
+        fake_cli.config["ai_models"][backend]["command"] = stub.command(backend)
+    fake_cli.save()
+
+
+def test_generate_packed_splits_a_tagged_response(fake_cli):
+    inputs = {f"doc{n}.txt": f"機能{n}の仕様" for n in range(3)}
+    with StubEnvironment({'latency': 0, 'items': 2}) as stub:
+        _use_stub(fake_cli, stub)
+
+        results = _generator(fake_cli).generate_packed(inputs, max_tokens=1000, max_files=10)
+
+    assert list(results) == list(inputs)
+    for items in results.values():
+        assert [item["id"] for item in items] == ["QA-001", "QA-002"]
+        assert all("section_id" not in item for item in items)
+
+
+def test_generate_packed_retries_untagged_inputs_alone(fake_cli):
+    # The fake CLI never tags items, so each input is generated again on its own
+    inputs = {f"doc{n}.txt": f"機能{n}の仕様" for n in range(3)}
+
+    results = _generator(fake_cli).generate_packed(inputs, max_tokens=1000, max_files=10)
+
+    assert [len(items) for items in results.values()] == [3, 3, 3]
+    calls = fake_cli.calls()
+    assert len(calls) == 4
+    assert sum("<<<S001" in call["stdin"] for call in calls) == 1
+
+
+def test_generate_packed_reports_failed_packs(fake_cli):
+    fake_cli.set_mode('fail')
+
+    with pytest.raises(PackedGenerationError) as excinfo:
+        _generator(fake_cli).generate_packed({"a.txt": "仕様A", "b.txt": "仕様B"}, max_files=1)
+
+    assert excinfo.value.results == {}
+    assert set(excinfo.value.errors) == {"a.txt", "b.txt"}
+
+
+def test_generate_pack_command_writes_one_file_per_input(fake_cli, tmp_path):
+    paths = []
+    for n in range(2):
+        path = tmp_path / f"spec{n}.txt"
+        path.write_text(f"機能{n}の仕様", encoding='utf-8')
+        paths.append(str(path))
+
+    with StubEnvironment({'latency': 0, 'items': 2}) as stub:
+        _use_stub(fake_cli, stub)
+        result = fake_cli.invoke('generate', 'pack', 'qa', *paths, '-f', 'json')
+
+    assert result.exit_code == 0, result.output
+    assert sorted(p.name for p in fake_cli.output_dir.glob('*.json')) == ["spec0_qa.json", "spec1_qa.json"]
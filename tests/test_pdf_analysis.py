@@ -0,0 +1,104 @@
+"""Tests for the single-pass PDF analysis report"""
+
+import io
+import json
+
+import pytest
+
+PyPDF2 = pytest.importorskip('PyPDF2')
+
+from ai_dev.analyzers.pdf import PDFAnalyzer
+
+PAGES = ["" if n % 7 == 0 else "\n".join(f"Page {n} line {line}. Section {n}.{line} text." for line in range(4))
+         for n in range(1, 41)]
+
+
+@pytest.fixture
+def document(make_pdf):
+    return make_pdf(PAGES)
+
+
+@pytest.fixture
+def extracted_pages(monkeypatch):
+    """Number of pages whose text has been extracted (in this process)"""
+    calls = []
+    extract_text = PyPDF2.PageObject.extract_text
+    monkeypatch.setattr(PyPDF2.PageObject, 'extract_text',
+                        lambda self, *args, **kwargs: calls.append(1) or extract_text(self, *args, **kwargs))
+    return calls
+
+
+def test_full_text_is_only_included_on_request(document):
+    analyzer = PDFAnalyzer(workers=1)
+
+    report = analyzer.analyze(str(document))
+    full = analyzer.analyze(str(document), full_text=True)
+
+    assert "full_text" not in report
+    assert full.pop("full_text").startswith("=== Page 1 ===\nPage 1 line 0.")
+    assert full == report
+
+
+def test_statistics_and_summary_are_measured_over_the_full_text(document):
+    analyzer = PDFAnalyzer(workers=1)
+    report = analyzer.analyze(str(document), full_text=True)
+    full_text = report["full_text"]
+
+    assert report["statistics"] == {
+        "total_pages": 40,
+        "total_characters": len(full_text),
+        "total_words": len(full_text.split()),
+        "average_chars_per_page": len(full_text) // 40,
+    }
+    assert report["summary"] == analyzer._generate_summary(full_text)
+
+
+def test_content_preview_is_the_start_of_the_extracted_text(document):
+    analyzer = PDFAnalyzer(workers=1)
+
+    preview = analyzer.analyze(str(document))["content_preview"]
+
+    assert preview == {"text": analyzer.extract_text(str(document))[:1000], "truncated": True}
+
+
+def test_page_range_statistics(document):
+    report = PDFAnalyzer(workers=1).analyze(str(document), pages='2-3', full_text=True)
+
+    assert report["full_text"] == '\n\n'.join(f"=== Page {n} ===\n{PAGES[n - 1]}" for n in (2, 3))
+    assert report["statistics"]["total_characters"] == len(report["full_text"])
+    assert report["pdf_info"]["page_range"] == '2-3'
+
+
+def test_summary_only_stops_reading_early(document, extracted_pages):
+    analyzer = PDFAnalyzer(workers=1)
+    summary = analyzer.analyze(str(document))["summary"]
+    del extracted_pages[:]
+
+    report = analyzer.analyze(str(document), summary_only=True)
+
+    assert report["summary"] == summary
+    assert "pages" not in report and "statistics" not in report
+    assert 0 < len(extracted_pages) < 10
+
+
+def test_text_output_is_written_during_the_same_pass(document, extracted_pages):
+    analyzer = PDFAnalyzer(workers=1)
+    text = io.StringIO()
+
+    analyzer.analyze(str(document), text_output=text)
+
+    assert len(extracted_pages) == 40
+    assert text.getvalue() == analyzer.extract_text(str(document))
+
+
+def test_full_text_option(fake_cli, document, tmp_path):
+    plain, full = tmp_path / 'plain.json', tmp_path / 'full.json'
+
+    assert fake_cli.invoke('analyze', 'file', str(document), '-f', 'json', '-o', str(plain)).exit_code == 0
+    assert fake_cli.invoke('analyze', 'file', str(document), '-f', 'json', '-o', str(full),
+                           '--full-text').exit_code == 0
+
+    assert "full_text" not in json.loads(plain.read_text(encoding='utf-8'))
+    assert json.loads(full.read_text(encoding='utf-8'))["full_text"].endswith("Page 40 line 3. Section 40.3 text.")
+    result = fake_cli.invoke('analyze', 'file', str(document), '--summary-only', '--full-text')
+    assert "cannot be combined with" in result.output
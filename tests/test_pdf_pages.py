@@ -0,0 +1,55 @@
+"""Tests for PDF page-range selection"""
+
+import pytest
+
+from ai_dev.analyzers.pdf import PDFAnalyzer, parse_page_ranges
+
+
+@pytest.mark.parametrize("spec, expected", [
+    (None, list(range(10))),
+    ("", list(range(10))),
+    ("1-3", [0, 1, 2]),
+    ("4", [3]),
+    ("3,7-9", [2, 6, 7, 8]),
+    ("8-", [7, 8, 9]),
+    ("-2", [0, 1]),
+    (" 2 - 3 , 2 ", [1, 2]),
+    ("9-50", [8, 9]),
+    ("5-5", [4]),
+])
+def test_valid_specs(spec, expected):
+    assert parse_page_ranges(spec, 10) == expected
+
+
+@pytest.mark.parametrize("spec", ["abc", "1-x", "1-2-3", "1,,2", "3,", "1.5"])
+def test_malformed_specs(spec):
+    with pytest.raises(ValueError, match="use e.g."):
+        parse_page_ranges(spec, 10)
+
+
+@pytest.mark.parametrize("spec", ["0", "0-3", "5-3"])
+def test_invalid_ranges(spec):
+    with pytest.raises(ValueError, match="Invalid page range"):
+        parse_page_ranges(spec, 10)
+
+
+@pytest.mark.parametrize("spec", ["11", "20-30", "300-"])
+def test_ranges_outside_the_document(spec):
+    with pytest.raises(ValueError, match=r"outside the document \(10 pages\)"):
+        parse_page_ranges(spec, 10)
+
+
+def test_analyze_reads_only_selected_pages(tmp_path):
+    PyPDF2 = pytest.importorskip('PyPDF2')
+    writer = PyPDF2.PdfWriter()
+    for _ in range(10):
+        writer.add_blank_page(width=200, height=200)
+    path = tmp_path / 'blank.pdf'
+    with open(path, 'wb') as f:
+        writer.write(f)
+
+    result = PDFAnalyzer(workers=1).analyze(str(path), pages='3-5,9-')
+
+    assert result['pdf_info']['page_count'] == 10
+    assert [page['page_number'] for page in result['pages']] == [3, 4, 5, 9, 10]
+    assert result['statistics']['total_pages'] == 5
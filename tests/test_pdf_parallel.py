@@ -0,0 +1,49 @@
+"""Tests that parallel PDF extraction matches the serial reading of the pages"""
+
+import pytest
+
+PyPDF2 = pytest.importorskip('PyPDF2')
+
+from ai_dev.analyzers.pdf import PDFAnalyzer
+
+# Every seventh page is blank; blank pages are kept in full_text but left out of extract_text
+PAGES = ["" if n % 7 == 0 else "\n".join(f"Page {n} line {line}. Section {n}.{line} text." for line in range(4))
+         for n in range(1, 41)]
+
+
+@pytest.fixture
+def document(make_pdf):
+    return make_pdf(PAGES)
+
+
+@pytest.fixture
+def parallel(monkeypatch):
+    """An analyzer using a pool of three processes even for a short document"""
+    monkeypatch.setattr(PDFAnalyzer, 'PARALLEL_MIN_PAGES', 1)
+    return PDFAnalyzer(workers=3)
+
+
+def _reference_blocks(path):
+    """Page blocks as the original serial loop built them"""
+    reader = PyPDF2.PdfReader(str(path))
+    return [f"=== Page {page_num} ===\n{page.extract_text()}" for page_num, page in enumerate(reader.pages, 1)]
+
+
+def test_extracted_text_matches_the_serial_reading(document, parallel):
+    expected = '\n\n'.join(block for block in _reference_blocks(document) if block.split('\n', 1)[1].strip())
+
+    assert parallel.extract_text(str(document)) == expected
+    assert PDFAnalyzer(workers=1).extract_text(str(document)) == expected
+    assert "=== Page 7 ===" not in expected and "Page 40 line 3." in expected
+
+
+def test_analysis_matches_the_serial_reading(document, parallel):
+    serial = PDFAnalyzer(workers=1).analyze(str(document), full_text=True)
+
+    result = parallel.analyze(str(document), full_text=True)
+
+    assert result == serial
+    assert result["full_text"] == '\n\n'.join(_reference_blocks(document))
+    assert [page["page_number"] for page in result["pages"]] == list(range(1, 41))
+    assert result["statistics"]["total_characters"] == len(result["full_text"])
+
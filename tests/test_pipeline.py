@@ -0,0 +1,94 @@
+"""Tests for running generator stages as a dependency DAG"""
+
+import threading
+
+import pytest
+
+from ai_dev.generators.pipeline import PIPELINE, run_dag, upstream_input, with_dependencies
+
+
+def _recording_stage(order):
+    def run_stage(stage, upstream):
+        order.append((stage, sorted(upstream)))
+        return [{"id": f"{stage}-1", "from": sorted(upstream)}]
+    return run_stage
+
+
+def test_with_dependencies_selects_upstream_stages():
+    assert with_dependencies(['test-cases']) == {
+        'requirements': [],
+        'test-concept': ['requirements'],
+        'test-cases': ['test-concept'],
+    }
+    assert with_dependencies(['qa']) == {'qa': []}
+    assert list(with_dependencies(['tasks', 'test-concept'])) == ['requirements', 'tasks', 'test-concept']
+
+
+def test_with_dependencies_rejects_unknown_stage():
+    with pytest.raises(KeyError):
+        with_dependencies(['design'])
+
+
+def test_stages_run_after_their_dependencies():
+    order = []
+    results, errors = run_dag(PIPELINE, _recording_stage(order), max_workers=4)
+
+    assert errors == {}
+    assert set(results) == set(PIPELINE)
+    position = {stage: i for i, (stage, _) in enumerate(order)}
+    for stage, deps in PIPELINE.items():
+        assert all(position[dep] < position[stage] for dep in deps)
+    assert dict(order)['test-cases'] == ['test-concept']
+    assert results['tasks'] == [{"id": "tasks-1", "from": ['requirements']}]
+
+
+def test_selected_stages_only():
+    order = []
+    results, _ = run_dag(with_dependencies(['test-concept']), _recording_stage(order), max_workers=1)
+
+    assert [stage for stage, _ in order] == ['requirements', 'test-concept']
+    assert set(results) == {'requirements', 'test-concept'}
+
+
+def test_independent_stages_run_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def run_stage(stage, upstream):
+        barrier.wait()  # Deadlocks unless both roots are running at once
+        return []
+
+    results, errors = run_dag({'requirements': [], 'qa': []}, run_stage, max_workers=2)
+
+    assert errors == {} and set(results) == {'requirements', 'qa'}
+
+
+def test_failure_skips_downstream_but_not_independent_stages():
+    ran = []
+
+    def run_stage(stage, upstream):
+        ran.append(stage)
+        if stage == 'requirements':
+            raise RuntimeError("AI failed")
+        return []
+
+    reported = {}
+    results, errors = run_dag(PIPELINE, run_stage, max_workers=2,
+                              on_stage=lambda stage, items, error: reported.setdefault(stage, error))
+
+    assert sorted(ran) == ['qa', 'requirements']
+    assert set(results) == {'qa'}
+    assert str(errors['requirements']) == "AI failed"
+    assert "upstream requirements failed" in str(errors['tasks'])
+    assert "upstream test-concept failed" in str(errors['test-cases'])
+    assert set(reported) == set(PIPELINE)
+
+
+def test_unresolvable_dag_raises():
+    with pytest.raises(ValueError, match="b"):
+        run_dag({'a': [], 'b': ['c']}, lambda stage, upstream: [])
+
+
+def test_upstream_input_is_compact_json_lines():
+    text = upstream_input({'requirements': [{"id": "REQ-001", "title": "ログイン", "note": ""}, "stray"]})
+
+    assert text == '==== 要件定義（1件） ====\n{"id":"REQ-001","title":"ログイン"}'
@@ -0,0 +1,168 @@
+"""Tests for routing and failover across a pool of model backends"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ai_dev.ai_models.model_manager import ModelManager
+from ai_dev.ai_models.pool import BackendStats, ModelPool
+
+
+class FakeBackend:
+    """Model stand-in answering with its own name, or failing"""
+
+    max_input_tokens = None
+
+    def __init__(self, name, fail=False, items=2):
+        self.name = name
+        self.fail = fail
+        self.items = items
+        self.calls = 0
+
+    def _answer(self):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError(f"{self.name} is down")
+        return [{"id": n, "backend": self.name} for n in range(self.items)]
+
+    def generate(self, prompt, output_format='json', encoding='utf-8'):
+        return self._answer()
+
+    async def agenerate(self, prompt, output_format='json', encoding='utf-8'):
+        return self._answer()
+
+    def stream_generate(self, prompt, output_format='json', encoding='utf-8'):
+        self.calls += 1
+        for n in range(self.items):
+            yield {"id": n, "backend": self.name}
+        if self.fail:
+            raise RuntimeError(f"{self.name} broke mid-stream")
+
+
+def _pool(**backends):
+    return ModelPool(backends, failure_cooldown=30)
+
+
+def test_untried_backends_go_first_then_the_fastest():
+    pool = _pool(a=FakeBackend('a'), b=FakeBackend('b'), c=FakeBackend('c'))
+    pool.stats['a'].record_success(2.0)
+    pool.stats['b'].record_success(0.5)
+
+    assert pool.ranked() == ['c', 'b', 'a']
+
+
+def test_in_flight_requests_spread_load():
+    pool = _pool(a=FakeBackend('a'), b=FakeBackend('b'))
+    pool.stats['a'].record_success(1.0)
+    pool.stats['b'].record_success(1.5)
+    pool.stats['a'].inflight = 1
+
+    assert pool.ranked() == ['b', 'a']
+
+
+def test_failover_to_the_next_backend_and_cool_down_the_failed_one(caplog):
+    down, up = FakeBackend('down', fail=True), FakeBackend('up')
+    pool = _pool(down=down, up=up)
+    pool.stats['up'].record_success(5.0)  # 'down' is untried, so it is tried first
+
+    with caplog.at_level('WARNING'):
+        items = pool.generate("prompt")
+
+    assert [item["backend"] for item in items] == ['up', 'up']
+    assert "down failed, trying the next backend" in caplog.text
+    assert pool.ranked() == ['up', 'down']
+    assert pool.status()['down']['cooling_down'] and pool.status()['down']['error_rate'] == 1.0
+
+
+def test_cooldown_grows_with_consecutive_failures():
+    stats = BackendStats()
+    stats.record_failure(10)
+    first = stats.cooldown_until
+    stats.record_failure(10)
+
+    assert stats.cooldown_until - first == pytest.approx(10, abs=0.5)
+    stats.record_success(1.0)
+    assert stats.consecutive_failures == 0
+
+
+def test_all_backends_failing_raises_with_every_error():
+    pool = _pool(a=FakeBackend('a', fail=True), b=FakeBackend('b', fail=True))
+
+    with pytest.raises(RuntimeError, match=r"All backends in the model pool failed \(.*a is down.*b is down"):
+        pool.generate("prompt")
+
+
+def test_async_failover():
+    pool = _pool(a=FakeBackend('a', fail=True), b=FakeBackend('b'))
+    pool.stats['b'].record_success(1.0)
+
+    items = asyncio.run(pool.agenerate("prompt"))
+
+    assert items[0]["backend"] == 'b'
+
+
+def test_stream_fails_over_only_before_the_first_item():
+    empty_failure = FakeBackend('a', fail=True, items=0)
+    pool = _pool(a=empty_failure, b=FakeBackend('b'))
+    pool.stats['b'].record_success(1.0)
+    assert [item["backend"] for item in pool.stream_generate("prompt")] == ['b', 'b']
+
+    partial = _pool(a=FakeBackend('a', fail=True), b=FakeBackend('b'))
+    partial.stats['b'].record_success(1.0)
+    with pytest.raises(RuntimeError, match="mid-stream"):
+        list(partial.stream_generate("prompt"))
+    assert partial.backends['b'].calls == 0
+
+
+def test_concurrent_requests_use_several_backends():
+    a, b = FakeBackend('a'), FakeBackend('b')
+    pool = _pool(a=a, b=b)
+    barrier = threading.Barrier(2, timeout=5)
+
+    def slow_answer(backend):
+        original = backend.generate
+
+        def generate(*args):
+            barrier.wait()  # Both requests are in flight before either finishes
+            return original(*args)
+        return generate
+    a.generate, b.generate = slow_answer(a), slow_answer(b)
+
+    threads = [threading.Thread(target=pool.generate, args=("prompt",)) for _ in range(2)]
+    threads[0].start()
+    while not any(stats.inflight for stats in pool.stats.values()):
+        time.sleep(0.01)
+    threads[1].start()
+    for thread in threads:
+        thread.join()
+
+    assert (a.calls, b.calls) == (1, 1)
+
+
+def test_model_manager_builds_the_pool_from_config(fake_cli):
+    fake_cli.config["ai_models"]["gemini"]["models"] = {"available": ["gemini-2.5-pro", "gemini-2.5-flash"]}
+    fake_cli.config["ai_models"]["pool"] = {"members": ["claude", "gemini:gemini-2.5-flash"]}
+    manager = ModelManager(fake_cli.config, pool=True)
+
+    pool = manager.get_current_model()
+
+    assert list(pool.backends) == ["claude", "gemini:gemini-2.5-flash"]
+    assert pool.backends["gemini:gemini-2.5-flash"].model_name == "gemini-2.5-flash"
+    assert len(pool.generate("prompt")) == 3
+
+
+def test_pool_defaults_to_every_available_variant(fake_cli):
+    fake_cli.config["ai_models"]["gemini"]["models"] = {"available": ["gemini-2.5-pro", "gemini-2.5-flash"]}
+
+    assert ModelManager(fake_cli.config).pool_members() == [
+        "gemini:gemini-2.5-pro", "gemini:gemini-2.5-flash", "claude"
+    ]
+
+
+def test_unavailable_members_are_left_out(fake_cli):
+    fake_cli.config["ai_models"]["claude"]["command"] = "/nonexistent/claude"
+    fake_cli.config["ai_models"]["pool"] = {"members": ["claude", "gemini"]}
+
+    assert list(ModelManager(fake_cli.config, pool=True).get_current_model().backends) == ["gemini"]
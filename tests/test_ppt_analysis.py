@@ -0,0 +1,140 @@
+"""Tests that the single-visit PowerPoint analyzer matches the original three-pass one"""
+
+import pytest
+
+pptx = pytest.importorskip('pptx')
+Image = pytest.importorskip('PIL.Image')
+
+from pptx import Presentation
+from pptx.util import Inches
+
+from ai_dev.analyzers.ppt import PPTAnalyzer
+
+
+@pytest.fixture
+def deck(tmp_path):
+    """A deck with titled and untitled slides, text boxes, tables, pictures and a blank slide"""
+    picture = tmp_path / 'logo.png'
+    Image.new('RGB', (8, 8), 'red').save(picture)
+    prs = Presentation()
+    title_layout, content_layout, blank_layout = prs.slide_layouts[0], prs.slide_layouts[1], prs.slide_layouts[6]
+
+    slide = prs.slides.add_slide(title_layout)
+    slide.shapes.title.text = "Quarterly review"
+    slide.placeholders[1].text = "Sales and operations"
+    for n in range(2, 8):
+        slide = prs.slides.add_slide(content_layout)
+        slide.shapes.title.text = f"Topic {n}" if n % 3 else ""
+        slide.placeholders[1].text = f"Point {n}.1\nPoint {n}.2"
+        box = slide.shapes.add_textbox(Inches(1), Inches(5), Inches(4), Inches(1))
+        box.text_frame.text = f"Note for slide {n} " * (n * 3)
+        if n % 2 == 0:
+            table = slide.shapes.add_table(2, 3, Inches(1), Inches(6), Inches(4), Inches(1)).table
+            for row in range(2):
+                for column in range(3):
+                    table.cell(row, column).text = f"r{row}c{column} s{n}"
+        if n % 3 == 0:
+            slide.shapes.add_picture(str(picture), Inches(6), Inches(1))
+    prs.slides.add_slide(blank_layout)
+    slide = prs.slides.add_slide(blank_layout)
+    slide.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1)).text_frame.text = "Closing remarks " * 10
+
+    path = tmp_path / 'deck.pptx'
+    prs.save(path)
+    return path
+
+
+def _reference_analysis(path):
+    """The report as the original analyzer built it: one pass for text, one for tables, one for pictures"""
+    prs = Presentation(path)
+    slides, all_text, tables, images = [], [], [], 0
+    for slide_num, slide in enumerate(prs.slides, 1):
+        texts = [shape.text.strip() for shape in slide.shapes if hasattr(shape, "text") and shape.text.strip()]
+        titles = [shape.text.strip() for shape in slide.shapes
+                  if hasattr(shape, "text") and shape.text.strip() and shape == slide.shapes.title]
+        slides.append({
+            "slide_number": slide_num,
+            "title": titles[-1] if titles else (texts[0][:50] if texts else ""),
+            "has_title": bool(titles),
+            "text_boxes": len(texts),
+            "text_content": texts,
+            "layout": slide.slide_layout.name if slide.slide_layout else "Custom",
+        })
+        all_text.extend(texts)
+    for slide_num, slide in enumerate(prs.slides, 1):
+        for shape in slide.shapes:
+            if shape.has_table:
+                tables.append({"slide": slide_num, "rows": len(shape.table.rows),
+                               "columns": len(shape.table.columns),
+                               "data": [[cell.text.strip() for cell in row.cells] for row in shape.table.rows]})
+    for slide in prs.slides:
+        images += sum(1 for shape in slide.shapes if shape.shape_type == 13)
+
+    first = prs.slides[0]
+    if first.shapes.title:
+        title = first.shapes.title.text.strip()
+    else:
+        title = next((s.text.strip()[:100] for s in first.shapes if hasattr(s, "text") and s.text.strip()),
+                     "Untitled Presentation")
+    return {
+        "presentation_info": {"slide_count": len(prs.slides), "title": title,
+                              "slide_width": prs.slide_width, "slide_height": prs.slide_height},
+        "slides": slides,
+        "statistics": {
+            "total_slides": len(prs.slides),
+            "total_text_boxes": sum(s["text_boxes"] for s in slides),
+            "total_words": len(' '.join(all_text).split()),
+            "tables_count": len(tables),
+            "images_count": images,
+        },
+        "tables": tables,
+        "full_text": '\n\n'.join(all_text),
+        "outline": [f"{s['slide_number']}. {s['title']}" for s in slides if s["title"]],
+    }
+
+
+def _reference_text(path):
+    blocks = []
+    for slide_num, slide in enumerate(Presentation(path).slides, 1):
+        texts = [shape.text.strip() for shape in slide.shapes if hasattr(shape, "text") and shape.text.strip()]
+        if texts:
+            blocks.append('\n'.join([f"=== Slide {slide_num} ==="] + texts))
+    return '\n\n'.join(blocks)
+
+
+@pytest.fixture
+def parallel(monkeypatch):
+    """An analyzer using a pool of two processes even for a short deck"""
+    monkeypatch.setattr(PPTAnalyzer, 'PARALLEL_MIN_SLIDES', 1)
+    monkeypatch.setattr(PPTAnalyzer, 'RANGE_SLIDES', 3)
+    return PPTAnalyzer(workers=2)
+
+
+def test_analysis_matches_the_original_analyzer(deck):
+    result = PPTAnalyzer(workers=1).analyze(str(deck))
+
+    assert result.pop("file_info")["name"] == "deck.pptx"
+    assert result == _reference_analysis(deck)
+    assert result["statistics"]["tables_count"] == 3 and result["statistics"]["images_count"] == 2
+    assert result["presentation_info"]["title"] == "Quarterly review"
+    assert [s["has_title"] for s in result["slides"]][:4] == [True, True, False, True]
+
+
+def test_extracted_text_matches_the_original_analyzer(deck):
+    text = PPTAnalyzer(workers=1).extract_text(str(deck))
+
+    assert text == _reference_text(deck)
+    assert "=== Slide 8 ===" not in text and "=== Slide 9 ===\nClosing remarks" in text
+
+
+def test_parallel_visits_match_the_serial_ones(deck, parallel, monkeypatch):
+    serial = PPTAnalyzer(workers=1)
+    expected = serial.analyze(str(deck)), serial.extract_text(str(deck))
+    visits_here = []
+    visit_slide = PPTAnalyzer._visit_slide
+    monkeypatch.setattr(PPTAnalyzer, '_visit_slide',
+                        lambda self, *args: visits_here.append(1) or visit_slide(self, *args))
+
+    assert (parallel.analyze(str(deck)), parallel.extract_text(str(deck))) == expected
+    assert visits_here == []  # Every slide was visited in a worker process
+
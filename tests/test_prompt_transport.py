@@ -0,0 +1,39 @@
+"""Tests for passing prompts to the CLIs over stdin or argv"""
+
+import pytest
+
+from ai_dev.ai_models.model_manager import ModelManager
+
+
+def _model(fake_cli, backend, transport):
+    fake_cli.config["ai_models"][backend]["prompt_transport"] = transport
+    manager = ModelManager(fake_cli.config)
+    manager.use_model(backend)
+    return manager.get_current_model()
+
+
+@pytest.mark.parametrize("backend", ["gemini", "claude"])
+def test_stdin_transport_keeps_the_prompt_out_of_argv(fake_cli, backend):
+    items = _model(fake_cli, backend, 'stdin').generate("ログイン機能の要件")
+
+    call, = fake_cli.calls()
+    assert len(items) == 3
+    assert "ログイン機能の要件" in call["stdin"]
+    assert not any("ログイン機能の要件" in arg for arg in call["argv"])
+
+
+@pytest.mark.parametrize("backend, flag", [("gemini", "--prompt"), ("claude", "--print")])
+def test_argv_transport(fake_cli, backend, flag):
+    _model(fake_cli, backend, 'argv').generate("ログイン機能の要件")
+
+    call, = fake_cli.calls()
+    assert flag in call["argv"]
+    assert any("ログイン機能の要件" in arg for arg in call["argv"])
+    assert call["stdin"] == ""
+
+
+def test_prompt_larger_than_arg_max_goes_through_stdin(fake_cli):
+    prompt = "仕様" * 2_000_000  # ~12 MB of UTF-8, far past ARG_MAX
+
+    assert len(_model(fake_cli, 'gemini', 'stdin').generate(prompt)) == 3
+    assert prompt in fake_cli.calls()[0]["stdin"]
@@ -0,0 +1,147 @@
+"""Tests for the cross-process token-bucket rate limiter"""
+
+import json
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from ai_dev.ai_models import ratelimit
+from ai_dev.ai_models.ratelimit import RateLimiter, is_rate_limited
+
+
+class FakeClock:
+    """Stands in for the time module so waits advance a virtual clock"""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        # Like a real sleep, never returns without time passing
+        self.sleeps.append(seconds)
+        self.now += max(seconds, 0.001)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(ratelimit, 'time', SimpleNamespace(time=fake.time, sleep=fake.sleep))
+    return fake
+
+
+def _limiter(tmp_path, **kwargs):
+    return RateLimiter('gemini', directory=str(tmp_path), **kwargs)
+
+
+def _state(tmp_path):
+    return json.loads((tmp_path / 'gemini.json').read_text(encoding='utf-8'))
+
+
+def test_disabled_limiter_never_waits(tmp_path, clock):
+    limiter = _limiter(tmp_path)
+
+    assert not limiter.enabled
+    assert limiter.acquire(10_000) is None
+    assert clock.sleeps == []
+
+
+def test_request_bucket_waits_for_refill(tmp_path, clock):
+    limiter = _limiter(tmp_path, requests_per_minute=2)
+    limiter.release(limiter.acquire())
+    limiter.release(limiter.acquire())
+    assert clock.sleeps == []
+
+    limiter.release(limiter.acquire())
+
+    # One request refills every 30 seconds
+    assert sum(clock.sleeps) == pytest.approx(30, abs=0.01)
+
+
+def test_bucket_refills_over_time_and_caps_at_the_rate(tmp_path, clock):
+    limiter = _limiter(tmp_path, requests_per_minute=6)
+    for _ in range(6):
+        limiter.release(limiter.acquire())
+    assert _state(tmp_path)['requests'] == pytest.approx(0)
+
+    clock.now += 3600
+    limiter.release(limiter.acquire())
+
+    assert clock.sleeps == []
+    assert _state(tmp_path)['requests'] == pytest.approx(5)
+
+
+def test_token_bucket_waits_for_enough_tokens(tmp_path, clock):
+    limiter = _limiter(tmp_path, tokens_per_minute=600)
+    limiter.release(limiter.acquire(500))
+
+    limiter.release(limiter.acquire(400))
+
+    # 300 tokens short at 10 tokens/second
+    assert sum(clock.sleeps) == pytest.approx(30, abs=0.01)
+
+
+def test_oversized_request_waits_for_a_full_bucket_only(tmp_path, clock):
+    limiter = _limiter(tmp_path, tokens_per_minute=600)
+
+    assert limiter.acquire(5000) is not None
+    assert clock.sleeps == []
+
+
+def test_try_acquire_does_not_wait(tmp_path, clock):
+    limiter = _limiter(tmp_path, max_inflight=1)
+    slot = limiter.acquire()
+
+    assert limiter.try_acquire() is None
+    limiter.release(slot)
+    assert limiter.try_acquire() is not None
+    assert clock.sleeps == []
+
+
+def test_inflight_slots_are_released(tmp_path, clock):
+    limiter = _limiter(tmp_path, max_inflight=2)
+    with limiter.slot():
+        assert len(_state(tmp_path)['inflight']) == 1
+
+    assert _state(tmp_path)['inflight'] == {}
+
+
+def test_slots_of_dead_processes_are_reaped(tmp_path, clock):
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    (tmp_path / 'gemini.json').write_text(json.dumps({
+        "updated": clock.now,
+        "inflight": {f"{process.pid}:dead": clock.now, f"{os.getpid()}:alive": clock.now}
+    }), encoding='utf-8')
+    limiter = _limiter(tmp_path, max_inflight=2)
+
+    slot = limiter.try_acquire()
+
+    assert slot is not None
+    assert sorted(_state(tmp_path)['inflight']) == sorted([f"{os.getpid()}:alive", slot])
+
+
+def test_backoff_blocks_every_caller(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(ratelimit.random, 'uniform', lambda a, b: 1.0)
+    limiter = _limiter(tmp_path, requests_per_minute=60, backoff=10)
+
+    assert limiter.backoff(1) == 20
+    assert _limiter(tmp_path, requests_per_minute=60).try_acquire() is None
+    clock.now += 21
+    assert _limiter(tmp_path, requests_per_minute=60).try_acquire() is not None
+
+
+@pytest.mark.parametrize("stderr, expected", [
+    ("Error: 429 Too Many Requests", True),
+    ("RESOURCE_EXHAUSTED: quota exceeded", True),
+    ("API is overloaded", True),
+    ("Error: file not found (line 429a)", False),
+    ("", False),
+])
+def test_is_rate_limited(stderr, expected):
+    assert is_rate_limited(stderr) is expected
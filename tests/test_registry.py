@@ -0,0 +1,38 @@
+"""Tests for the extension-keyed analyzer registry"""
+
+import pytest
+
+from ai_dev.analyzers import get_analyzer, read_input, supported_extensions
+
+
+def test_every_call_gets_a_new_instance():
+    first, name = get_analyzer("a.pdf")
+    second, _ = get_analyzer("b.PDF")
+
+    assert name == "PDF"
+    assert type(first) is type(second) and first is not second
+
+
+def test_unsupported_extension():
+    with pytest.raises(ValueError, match=r"Unsupported file type: \.doc \(supported: .*\.pdf"):
+        get_analyzer("report.doc")
+    assert {".txt", ".md", ".csv", ".xlsx", ".pdf", ".pptx"} <= set(supported_extensions())
+
+
+def test_read_input_decodes_text_files(tmp_path):
+    path = tmp_path / 'spec.txt'
+    path.write_bytes("ログイン機能".encode('shift_jis'))
+
+    text, encoding = read_input(str(path))
+
+    assert text == "ログイン機能"
+    assert encoding.lower().replace('_', '-') in ('shift-jis', 'cp932')
+
+
+def test_analyze_workers_option_does_not_leak(fake_cli, make_pdf, tmp_path):
+    pdf = make_pdf(["Page one."])
+
+    result = fake_cli.invoke('analyze', 'file', str(pdf), '--workers', '1', '-o', str(tmp_path / 'out.md'))
+
+    assert result.exit_code == 0, result.output
+    assert get_analyzer(str(pdf))[0].workers is None
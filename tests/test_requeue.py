@@ -0,0 +1,48 @@
+"""Tests for requeuing calls that hit a provider rate limit"""
+
+import asyncio
+import logging
+
+import pytest
+
+from ai_dev.ai_models.model_manager import ModelManager
+
+
+def _model(fake_cli, max_requeues=3):
+    fake_cli.config["ai_models"]["gemini"]["rate_limit"].update(max_requeues=max_requeues, backoff=0.01)
+    return ModelManager(fake_cli.config).get_current_model()
+
+
+def test_rate_limited_call_is_requeued_and_logged(fake_cli, caplog, capsys):
+    fake_cli.set_mode('ratelimit:2')
+    model = _model(fake_cli)
+
+    with caplog.at_level(logging.WARNING, logger='ai_dev.ai_models.base'):
+        items = model.generate("ログイン機能")
+
+    assert len(items) == 3
+    assert len(fake_cli.calls()) == 3
+    notices = [r.getMessage() for r in caplog.records if 'rate limited' in r.getMessage()]
+    assert len(notices) == 2 and notices[-1].endswith("(2/3)")
+    assert 'rate limited' not in capsys.readouterr().out
+
+
+def test_async_rate_limited_call_is_requeued_and_logged(fake_cli, caplog, capsys):
+    fake_cli.set_mode('ratelimit:1')
+    model = _model(fake_cli)
+
+    with caplog.at_level(logging.WARNING, logger='ai_dev.ai_models.base'):
+        items = asyncio.run(model.agenerate("ログイン機能"))
+
+    assert len(items) == 3
+    assert any('rate limited' in r.getMessage() for r in caplog.records)
+    assert 'rate limited' not in capsys.readouterr().out
+
+
+def test_requeues_are_bounded(fake_cli):
+    fake_cli.set_mode('ratelimit:10')
+    model = _model(fake_cli, max_requeues=1)
+
+    with pytest.raises(Exception, match="(?i)rate limit"):
+        model.execute_command("ログイン機能")
+    assert len(fake_cli.calls()) == 2
@@ -0,0 +1,116 @@
+"""Tests for the on-disk AI response cache"""
+
+import os
+import time
+
+import pytest
+
+from ai_dev.ai_models.cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(directory=str(tmp_path / 'responses'))
+
+
+def _key(prompt="要件を抽出", model="gemini", options=("--model", "gemini-2.5-pro")):
+    return ResponseCache.make_key(model, "gemini", list(options), prompt)
+
+
+def test_round_trip(cache):
+    cache.put(_key(), '[{"id": "REQ-001"}]')
+
+    assert cache.get(_key()) == '[{"id": "REQ-001"}]'
+
+
+@pytest.mark.parametrize("other", [
+    _key(prompt="要件を抽出 "),
+    _key(model="claude"),
+    _key(options=("--model", "gemini-2.5-flash")),
+    _key(options=()),
+])
+def test_key_covers_prompt_model_and_options(cache, other):
+    cache.put(_key(), "cached")
+
+    assert other != _key()
+    assert cache.get(other) is None
+
+
+def test_ttl_expiry_removes_the_entry(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path), ttl=60)
+    cache.put(_key(), "old")
+    path = cache._path(_key())
+    created = time.time() - 120
+    os.utime(path, (created, created))
+
+    assert cache.get(_key()) is None
+    assert not path.exists()
+
+
+def test_hit_keeps_creation_time_for_ttl(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path), ttl=60)
+    cache.put(_key(), "fresh")
+    path = cache._path(_key())
+    created = time.time() - 30
+    os.utime(path, (created, created))
+
+    assert cache.get(_key()) == "fresh"
+    assert path.stat().st_mtime == pytest.approx(created)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path), max_size_mb=2.5 / 1024)  # 2.5 KiB
+    for n in range(2):
+        cache.put(_key(f"p{n}"), "x" * 1024)
+        os.utime(cache._path(_key(f"p{n}")), (1000 + n, 1000 + n))
+    cache.get(_key("p0"))  # p0 is now the most recently used
+
+    cache.put(_key("p2"), "x" * 1024)
+
+    assert cache.get(_key("p1")) is None
+    assert cache.get(_key("p0")) and cache.get(_key("p2"))
+
+
+def test_corrupt_entry_is_a_miss_and_removed(cache):
+    cache.put(_key(), "ok")
+    path = cache._path(_key())
+    path.write_bytes(b"\xff\xfe\x00broken")
+
+    assert cache.get(_key()) is None
+    assert not path.exists()
+    cache.put(_key(), "again")
+    assert cache.get(_key()) == "again"
+
+
+def test_disabled_and_refresh(cache):
+    cache.put(_key(), "stored")
+    cache.refresh = True
+    assert cache.get(_key()) is None
+    cache.put(_key(), "replaced")
+    cache.refresh = False
+    assert cache.get(_key()) == "replaced"
+
+    cache.enabled = False
+    assert cache.get(_key()) is None
+
+
+def test_clear_and_info(cache):
+    cache.put(_key("a"), "1")
+    cache.put(_key("b"), "2")
+
+    assert cache.info()["entries"] == 2
+    assert cache.clear() == 2
+    assert cache.info()["entries"] == 0
+
+
+def test_identical_prompt_is_served_from_cache(fake_cli):
+    from ai_dev.ai_models.model_manager import ModelManager
+    fake_cli.config["cache"]["enabled"] = True
+
+    for _ in range(2):
+        assert len(ModelManager(fake_cli.config).get_current_model().generate("ログイン機能")) == 3
+    assert len(fake_cli.calls()) == 1
+
+    fake_cli.config["ai_models"]["gemini"]["options"] = ["--sandbox"]
+    ModelManager(fake_cli.config).get_current_model().generate("ログイン機能")
+    assert len(fake_cli.calls()) == 2
@@ -0,0 +1,147 @@
+"""Tests for deadline-aware retries and hedged CLI calls"""
+
+import logging
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+from ai_dev.ai_models import retry
+from ai_dev.ai_models.retry import LatencyTracker, RetryPolicy
+
+# First call: record its pid and hang; later calls answer at once
+SLOW_THEN_FAST = textwrap.dedent('''
+    import os, sys, time
+    calls = sys.argv[1]
+    with open(calls, 'a') as f:
+        f.write(f"{os.getpid()} {time.monotonic()}\\n")
+    if sum(1 for _ in open(calls)) == 1:
+        time.sleep(60)
+        print("first")
+    else:
+        print("second")
+''')
+
+
+@pytest.fixture
+def slow_then_fast(tmp_path):
+    script = tmp_path / 'cli.py'
+    script.write_text(SLOW_THEN_FAST, encoding='utf-8')
+    calls = tmp_path / 'calls.txt'
+    return [sys.executable, str(script), str(calls)], calls
+
+
+def _calls(calls):
+    if not calls.exists():
+        return []
+    return [(int(pid), float(at)) for pid, at in (line.split() for line in calls.read_text().splitlines())]
+
+
+def _tracker(tmp_path, samples=(0.3,) * 5):
+    tracker = LatencyTracker(str(tmp_path / 'latency.json'))
+    for seconds in samples:
+        tracker.record('cli', seconds)
+    return tracker
+
+
+def _gone(pid, within=5.0):
+    end = time.monotonic() + within
+    while time.monotonic() < end:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_attempt_timeouts_grow_but_stop_at_the_deadline(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(retry.time, 'monotonic', lambda: clock[0])
+    policy = RetryPolicy(timeout=10, deadline=35, max_attempts=5, multiplier=2)
+
+    schedule = []
+    for attempt, timeout in policy.attempts():
+        schedule.append((attempt, timeout))
+        clock[0] += timeout  # Every attempt times out
+
+    assert schedule == [(1, 10), (2, 20), (3, 5)]
+
+
+def test_default_deadline_covers_every_attempt():
+    assert RetryPolicy(timeout=60, max_attempts=3).deadline == 180
+    assert RetryPolicy(timeout=60, deadline=10).deadline == 60
+
+
+def test_timeouts_are_retried_then_raised(tmp_path, caplog):
+    policy = RetryPolicy(timeout=0.5, deadline=3, max_attempts=2, tracker=_tracker(tmp_path, ()))
+
+    with caplog.at_level(logging.WARNING, logger=retry.__name__):
+        with pytest.raises(subprocess.TimeoutExpired) as error:
+            policy.run([sys.executable, '-c', 'import time; time.sleep(30)'], key='cli', label='Fake CLI')
+
+    assert error.value.attempts == 2
+    assert "Fake CLI timed out after 0s. Retrying... (Attempt 2/2" in caplog.text
+    assert "did not finish within the 3s deadline" in caplog.text
+
+
+def test_success_records_latency(tmp_path):
+    tracker = _tracker(tmp_path, ())
+    result = RetryPolicy(timeout=10, tracker=tracker).run([sys.executable, '-c', 'print("ok")'], key='cli')
+
+    assert (result.returncode, result.stdout.strip(), result.attempts) == (0, "ok", 1)
+    assert tracker.percentile('cli', 0.5, min_samples=1) is not None
+
+
+def test_hedge_starts_after_the_percentile_delay_and_wins(tmp_path, slow_then_fast):
+    cmd, calls = slow_then_fast
+    released = []
+    policy = RetryPolicy(timeout=20, hedge=True, tracker=_tracker(tmp_path))
+
+    started = time.monotonic()
+    result = policy.run(cmd, key='cli', acquire_hedge=lambda: lambda: released.append(True))
+
+    assert result.stdout.strip() == "second"
+    (first_pid, _), (_, hedge_at) = _calls(calls)
+    assert hedge_at - started >= 0.3  # CLOCK_MONOTONIC is shared with the child processes
+    assert _gone(first_pid), "the losing process was not killed"
+    assert released == [True]
+
+
+def test_no_hedge_without_a_free_slot(tmp_path, slow_then_fast):
+    cmd, calls = slow_then_fast
+    asked = []
+    policy = RetryPolicy(timeout=1.5, deadline=1.5, max_attempts=1, hedge=True, tracker=_tracker(tmp_path))
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        policy.run(cmd, key='cli', acquire_hedge=lambda: asked.append(True))
+
+    assert asked == [True]
+    assert len(_calls(calls)) == 1
+    assert _gone(_calls(calls)[0][0])
+
+
+def test_no_hedge_without_enough_history(tmp_path, slow_then_fast):
+    cmd, calls = slow_then_fast
+    policy = RetryPolicy(timeout=1.5, deadline=1.5, max_attempts=1, hedge=True,
+                         tracker=_tracker(tmp_path, (0.1,) * 4))
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        policy.run(cmd, key='cli')
+
+    assert len(_calls(calls)) == 1
+
+
+def test_failure_before_the_hedge_point_is_returned_as_is(tmp_path):
+    asked = []
+    policy = RetryPolicy(timeout=10, hedge=True, tracker=_tracker(tmp_path, (5.0,) * 5))
+
+    result = policy.run([sys.executable, '-c', 'import sys; sys.exit("Error: 429")'], key='cli',
+                        acquire_hedge=lambda: asked.append(True))
+
+    assert result.returncode == 1
+    assert "429" in result.stderr
+    assert asked == []
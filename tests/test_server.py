@@ -0,0 +1,204 @@
+"""Tests for the 'ai-dev serve' daemon and the ai-dev-client protocol"""
+
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from ai_dev import client
+
+SRC = str(Path(__file__).resolve().parents[1] / 'src')
+
+
+class Daemon:
+    """An 'ai-dev serve' subprocess listening on a socket in a short temp path"""
+
+    def __init__(self, fake_cli, *args, socket_path=None):
+        # Unix socket paths are limited to ~100 bytes; pytest's tmp_path can be longer
+        self.directory = Path(tempfile.mkdtemp(prefix='ai-dev-serve-'))
+        self.socket = socket_path or str(self.directory / 'ai-dev.sock')
+        env = {**os.environ, 'PYTHONPATH': SRC}
+        self.process = subprocess.Popen(
+            [sys.executable, '-c', 'from ai_dev.cli import cli; cli()', '--config', str(fake_cli.config_path),
+             'serve', '--socket', self.socket, *args],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, env=env)
+
+    def wait_ready(self, timeout=30):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise AssertionError(self.process.stdout.read())
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket)
+                return self
+            except (FileNotFoundError, ConnectionRefusedError):
+                time.sleep(0.05)
+            finally:
+                probe.close()
+        raise AssertionError("ai-dev serve did not start")
+
+    def request(self, message):
+        return list(client.request(message, self.socket))
+
+    def send_raw(self, line: bytes):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.socket)
+            sock.sendall(line)
+            with sock.makefile('r', encoding='utf-8') as events:
+                return [json.loads(event) for event in events if event.strip()]
+
+    def main(self, *argv):
+        return client.main(['--socket', self.socket, *argv])
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait(timeout=10)
+        self.process.stdout.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+@pytest.fixture
+def start_daemon(fake_cli):
+    daemons = []
+
+    def start(*args, socket_path=None):
+        fake_cli.save()
+        daemon = Daemon(fake_cli, *args, socket_path=socket_path)
+        daemons.append(daemon)
+        return daemon
+
+    yield start
+    for daemon in daemons:
+        daemon.stop()
+
+
+@pytest.fixture
+def daemon(start_daemon):
+    return start_daemon('--workers', '2').wait_ready()
+
+
+@pytest.fixture
+def spec(tmp_path):
+    path = tmp_path / 'spec.txt'
+    path.write_text("ログイン機能の仕様", encoding='utf-8')
+    return path
+
+
+def test_status_reports_the_worker_pool(daemon):
+    *messages, done = daemon.request({'command': 'status'})
+
+    assert done['event'] == 'done' and done['ok'] is True
+    assert done['result']['workers'] == 2 and done['result']['jobs_done'] == 0
+    assert {'event': 'message', 'text': 'workers: 2'} in messages
+
+
+def test_generate_job_writes_the_output(daemon, spec, tmp_path, fake_cli, capsys):
+    output = tmp_path / 'qa.json'
+
+    assert daemon.main('generate', 'qa', str(spec), '-o', str(output), '-f', 'json') == 0
+
+    assert [item["id"] for item in json.loads(output.read_text(encoding='utf-8'))] == \
+        ["ITEM-001", "ITEM-002", "ITEM-003"]
+    out = capsys.readouterr().out
+    assert f"generated: {output}" in out and "Items: 3" in out
+    assert len(fake_cli.calls()) == 1
+    assert daemon.request({'command': 'status'})[-1]['result']['jobs_done'] == 1
+
+
+def test_streamed_items_are_forwarded(daemon, spec, tmp_path, capsys):
+    output = tmp_path / 'qa.md'
+
+    assert daemon.main('--verbose', 'generate', 'qa', str(spec), '-o', str(output), '--stream') == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["id"] for line in lines if line.startswith('{')] == \
+        ["ITEM-001", "ITEM-002", "ITEM-003"]
+    assert output.exists()
+
+
+def test_default_output_is_relative_to_the_client_directory(start_daemon, fake_cli, spec, tmp_path):
+    fake_cli.config["output"]["directory"] = "out"
+    daemon = start_daemon().wait_ready()
+
+    events = daemon.request({'command': 'generate', 'cwd': str(tmp_path),
+                             'options': {'doc_type': 'qa', 'input_file': str(spec), 'format': 'csv'}})
+
+    assert events[-1] == {'event': 'done', 'ok': True}
+    assert (tmp_path / 'out' / 'qa.csv').exists()
+
+
+def test_analyze_job(daemon, tmp_path, capsys):
+    data = tmp_path / 'data.csv'
+    data.write_text("name,amount\nりんご,100\nみかん,200\n", encoding='utf-8')
+    output = tmp_path / 'data.json'
+
+    assert daemon.main('analyze', 'file', str(data), '-f', 'json', '-o', str(output)) == 0
+
+    assert json.loads(output.read_text(encoding='utf-8'))
+    assert f"Saved to: {output}" in capsys.readouterr().out
+
+
+def test_failed_job_reports_the_error(start_daemon, fake_cli, spec, tmp_path, capsys):
+    fake_cli.set_mode('fail')  # Inherited by the daemon and the fake CLI it runs
+    daemon = start_daemon().wait_ready()
+
+    assert daemon.main('generate', 'qa', str(spec), '-o', str(tmp_path / 'qa.md')) == 1
+
+    assert "✗ Error:" in capsys.readouterr().err
+    assert daemon.request({'command': 'status'})[-1]['result']['jobs_failed'] == 1
+
+
+def test_malformed_and_unknown_requests(daemon):
+    assert daemon.send_raw(b'not json\n')[-1] == {'event': 'done', 'ok': False}
+    *messages, done = daemon.request({'command': 'frobnicate'})
+
+    assert done == {'event': 'done', 'ok': False}
+    assert messages[0]['stderr'] is True and 'Unknown command' in messages[0]['text']
+
+
+def test_client_without_a_daemon(tmp_path, spec, capsys):
+    assert client.main(['--socket', str(tmp_path / 'missing.sock'), 'status']) == 2
+    assert "not running" in capsys.readouterr().err
+    assert client.main(['--socket', str(tmp_path / 'missing.sock'), 'generate', 'qa', 'missing.txt']) == 2
+
+
+def test_second_daemon_on_the_same_socket_is_refused(daemon, start_daemon):
+    second = start_daemon(socket_path=daemon.socket)
+
+    assert second.process.wait(timeout=30) == 1
+    assert "already running" in second.process.stdout.read()
+
+
+def test_shutdown_stops_the_daemon_and_removes_the_socket(daemon):
+    assert daemon.request({'command': 'shutdown'})[-1] == {'event': 'done', 'ok': True}
+
+    assert daemon.process.wait(timeout=30) == 0
+    assert not Path(daemon.socket).exists()
+
+
+def test_generate_job_skips_unchanged_outputs_unless_forced(daemon, spec, tmp_path, fake_cli, capsys):
+    output = tmp_path / 'qa.md'
+    assert daemon.main('generate', 'qa', str(spec), '-o', str(output)) == 0
+    assert (tmp_path / 'qa.md.fingerprint.json').exists()
+
+    assert daemon.main('generate', 'qa', str(spec), '-o', str(output)) == 0
+    assert "Up to date" in capsys.readouterr().out
+    assert len(fake_cli.calls()) == 1
+
+    assert daemon.main('generate', 'qa', str(spec), '-o', str(output), '--force') == 0
+    assert len(fake_cli.calls()) == 2
+
+    # A sidecar written by 'ai-dev generate' is honoured by the daemon and vice versa
+    spec.write_text("ログイン機能の仕様（改訂）", encoding='utf-8')
+    assert fake_cli.invoke('generate', 'qa', str(spec), '-o', str(output)).exit_code == 0
+    assert daemon.main('generate', 'qa', str(spec), '-o', str(output)) == 0
+    assert len(fake_cli.calls()) == 3
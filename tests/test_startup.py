@@ -0,0 +1,55 @@
+"""Start-up time regression checks for the CLI (see ``ai-dev bench startup``)"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from ai_dev.bench import run_startup_benchmark
+from ai_dev.bench.startup import HEAVY_MODULES
+from ai_dev.cli import STARTUP_BUDGET_MS
+
+SRC = str(Path(__file__).resolve().parents[1] / 'src')
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    """Fresh HOME so no user config or cache is read; this checkout first on the path"""
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setenv('PYTHONPATH', os.pathsep.join(filter(None, [SRC, os.environ.get('PYTHONPATH')])))
+    return dict(os.environ)
+
+
+def _importtime(env):
+    """{module: cumulative microseconds} from ``python -X importtime -c "import ai_dev.cli"``"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ai_dev.cli'],
+                            capture_output=True, text=True, env=env, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def test_cli_import_within_budget(env):
+    modules = _importtime(env)
+    assert 'ai_dev.cli' in modules
+    assert modules['ai_dev.cli'] / 1000 <= STARTUP_BUDGET_MS
+
+
+def test_cli_import_skips_heavy_modules(env):
+    loaded = {name.split('.')[0] for name in _importtime(env)}
+    assert sorted(loaded.intersection(HEAVY_MODULES)) == []
+
+
+def test_help_within_budget(env):
+    report = run_startup_benchmark(commands=[['--help']], runs=3)
+    command = report['commands'][0]
+    assert command['failures'] == 0
+    assert command['heavy_modules'] == []
+    assert command['p50'] * 1000 <= STARTUP_BUDGET_MS